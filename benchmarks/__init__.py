@@ -0,0 +1 @@
+"""Benchmarks for the airport dashboard data layer. Run modules with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: per-belt Python pipeline versus the vectorized NumPy engine.
+
+    python -m benchmarks.bench_conveyor_vectorized [--belts 10,100,1000,10000]
+"""
+
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from benchmarks.bench_models_memory import SENSOR_TYPES, build_belts
+from conveyor_vectorized import score_belts, simulate_belts
+from data_sources import DataSourceManager
+
+
+def timed(func, repeat):
+    """Best wall time of ``repeat`` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--belts', default='10,100,1000,10000')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    manager = DataSourceManager()
+    random.seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+
+    results = []
+    for count in (int(value) for value in args.belts.split(',')):
+        scalar_ms = timed(lambda: build_belts(manager, count), args.repeat)
+        vectorized_ms = timed(
+            lambda: score_belts(simulate_belts(count, SENSOR_TYPES, 5.0, hour=12, rng=rng)), args.repeat)
+        results.append({
+            'belts': count,
+            'scalar_ms': round(scalar_ms, 2),
+            'vectorized_ms': round(vectorized_ms, 2),
+            'speedup': round(scalar_ms / vectorized_ms, 1) if vectorized_ms else None
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
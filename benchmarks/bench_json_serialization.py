@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for /dashboard-data: time and allocations per request for
+the standard-library provider, the orjson provider, and the per-snapshot cached body.
+
+    python -m benchmarks.bench_json_serialization [--airport DEL] [--requests 200]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from json_provider import JSONProvider, OrjsonProvider, orjson
+from snapshot import AirportSnapshot
+from web_server import create_app
+
+
+def offline_app():
+    """The app with its own manager answering from simulated data instead of the upstream APIs"""
+    app = create_app()
+    manager = app.extensions['snapshot_engine'].data_source_manager
+    manager._fetch_weather_data = lambda airport_code, timeout=5: manager._get_simulated_weather()
+    manager.get_opensky_flights = lambda airport_code, timeout=10: []
+    return app
+
+
+def measure(serialize, requests):
+    """Mean milliseconds and peak bytes allocated per serialization"""
+    started = time.perf_counter()
+    for _ in range(requests):
+        body = serialize()
+    elapsed_ms = (time.perf_counter() - started) * 1000 / requests
+
+    tracemalloc.start()
+    serialize()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ms_per_request': round(elapsed_ms, 3), 'peak_bytes_per_request': peak, 'body_bytes': len(body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--airport', default='DEL')
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    app = offline_app()
+    engine = app.extensions['snapshot_engine']
+    snapshot = engine.get_snapshot(args.airport).build_all()
+    payload = snapshot.get('dashboard_data')
+
+    results = {}
+    with app.app_context():
+        stdlib = JSONProvider(app)
+        results['stdlib_jsonify'] = measure(lambda: stdlib.response(payload).get_data(), args.requests)
+        if orjson is not None:
+            fast = OrjsonProvider(app)
+            results['orjson_jsonify'] = measure(lambda: fast.response(payload).get_data(), args.requests)
+
+        # A cold snapshot encodes each section once; every later request reuses the cached body
+        def cold_snapshot():
+            fresh = AirportSnapshot(args.airport, 0, engine.builders, carried=dict(snapshot.sections))
+            return fresh.serialized('dashboard_data', app.json.dumps_bytes)[0]
+
+        results['snapshot_first_request'] = measure(cold_snapshot, args.requests)
+        results['snapshot_cached'] = measure(
+            lambda: snapshot.serialized('dashboard_data', app.json.dumps_bytes)[0], args.requests)
+
+    print(json.dumps({'airport': args.airport, 'provider': app.json.name, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
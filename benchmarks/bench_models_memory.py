@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: bytes per belt and per bag for the slotted record models
+versus the nested-dict representation they replaced.
+
+    python -m benchmarks.bench_models_memory [--belts 2000]
+"""
+
+import argparse
+import json
+import random
+import tracemalloc
+
+from data_sources import DataSourceManager
+from models import Belt
+
+SENSOR_TYPES = ['weight', 'motion', 'temperature', 'vibration', 'optical']
+
+
+def build_belts(manager: DataSourceManager, count: int):
+    """Build Belt records the same way get_live_conveyor_data does, for Active belts"""
+    belts = []
+    for index in range(count):
+        belt_id = f'T1-Belt-{index:05d}'
+        sensors = manager._generate_sensor_data(SENSOR_TYPES, 'Active')
+        bags = manager._generate_live_bags(belt_id, 'Active', 5.0)
+        belt = Belt(belt_id=belt_id, terminal='T1', status='Active', max_speed=5.0, sensors=sensors,
+                    bags=bags, ai_insights={'status_reason': 'benchmark'}, total_processed_today=500,
+                    last_maintenance_days=10, utilization=manager._calculate_utilization(bags, 'Active'),
+                    last_updated='00:00:00', belt_counter=index + 1)
+        belt.efficiency_score = manager._calculate_belt_efficiency(bags, sensors, 'Active')
+        belt.predicted_issues = manager._predict_belt_issues(sensors, bags)
+        belt.health_status = manager._get_belt_health_status(sensors, belt.efficiency_score)
+        belt.delay_risk = manager._calculate_delay_risk(bags, sensors)
+        belt.breakdown_probability = manager._calculate_breakdown_probability(sensors)
+        belts.append(belt)
+    return belts
+
+
+def measure(factory):
+    """Return (result, bytes retained) for objects built by factory"""
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    result = factory()
+    retained = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename'))
+    tracemalloc.stop()
+    return result, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--belts', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    manager = DataSourceManager()
+    random.seed(args.seed)
+
+    # Belts: slotted records (including their bags) versus the nested dicts of the same belts
+    belts, slotted_belt_bytes = measure(lambda: build_belts(manager, args.belts))
+    _, dict_belt_bytes = measure(lambda: [belt.to_dict() for belt in belts])
+
+    # Bags on their own: freshly generated Bag records versus their dict form
+    bag_lists, slotted_bag_bytes = measure(
+        lambda: [manager._generate_live_bags(f'T1-Belt-{i:05d}', 'Active', 5.0) for i in range(args.belts)])
+    bags = [bag for bag_list in bag_lists for bag in bag_list]
+    _, dict_bag_bytes = measure(lambda: [bag.to_dict() for bag in bags])
+
+    results = {
+        'belts': args.belts,
+        'bags': len(bags),
+        'bytes_per_belt': {
+            'dict': round(dict_belt_bytes / args.belts),
+            'slotted': round(slotted_belt_bytes / args.belts)
+        },
+        'bytes_per_bag': {
+            'dict': round(dict_bag_bytes / len(bags)),
+            'slotted': round(slotted_bag_bytes / len(bags))
+        }
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the conveyor generation and scoring functions, from today's
+3-24 belts per airport up to hubs of 10k belts (and 10k bags on one belt).
+
+    python -m benchmarks.bench_scoring [--belts 3,24,100,1000,10000] [--bags 3,15,100,1000,10000] [--seed 42]
+
+Each function is timed with timeit's autorange (best of --repeat) on inputs
+built from a seeded generator, and its peak allocation per call is measured
+separately with tracemalloc. Functions whose cost grows with an input size
+also get the log-log slope of time against that size, overall and between
+the two largest sizes: about 1.0 is linear, and a tail slope above
+SUPERLINEAR_SLOPE is flagged.
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from conveyor_state import ConveyorState
+from data_sources import AIRPORT_CONVEYOR_CONFIGS, DataSourceManager
+
+# Slopes above this on a log-log plot of time against input size count as super-linear
+SUPERLINEAR_SLOPE = 1.2
+HUB_CONFIG = dict(AIRPORT_CONVEYOR_CONFIGS['DEL'])
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> float:
+    """Best seconds per call"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def peak_allocation(func: Callable[[], Any]) -> int:
+    """Peak bytes allocated during one call"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    return {'us_per_call': round(time_call(func, repeat) * 1e6, 3), 'peak_bytes_per_call': peak_allocation(func)}
+
+
+def log_log_slope(sizes: List[int], seconds: List[float]) -> float:
+    """Least-squares slope of log(time) against log(size)"""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-12)) for value in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+
+
+def scaling(sizes: List[int], run: Callable[[int], Dict[str, Any]]) -> Dict[str, Any]:
+    """Measure ``run(size)`` for every size and summarise how time grows"""
+    by_size = {str(size): run(size) for size in sizes}
+    result: Dict[str, Any] = {'by_size': by_size}
+    if len(sizes) > 1:
+        times = [by_size[str(size)]['us_per_call'] for size in sizes]
+        # Fixed per-call overhead flattens the small sizes, so judge growth on the two largest
+        tail_slope = log_log_slope(sizes[-2:], times[-2:])
+        result['slope'] = round(log_log_slope(sizes, times), 2)
+        result['tail_slope'] = round(tail_slope, 2)
+        result['superlinear'] = tail_slope > SUPERLINEAR_SLOPE
+    return result
+
+
+def build_belts(manager: DataSourceManager, count: int) -> List[Any]:
+    """Scored belts with the usual status mix, built the way ConveyorState builds them"""
+    return [
+        manager._build_belt('HUB', f'T1-Belt-{index:05d}', 'T1', HUB_CONFIG, 'Low', index + 1, '00:00:00')
+        for index in range(count)
+    ]
+
+
+def build_bags(manager: DataSourceManager, count: int) -> List[Any]:
+    return [manager._new_bag('T1-Belt-00001', random.uniform(0, 100), HUB_CONFIG['max_speed'], '00:00:00')
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--belts', default='3,24,100,1000,10000', help='belt counts for per-airport functions')
+    parser.add_argument('--bags', default='3,15,100,1000,10000', help='bag counts for per-belt scoring')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-hub', action='store_true', help='skip building whole ConveyorStates')
+    args = parser.parse_args()
+    belt_sizes = sorted(int(size) for size in args.belts.split(','))
+    bag_sizes = sorted(int(size) for size in args.bags.split(','))
+
+    manager = DataSourceManager()
+    sensor_types = HUB_CONFIG['sensor_types']
+    random.seed(args.seed)
+    sensors = manager._generate_sensor_data(sensor_types, 'Active')
+    results: Dict[str, Any] = {}
+
+    # Called once per belt: cost per call is what matters, times belts per airport
+    results['per_belt'] = {
+        '_generate_sensor_data': measure(lambda: manager._generate_sensor_data(sensor_types, 'Active'), args.repeat),
+        '_generate_live_bags': measure(lambda: manager._generate_live_bags('T1-Belt-00001', 'Active', 5.0),
+                                       args.repeat),
+        '_calculate_breakdown_probability': measure(lambda: manager._calculate_breakdown_probability(sensors),
+                                                    args.repeat)
+    }
+
+    # Called once per belt, with cost that grows with the bags on it
+    def per_bag(func):
+        def run(size):
+            random.seed(args.seed)
+            bags = build_bags(manager, size)
+            return measure(lambda: func(bags), args.repeat)
+        return run
+
+    results['per_bag'] = {
+        '_predict_belt_issues': scaling(bag_sizes,
+                                        per_bag(lambda bags: manager._predict_belt_issues(sensors, bags))),
+        '_calculate_delay_risk': scaling(bag_sizes,
+                                         per_bag(lambda bags: manager._calculate_delay_risk(bags, sensors)))
+    }
+
+    # Called once per airport over every belt
+    belts_cache: Dict[int, List[Any]] = {}
+
+    def per_airport(func):
+        def run(size):
+            if size not in belts_cache:
+                random.seed(args.seed)
+                belts_cache[size] = build_belts(manager, size)
+            belts = belts_cache[size]
+            return measure(lambda: func(belts), args.repeat)
+        return run
+
+    results['per_airport'] = {
+        '_generate_system_insights': scaling(belt_sizes, per_airport(
+            lambda belts: manager._generate_system_insights(belts, 'HUB'))),
+        '_calculate_performance_metrics': scaling(belt_sizes, per_airport(
+            lambda belts: manager._calculate_performance_metrics(belts)))
+    }
+    belts_cache.clear()
+
+    # Whole simulated hubs: the first build, then one second of movement
+    if not args.skip_hub:
+        def hub(size):
+            config = dict(HUB_CONFIG, terminals=['T1'], belts_per_terminal={'T1': size})
+            random.seed(args.seed)
+            state = ConveyorState(manager, 'HUB', config)
+            now = time.time()
+            started = time.perf_counter()
+            state.advance_to(now)
+            build = time.perf_counter() - started
+            started = time.perf_counter()
+            state.advance_to(now + 1)
+            tick = time.perf_counter() - started
+            return {'us_per_call': round((build + tick) * 1e6, 3),
+                    'build_ms': round(build * 1000, 3), 'tick_ms': round(tick * 1000, 3)}
+
+        results['hub'] = {'ConveyorState build + 1s tick': scaling(belt_sizes, hub)}
+
+    flagged = [
+        name for group in results.values() for name, result in group.items() if result.get('superlinear')
+    ]
+    print(json.dumps({'seed': args.seed, 'superlinear': flagged, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Load test for every /api/airport/<code>/* route and the page routes, with stubbed upstream APIs.
+
+    python -m benchmarks.load_test [--requests 200] [--concurrency 8] [--latency 0.05]
+        [--failure-rate 0.1] [--routes live-conveyors,dashboard-data] [--output results.json]
+        [--baseline previous.json --max-regression 0.2]
+
+By default the app runs in this process on a threaded local server, and the
+upstream APIs are replaced by benchmarks.stubs. Client and server then share
+one interpreter, so absolute numbers are pessimistic; compare runs made with
+the same settings. Pass --url (and --pid for RSS) to load an app already
+running under gunicorn instead. Results are JSON: p50/p95/p99 latency,
+throughput, errors and RSS per route. With --baseline, the run exits with
+status 1 when any route's p95 or throughput is worse by more than
+--max-regression.
+
+Snapshot-backed routes are rebuilt once per SNAPSHOT_REFRESH_INTERVAL, so most
+requests are served from cache. Run with a tiny interval such as
+SNAPSHOT_REFRESH_INTERVAL=0.001 to rebuild on practically every request and
+measure get_dashboard_data and get_live_conveyor_data themselves (the
+interval must be positive).
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from benchmarks.stubs import StubUpstreams
+
+AIRPORT_CODES = ('DEL', 'BLR', 'GOX', 'PNY', 'IXJ', 'SXR')
+PAGE_ROUTES = ('/', '/dashboard/<airport_code>', '/settings', '/passenger', '/staff')
+# Long-lived streams are not request/response routes
+EXCLUDED_ROUTES = ('/api/airport/<airport_code>/live-conveyors/stream',)
+
+
+def discover_routes(app) -> List[str]:
+    """GET route templates under /api/airport/<airport_code>/, plus the page routes"""
+    routes = [
+        rule.rule for rule in app.url_map.iter_rules()
+        if 'GET' in rule.methods and rule.rule.startswith('/api/airport/<airport_code>/')
+        and rule.rule not in EXCLUDED_ROUTES
+    ]
+    return sorted(routes) + [route for route in PAGE_ROUTES if route in {rule.rule for rule in app.url_map.iter_rules()}]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """Resident set size of a process (this one by default), from /proc where available"""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        if pid is not None:
+            return None
+        import resource
+        # ru_maxrss is the peak, in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_route(base_url: str, route: str, requests_count: int, concurrency: int, warmup: int,
+              pid: Optional[int]) -> Dict[str, Any]:
+    """Send ``requests_count`` GETs for one route template, cycling through the airports"""
+    paths = [route.replace('<airport_code>', code) for code in AIRPORT_CODES]
+    local = threading.local()
+
+    def get(n: int):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            status = session.get(base_url + paths[n % len(paths)], timeout=60).status_code
+        except requests.RequestException:
+            status = None
+        return time.perf_counter() - started, status
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='load') as pool:
+        list(pool.map(get, range(warmup)))
+        rss_before = rss_bytes(pid)
+        started = time.perf_counter()
+        results = list(pool.map(get, range(requests_count)))
+        elapsed = time.perf_counter() - started
+        rss_after = rss_bytes(pid)
+
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    statuses: Dict[str, int] = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(count for status, count in statuses.items() if status == 'None' or int(status) >= 500)
+    return {
+        'requests': requests_count,
+        'concurrency': concurrency,
+        'throughput_rps': round(requests_count / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'max_ms': round(latencies[-1], 3),
+        'errors': errors,
+        'statuses': statuses,
+        'rss_bytes': rss_after,
+        'rss_growth_bytes': rss_after - rss_before if rss_after is not None and rss_before is not None else None
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Routes whose p95 latency rose, or throughput fell, by more than ``max_regression``"""
+    regressions = []
+    for route, current in results['routes'].items():
+        previous = baseline.get('routes', {}).get(route)
+        if previous is None:
+            continue
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + max_regression):
+            regressions.append(f"{route}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - max_regression):
+            regressions.append(f"{route}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+    return regressions
+
+
+def serve_locally(app):
+    """Run ``app`` on a threaded server on a free local port; returns (base URL, server)"""
+    from werkzeug.serving import make_server
+
+    # One access log line per request would dominate the client's output
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='load-test-server', daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='requests per route')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=12, help='unmeasured requests per route first')
+    parser.add_argument('--routes', default='', help='comma-separated substrings; only matching routes run')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub upstream latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random stub latency, up to this many seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of stub upstream calls that fail')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--url', help='load an already running app instead of starting one')
+    parser.add_argument('--pid', type=int, help='process to measure RSS of when using --url')
+    parser.add_argument('--output', help='write the JSON results here instead of stdout')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    stubs = server = None
+    if not args.url:
+        stubs = StubUpstreams(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                              seed=args.seed).start()
+        os.environ.update(stubs.environ())
+    # The route list comes from this tree's app even when loading a remote one
+    from web_server import create_app
+    app = create_app()
+    routes = discover_routes(app)
+    if args.url:
+        base_url = args.url.rstrip('/')
+    else:
+        base_url, server = serve_locally(app)
+
+    wanted = [name for name in args.routes.split(',') if name]
+    if wanted:
+        routes = [route for route in routes if any(name in route for name in wanted)]
+
+    results = {
+        'meta': {
+            'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'target': args.url or 'in-process',
+            'requests_per_route': args.requests,
+            'concurrency': args.concurrency,
+            'stub_latency_seconds': args.latency,
+            'stub_jitter_seconds': args.jitter,
+            'stub_failure_rate': args.failure_rate,
+            'seed': args.seed
+        },
+        'routes': {}
+    }
+    try:
+        for route in routes:
+            results['routes'][route] = run_route(base_url, route, args.requests, args.concurrency, args.warmup,
+                                                 args.pid)
+            print(f"{route}: p50 {results['routes'][route]['p50_ms']}ms, p95 {results['routes'][route]['p95_ms']}ms, "
+                  f"{results['routes'][route]['throughput_rps']} req/s", file=sys.stderr)
+    finally:
+        if server is not None:
+            server.shutdown()
+        if stubs is not None:
+            results['meta']['stub_calls'] = dict(stubs.stats)
+            stubs.stop()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
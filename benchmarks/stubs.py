@@ -0,0 +1,98 @@
+"""
+Local stand-ins for the OpenSky and Open-Meteo APIs, with injectable latency and failure rate.
+
+    with StubUpstreams(latency=0.05, failure_rate=0.1) as stubs:
+        os.environ.update(stubs.environ())
+        app = create_app()
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+OPENSKY_PATH = '/api/states/all'
+OPEN_METEO_PATH = '/v1/forecast'
+
+OPENSKY_BODY = json.dumps({'states': [
+    [f'abc{n:03d}', f'IGO{100 + n} ', 'India', 0, 0, 77.1, 28.5, 1000.0 * n, n % 4 == 0, 230.0, 90.0, 0.0]
+    for n in range(15)
+]}).encode()
+OPEN_METEO_BODY = json.dumps({'current_weather': {'temperature': 31.0, 'weathercode': 1, 'windspeed': 7.0}}).encode()
+
+
+class StubUpstreams:
+    """Threaded HTTP server answering OpenSky and Open-Meteo requests.
+
+    Every response waits ``latency`` seconds plus up to ``jitter`` more, and a
+    ``failure_rate`` fraction of requests get a 503. The random choices come
+    from one seeded generator, so a run with the same settings sees the same
+    sequence of delays and failures.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 seed: Optional[int] = 1, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.stats = {'requests': 0, 'failures': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        stubs = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                delay, fail = stubs._next_outcome()
+                time.sleep(delay)
+                if fail:
+                    status, body = 503, b'{"error": "stub failure"}'
+                elif self.path.startswith(OPENSKY_PATH):
+                    status, body = 200, OPENSKY_BODY
+                elif self.path.startswith(OPEN_METEO_PATH):
+                    status, body = 200, OPEN_METEO_BODY
+                else:
+                    status, body = 404, b'{}'
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://{host}:{self.server.server_address[1]}'
+        self._thread = threading.Thread(target=self.server.serve_forever, name='stub-upstreams', daemon=True)
+
+    def _next_outcome(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.stats['failures'] += 1
+        return delay, fail
+
+    def environ(self) -> Dict[str, str]:
+        """Environment variables that point ``create_app`` at these stubs"""
+        return {'OPENSKY_URL': self.url + OPENSKY_PATH, 'OPEN_METEO_URL': self.url + OPEN_METEO_PATH}
+
+    def start(self) -> 'StubUpstreams':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'StubUpstreams':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,183 @@
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    """Single cached value together with the time it was loaded"""
+
+    __slots__ = ('value', 'loaded_at')
+
+    def __init__(self, value: Any, loaded_at: float):
+        self.value = value
+        self.loaded_at = loaded_at
+
+
+class TTLCache:
+    """Keyed cache with a freshness TTL and a stale-while-revalidate window.
+
+    Entries younger than ``ttl`` are served directly. Entries older than ``ttl``
+    but younger than ``ttl + stale_ttl`` are still served, while a single
+    background refresh reloads them. Anything older is reloaded synchronously.
+    Loads are single-flight per key, so concurrent callers never trigger more
+    than one upstream call for the same key at a time. With ``max_entries``
+    set, the cache is bounded: hits mark an entry as recently used and the
+    least recently used entry is evicted once the limit is reached.
+    ``on_evict(key, value)`` is called, under the cache lock, whenever an
+    entry is evicted, expires or is invalidated, so callers can keep
+    secondary indexes in step.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic, name: str = 'cache',
+                 max_entries: Optional[int] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = name
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, _CacheEntry]' = OrderedDict()
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self._counters = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'loads': 0,
+            'refreshes': 0,
+            'load_failures': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, loading it with loader when needed"""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                now = self._clock()
+                if entry is not None:
+                    age = now - entry.loaded_at
+                    if age < self.ttl:
+                        self._counters['hits'] += 1
+                        self._entries.move_to_end(key)
+                        return entry.value
+                    if age < self.ttl + self.stale_ttl:
+                        self._counters['stale_hits'] += 1
+                        self._entries.move_to_end(key)
+                        if key not in self._inflight:
+                            self._inflight[key] = threading.Event()
+                            self._counters['refreshes'] += 1
+                            threading.Thread(target=self._load, args=(key, loader),
+                                             name=f'{self.name}-refresh', daemon=True).start()
+                        return entry.value
+                    # Expired: drop it now so it cannot be served or take up a slot
+                    del self._entries[key]
+                    self._counters['expirations'] += 1
+                    self._notify_evicted(key, entry.value)
+
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._counters['misses'] += 1
+                    self._inflight[key] = threading.Event()
+                    break
+
+            # Another caller is already loading this key; wait and re-check
+            pending.wait()
+
+        return self._load(key, loader, raise_errors=True)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], raise_errors: bool = False) -> Any:
+        """Run loader for key and publish the result to waiting callers"""
+        try:
+            value = loader()
+            with self._lock:
+                self._entries[key] = _CacheEntry(value, self._clock())
+                self._entries.move_to_end(key)
+                self._counters['loads'] += 1
+                if self.max_entries is not None:
+                    while len(self._entries) > self.max_entries:
+                        evicted_key, evicted = self._entries.popitem(last=False)
+                        self._counters['evictions'] += 1
+                        self._notify_evicted(evicted_key, evicted.value)
+            return value
+        except Exception as e:
+            with self._lock:
+                self._counters['load_failures'] += 1
+            logger.warning(f"{self.name}: failed to load {key!r}: {e}")
+            if raise_errors:
+                raise
+            return None
+        finally:
+            with self._lock:
+                event = self._inflight.pop(key, None)
+            if event is not None:
+                event.set()
+
+    def _notify_evicted(self, key: Hashable, value: Any) -> None:
+        if self.on_evict is None:
+            return
+        try:
+            self.on_evict(key, value)
+        except Exception as e:
+            logger.warning(f"{self.name}: eviction callback failed for {key!r}: {e}")
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key without loading or counting"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def keys(self) -> List[Hashable]:
+        """Cached keys, least recently used first"""
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or every key when none is given, calling ``on_evict`` for each"""
+        with self._lock:
+            if key is None:
+                removed = list(self._entries.items())
+                self._entries.clear()
+            else:
+                entry = self._entries.pop(key, None)
+                removed = [(key, entry)] if entry is not None else []
+            for removed_key, entry in removed:
+                self._notify_evicted(removed_key, entry.value)
+
+    def stats(self, include_entries: bool = True) -> Dict[str, Any]:
+        """Hit/miss counters plus, unless ``include_entries`` is off, the age of every cached entry"""
+        with self._lock:
+            now = self._clock()
+            size = len(self._entries)
+            entries = {
+                str(key): {
+                    'age_seconds': round(now - entry.loaded_at, 3),
+                    'fresh': now - entry.loaded_at < self.ttl
+                }
+                for key, entry in self._entries.items()
+            } if include_entries else None
+            counters = dict(self._counters)
+
+        lookups = counters['hits'] + counters['stale_hits'] + counters['misses']
+        stats = {
+            'name': self.name,
+            'ttl_seconds': self.ttl,
+            'stale_ttl_seconds': self.stale_ttl,
+            'size': size,
+            'max_entries': self.max_entries,
+            **counters,
+            'hit_ratio': round((counters['hits'] + counters['stale_hits']) / lookups, 3) if lookups else 0.0
+        }
+        if entries is not None:
+            stats['entries'] = entries
+        return stats
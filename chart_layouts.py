@@ -0,0 +1,70 @@
+"""
+Static Plotly layout and marker blocks shared by every chart payload.
+
+They never change between requests, so they are built once at import time as
+read-only StaticJSON dicts that the JSON provider can serialize once and reuse.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class StaticJSON(dict):
+    """Read-only dict whose JSON encoding is computed once and cached.
+
+    Nested dicts are frozen too. Python callers can read it like any dict, and
+    the app's JSON provider splices the cached bytes in instead of re-encoding
+    the block for every response.
+    """
+
+    __slots__ = ('_encoded',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for key, value in dict.items(self):
+            if isinstance(value, dict) and not isinstance(value, StaticJSON):
+                dict.__setitem__(self, key, StaticJSON(value))
+            elif isinstance(value, list):
+                dict.__setitem__(self, key, tuple(value))
+        self._encoded: Dict[Hashable, bytes] = {}
+
+    def encoded(self, encoder: Callable[[Dict[str, Any]], bytes], options: Hashable = None) -> bytes:
+        """JSON bytes for this block, produced by ``encoder`` on first use with each set of options"""
+        try:
+            return self._encoded[options]
+        except KeyError:
+            return self._encoded.setdefault(options, encoder(dict(self)))
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('StaticJSON blocks are shared between responses and cannot be modified')
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+def layout(title: str, show_legend: bool, x_title: Optional[str] = None,
+           y_title: Optional[str] = None) -> StaticJSON:
+    block: Dict[str, Any] = {'title': title}
+    if x_title is not None:
+        block['xaxis'] = {'title': x_title}
+    if y_title is not None:
+        block['yaxis'] = {'title': y_title}
+    block['showlegend'] = show_legend
+    return StaticJSON(block)
+
+
+PASSENGER_FLOW_LAYOUT = layout('24-Hour Passenger Flow', False, 'Time', 'Number of Passengers')
+QUEUE_STATUS_LAYOUT = layout('Current Queue Status', False, 'Checkpoints', 'Number of People')
+BAGGAGE_UTILIZATION_LAYOUT = layout('Conveyor Belt Utilization', True)
+FLIGHT_STATUS_LAYOUT = layout('Flight Status Distribution', True)
+SECURITY_STATUS_LAYOUT = layout('Security Checkpoint Status', True)
+RESOURCE_UTILIZATION_LAYOUT = layout('System Resource Utilization (%)', True)
+STAFF_AVAILABILITY_LAYOUT = layout('Staff Availability by Department', False, 'Department', 'Availability %')
+
+PASSENGER_FLOW_LINE = StaticJSON({'color': '#3b82f6', 'width': 3})
+QUEUE_LENGTH_MARKER = StaticJSON({'color': '#10b981'})
+WAIT_TIME_MARKER = StaticJSON({'color': '#f59e0b'})
+STAFF_AVAILABILITY_MARKER = StaticJSON({'color': '#3b82f6'})
+BAGGAGE_UTILIZATION_MARKER = StaticJSON({'colors': ['#ef4444', '#f59e0b', '#10b981', '#6b7280']})
+FLIGHT_STATUS_MARKER = StaticJSON({'colors': ['#10b981', '#f59e0b', '#3b82f6', '#6b7280', '#ef4444', '#8b5cf6']})
+SECURITY_STATUS_MARKER = StaticJSON({'colors': ['#10b981', '#f59e0b', '#ef4444']})
+RESOURCE_UTILIZATION_MARKER = StaticJSON({'colors': ['#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']})
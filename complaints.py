@@ -0,0 +1,212 @@
+import base64
+import bisect
+import datetime
+import itertools
+import json
+import threading
+import logging
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPLAINT_STATUSES = ('Received', 'In Progress', 'Resolved')
+COMPLAINT_ISSUE_TYPES = ('Lost Baggage', 'Damaged Baggage', 'Delayed Baggage', 'Missing Items')
+# Fields every complaint is indexed and counted by
+INDEXED_FIELDS = ('status', 'priority', 'issue_type')
+
+# Listing order, newest last: the same in every worker, however complaints reached it
+SortKey = Tuple[str, str]
+
+
+def sort_key(complaint: Dict[str, Any]) -> SortKey:
+    return complaint.get('submitted_at') or '', complaint['complaint_id']
+
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """The sort key a cursor from ``encode_cursor`` stands for; ValueError if it is not one"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(part, str) for part in key)):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return key[0], key[1]
+
+
+class _AirportComplaints:
+    """One airport's complaint indexes: sort keys per indexed value, kept sorted"""
+
+    __slots__ = ('keys', 'index', 'counts', 'stats')
+
+    def __init__(self):
+        self.keys: List[SortKey] = []
+        self.index: Dict[Tuple[str, str], List[SortKey]] = {}
+        self.counts: Dict[str, Counter] = {name: Counter() for name in INDEXED_FIELDS}
+        self.stats: Mapping[str, Any] = MappingProxyType({'total': 0, 'counts': {}})
+
+    def add(self, key: SortKey, complaint: Dict[str, Any]) -> None:
+        # New complaints nearly always sort last, so insort is an append; synced ones may land earlier
+        bisect.insort(self.keys, key)
+        for name in INDEXED_FIELDS:
+            bisect.insort(self.index.setdefault((name, complaint[name]), []), key)
+            self.counts[name][complaint[name]] += 1
+
+    def move(self, key: SortKey, name: str, old: str, new: str) -> None:
+        old_keys = self.index[(name, old)]
+        del old_keys[bisect.bisect_left(old_keys, key)]
+        bisect.insort(self.index.setdefault((name, new), []), key)
+        self.counts[name][old] -= 1
+        self.counts[name][new] += 1
+
+    def publish_stats(self) -> None:
+        # Readers take the published mapping without locking; it is replaced, never changed
+        self.stats = MappingProxyType({
+            'total': len(self.keys),
+            'counts': {name: dict(+counter) for name, counter in self.counts.items()}
+        })
+
+
+class ComplaintStore:
+    """Complaints indexed by ID, airport, status, priority and issue type.
+
+    Running counts per airport are updated on every insert and status change,
+    so the staff dashboard's aggregates cost nothing however long the log
+    grows. Listings are newest first by ``(submitted_at, complaint_id)``
+    and paged with a cursor encoding that key, so every worker sharing a
+    database orders complaints alike and accepts each other's cursors.
+    A page walks only the narrowest index that matches the filters. Stored complaints are never
+    changed in place: a status change stores a new dict, so anything a
+    reader already holds stays consistent. Every status change bumps the
+    complaint's ``revision``, so copies synced from elsewhere never replace
+    a newer local change.
+    """
+
+    def __init__(self, first_id: int = 100000, id_allocator: Optional[Callable[[], int]] = None):
+        self._next_id = id_allocator or itertools.count(first_id).__next__
+        self._by_id: Dict[str, Tuple[SortKey, Dict[str, Any]]] = {}
+        self._by_key: Dict[SortKey, Dict[str, Any]] = {}
+        self._airports: Dict[str, _AirportComplaints] = {}
+        self._lock = threading.Lock()
+
+    def new_complaint_id(self) -> str:
+        return f'COMP{self._next_id()}'
+
+    def add(self, complaint: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a complaint; it needs complaint_id, airport_code and every indexed field"""
+        complaint = dict(complaint)
+        complaint.setdefault('revision', 0)
+        with self._lock:
+            if complaint['complaint_id'] in self._by_id:
+                raise ValueError(f"Duplicate complaint ID: {complaint['complaint_id']}")
+            key = sort_key(complaint)
+            self._by_id[complaint['complaint_id']] = (key, complaint)
+            self._by_key[key] = complaint
+            airport = self._airports.setdefault(complaint['airport_code'], _AirportComplaints())
+            airport.add(key, complaint)
+            airport.publish_stats()
+        return complaint
+
+    def seed_if_empty(self, airport_code: str, complaints: Iterable[Dict[str, Any]]) -> bool:
+        """Add sample complaints for an airport that has none yet; returns whether it seeded"""
+        with self._lock:
+            if airport_code in self._airports:
+                return False
+            self._airports[airport_code] = _AirportComplaints()
+        for complaint in complaints:
+            self.add(dict(complaint, airport_code=airport_code))
+        return True
+
+    def apply(self, complaint: Dict[str, Any]) -> None:
+        """Bring a complaint written elsewhere (e.g. by another worker) into this store.
+
+        Older revisions are ignored, so a local change whose write has not
+        reached the database yet is not undone. Equal revisions are
+        concurrent changes from two workers; the copy applied last, which is
+        the one committed last, wins everywhere.
+        """
+        current = self.get(complaint['complaint_id'])
+        if current is None:
+            try:
+                self.add(complaint)
+            except ValueError:
+                current = self.get(complaint['complaint_id'])
+        revision = complaint.get('revision', 0)
+        if current is not None and current['status'] != complaint['status'] and revision >= current['revision']:
+            self.update_status(complaint['complaint_id'], complaint['status'], complaint.get('updated_at'),
+                               revision=revision)
+
+    def get(self, complaint_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._by_id.get(complaint_id)
+        return entry[1] if entry else None
+
+    def update_status(self, complaint_id: str, status: str, updated_at: Optional[str] = None,
+                      revision: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Change a complaint's status; returns the updated complaint, or None if it does not exist"""
+        if status not in COMPLAINT_STATUSES:
+            raise ValueError(f"Unknown complaint status: {status}")
+        with self._lock:
+            entry = self._by_id.get(complaint_id)
+            if entry is None:
+                return None
+            key, complaint = entry
+            if complaint['status'] == status:
+                return complaint
+
+            updated = dict(complaint, status=status,
+                           updated_at=updated_at or datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                           revision=complaint['revision'] + 1 if revision is None else revision)
+            self._by_id[complaint_id] = (key, updated)
+            self._by_key[key] = updated
+            airport = self._airports[complaint['airport_code']]
+            airport.move(key, 'status', complaint['status'], status)
+            airport.publish_stats()
+            return updated
+
+    def stats(self, airport_code: str) -> Mapping[str, Any]:
+        """Total and per-field counts for an airport, e.g. ``stats['counts']['status']['Resolved']``"""
+        airport = self._airports.get(airport_code)
+        return airport.stats if airport else _AirportComplaints().stats
+
+    def query(self, airport_code: str, filters: Optional[Dict[str, str]] = None,
+              cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest-first complaints matching ``filters``, older than ``cursor``; returns (page, next_cursor)"""
+        before = None if cursor is None else decode_cursor(cursor)
+        filters = {name: value for name, value in (filters or {}).items() if value is not None}
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Complaints cannot be filtered by: {', '.join(sorted(unknown))}")
+        with self._lock:
+            airport = self._airports.get(airport_code)
+            if airport is None:
+                return [], None
+
+            # Walk the smallest matching index and check the remaining filters per complaint
+            candidates = airport.keys
+            for name, value in filters.items():
+                keys = airport.index.get((name, value), [])
+                if len(keys) < len(candidates):
+                    candidates = keys
+
+            end = len(candidates) if before is None else bisect.bisect_left(candidates, before)
+            page: List[Dict[str, Any]] = []
+            last_key = next_cursor = None
+            for position in range(end - 1, -1, -1):
+                key = candidates[position]
+                complaint = self._by_key[key]
+                if any(complaint[name] != value for name, value in filters.items()):
+                    continue
+                if len(page) == limit:
+                    next_cursor = encode_cursor(last_key)
+                    break
+                page.append(complaint)
+                last_key = key
+            return page, next_cursor
+
+    def __len__(self) -> int:
+        return len(self._by_id)
@@ -0,0 +1,122 @@
+import gzip
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/html',
+    'text/css',
+    'text/plain'
+}
+
+
+class ResponseCompressor:
+    """Gzip/Brotli compression for responses, negotiated from Accept-Encoding.
+
+    Bodies smaller than ``min_size`` bytes, streamed responses and anything
+    already encoded are sent as they are. Responses with a strong ETag are
+    content-addressed, so their compressed bytes are cached by (ETag,
+    encoding): a snapshot section served to many clients is compressed once
+    per snapshot version. Compressed responses get the encoding appended to
+    their ETag, and If-None-Match is re-checked against that tag so
+    revalidation still ends in a 304.
+    """
+
+    def __init__(self, min_size: int = 1024, level: int = 6, brotli_quality: int = 5,
+                 cache_size: int = 256):
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.cache_size = cache_size
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+        self._cache: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'compressed': 0, 'cache_hits': 0, 'skipped_small': 0}
+
+    def init_app(self, app) -> None:
+        app.extensions['response_compressor'] = self
+        app.after_request(self.after_request)
+
+    def negotiate(self, accept_encodings) -> Optional[str]:
+        """Best encoding the client accepts, preferring Brotli on ties; None for identity"""
+        best, best_quality = None, 0
+        for encoding in self.encodings:
+            quality = accept_encodings.quality(encoding)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0 keeps the output identical for identical bodies
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    def compressed(self, body: bytes, encoding: str, etag: Optional[str] = None) -> bytes:
+        """Compressed body, reused from the cache when ``etag`` was compressed before"""
+        if etag is None:
+            self.stats['compressed'] += 1
+            return self.compress(body, encoding)
+
+        key = (etag, encoding)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                return cached
+
+        data = self.compress(body, encoding)
+        with self._lock:
+            self.stats['compressed'] += 1
+            self._cache[key] = data
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def after_request(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        body = response.get_data()
+        if len(body) < self.min_size:
+            self.stats['skipped_small'] += 1
+            return response
+
+        etag, weak = response.get_etag()
+        cache_key = None
+        if etag:
+            cache_key = None if weak else etag
+            response.set_etag(f'{etag}-{encoding}', weak=weak)
+            # The client's cached copy carries the encoded tag, so check it again
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+        try:
+            response.set_data(self.compressed(body, encoding, cache_key))
+        except Exception as e:
+            logger.error(f"Error compressing response with {encoding}: {e}")
+            return response
+        response.headers['Content-Encoding'] = encoding
+        return response
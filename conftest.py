@@ -0,0 +1,76 @@
+"""
+Shared fixtures: the app and data source manager with their upstream APIs replaced by fixed offline data
+"""
+
+import time
+
+import pytest
+
+from data_sources import DataSourceManager
+from web_server import create_app
+
+CLEAR_WEATHER = {'temperature': 25, 'condition': 'Clear', 'wind_speed': 5,
+                 'visibility': 'Good', 'impact': 'Low'}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clear_weather():
+    """A fresh copy of the weather every offline fixture reports"""
+    return dict(CLEAR_WEATHER)
+
+
+@pytest.fixture
+def fake_clock():
+    """A clock for caches and snapshot engines that only moves when a test sets ``now``"""
+    return FakeClock()
+
+
+@pytest.fixture
+def wait_until():
+    """Poll ``predicate`` until it holds or ``timeout`` seconds pass; returns its last value"""
+    def wait(predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return predicate()
+    return wait
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Clear weather, no live flights and one snapshot tick per hour, so tests never call upstream"""
+    monkeypatch.setattr(DataSourceManager, '_fetch_weather_data', lambda self, code, timeout=5: dict(CLEAR_WEATHER))
+    monkeypatch.setattr(DataSourceManager, 'get_opensky_flights', lambda self, code, timeout=10: [])
+    monkeypatch.setenv('SNAPSHOT_REFRESH_INTERVAL', '3600')
+
+
+@pytest.fixture
+def offline_app(offline):
+    return create_app()
+
+
+@pytest.fixture
+def offline_manager():
+    """Factory for managers with clear weather and no live flights; OpenSky lookups go to ``opensky_calls``"""
+    def make(opensky_calls=None):
+        manager = DataSourceManager()
+        manager._fetch_weather_data = lambda airport_code, timeout=5: dict(CLEAR_WEATHER)
+
+        def fake_opensky(airport_code, timeout=10):
+            if opensky_calls is not None:
+                opensky_calls.append(airport_code)
+            return []
+
+        manager.get_opensky_flights = fake_opensky
+        return manager
+    return make
@@ -0,0 +1,236 @@
+import datetime
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from models import Bag, Belt
+from rng import simulation_random as random
+
+logger = logging.getLogger(__name__)
+
+MOVING_STATUSES = ('Active', 'Slow', 'Overloaded')
+# Slow and overloaded belts report no drive speed but still crawl at a fraction of max speed
+CRAWL_SPEED_FACTORS = {'Slow': 0.3, 'Overloaded': 0.5}
+BELT_CAPACITY = 15
+STUCK_ZONE_START = 80.0
+# Longest gap a single tick will simulate; after a long pause the belts resume instead of replaying it
+MAX_CATCH_UP_SECONDS = 300.0
+
+
+@dataclass(slots=True)
+class ConveyorDelta:
+    """What one tick changed: belts that need re-sending and bags that arrived or left"""
+
+    version: int
+    changed_belts: List[str] = field(default_factory=list)
+    added_bags: Dict[str, List[str]] = field(default_factory=dict)
+    removed_bags: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.changed_belts)
+
+
+class ConveyorState:
+    """Persistent conveyor simulation for one airport, advanced incrementally.
+
+    The belts are built once with the data source manager's per-belt pipeline.
+    Each later tick then moves bags by ``speed * dt`` along a belt of
+    ``belt_length_m`` metres, drops bags that reach 100% and lets new ones
+    arrive at ``bag_arrival_rate`` bags per minute per moving belt. Belt
+    statuses and sensor readings are re-evaluated every
+    ``status_interval`` seconds. Only belts that changed are re-scored and
+    re-serialized. Bags are also indexed by flight number as they arrive
+    and leave. Callers must hold ``lock`` while advancing or reading.
+    """
+
+    def __init__(self, data_source_manager, airport_code: str, config: Dict[str, Any],
+                 belt_length_m: float = 100.0, bag_arrival_rate: float = 6.0,
+                 status_interval: float = 60.0, stuck_chance: float = 0.05,
+                 stuck_release_seconds: float = 30.0):
+        self.data_source_manager = data_source_manager
+        self.airport_code = airport_code
+        self.config = config
+        self.belt_length_m = belt_length_m
+        self.bag_arrival_rate = bag_arrival_rate
+        self.status_interval = status_interval
+        self.stuck_chance = stuck_chance
+        self.stuck_release_seconds = stuck_release_seconds
+        self.lock = threading.RLock()
+        self.belts: Dict[str, Belt] = {}
+        self.version = 0
+        self.updated_at: Optional[float] = None
+        self.last_delta = ConveyorDelta(version=0)
+        self._next_status_at: Dict[str, float] = {}
+        self._arrival_credit: Dict[str, float] = {}
+        self._stuck_since: Dict[str, float] = {}
+        self._serialized: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        # flight -> {id(bag): bag}; bag IDs are random and may repeat, objects do not
+        self._bags_by_flight: Dict[str, Dict[int, Bag]] = {}
+
+    def advance_to(self, now: float, weather_impact: str = 'Low') -> ConveyorDelta:
+        """Advance the simulation to ``now`` (epoch seconds). Calling again with the same time is a no-op."""
+        with self.lock:
+            if self.updated_at is None:
+                return self._build(now, weather_impact)
+            if now <= self.updated_at:
+                return ConveyorDelta(version=self.version)
+
+            dt = min(now - self.updated_at, MAX_CATCH_UP_SECONDS)
+            self.updated_at = now
+            delta = ConveyorDelta(version=self.version + 1)
+            clock_label = datetime.datetime.fromtimestamp(now).strftime('%H:%M:%S')
+
+            for belt_id, belt in self.belts.items():
+                changed = False
+                if now >= self._next_status_at[belt_id]:
+                    self._refresh_status(belt, now, weather_impact)
+                    changed = True
+
+                removed = self._move_bags(belt, dt, now, clock_label)
+                added = self._admit_bags(belt, dt, clock_label)
+                if removed:
+                    delta.removed_bags[belt_id] = removed
+                if added:
+                    delta.added_bags[belt_id] = added
+
+                if changed or removed or added or self._bags_moved(belt):
+                    belt.utilization = self.data_source_manager._calculate_utilization(belt.bags, belt.status)
+                    belt.last_updated = clock_label
+                    self.data_source_manager._score_belt(belt)
+                    self._dirty.add(belt_id)
+                    delta.changed_belts.append(belt_id)
+
+            if delta:
+                self.version = delta.version
+            else:
+                delta.version = self.version
+            self.last_delta = delta
+            return delta
+
+    def serialized_belts(self) -> List[Dict[str, Any]]:
+        """JSON-shaped belts; dicts of belts that did not change are reused from earlier ticks"""
+        with self.lock:
+            for belt_id in self._dirty:
+                self._serialized[belt_id] = self.belts[belt_id].to_dict()
+            self._dirty.clear()
+            return [self._serialized[belt_id] for belt_id in self.belts]
+
+    def bags_for_flight(self, flight: str) -> List[Bag]:
+        """Bags for a flight currently on any of this airport's belts"""
+        with self.lock:
+            return list(self._bags_by_flight.get(flight, {}).values())
+
+    def drive_speed(self, belt: Belt) -> float:
+        """Speed (m/s) bags actually move at on this belt"""
+        if belt.status not in MOVING_STATUSES:
+            return 0.0
+        return belt.speed or belt.max_speed * CRAWL_SPEED_FACTORS.get(belt.status, 0.0)
+
+    def _build(self, now: float, weather_impact: str) -> ConveyorDelta:
+        dsm = self.data_source_manager
+        clock_label = datetime.datetime.fromtimestamp(now).strftime('%H:%M:%S')
+        belt_counter = 1
+        for terminal in self.config['terminals']:
+            for belt_num in range(1, self.config['belts_per_terminal'][terminal] + 1):
+                belt_id = f'{terminal}-Belt-{belt_num:02d}'
+                belt = dsm._build_belt(self.airport_code, belt_id, terminal, self.config,
+                                       weather_impact, belt_counter, clock_label)
+                self.belts[belt_id] = belt
+                # Stagger status re-evaluation so belts do not all flip on the same tick
+                self._next_status_at[belt_id] = now + self.status_interval * random.uniform(0.5, 1.5)
+                self._arrival_credit[belt_id] = 0.0
+                for bag in belt.bags:
+                    self._refresh_eta(belt, bag)
+                    self._index_bag(bag)
+                    if bag.stuck:
+                        self._stuck_since[bag.bag_id] = now
+                belt_counter += 1
+
+        self.updated_at = now
+        self.version = 1
+        self._dirty = set(self.belts)
+        self.last_delta = ConveyorDelta(
+            version=self.version,
+            changed_belts=list(self.belts),
+            added_bags={belt_id: [bag.bag_id for bag in belt.bags]
+                        for belt_id, belt in self.belts.items() if belt.bags}
+        )
+        return self.last_delta
+
+    def _refresh_status(self, belt: Belt, now: float, weather_impact: str) -> None:
+        dsm = self.data_source_manager
+        belt.status, belt.ai_insights = dsm._get_ai_belt_status(belt.belt_id, self.airport_code, weather_impact)
+        belt.sensors = dsm._generate_sensor_data(self.config['sensor_types'], belt.status)
+        self._next_status_at[belt.belt_id] = now + self.status_interval
+
+    def _move_bags(self, belt: Belt, dt: float, now: float, clock_label: str) -> List[str]:
+        """Move bags forward and return the IDs of the ones that came off the end"""
+        speed = self.drive_speed(belt)
+        if not speed or not belt.bags:
+            return []
+
+        step = speed * dt / self.belt_length_m * 100
+        departed = []
+        for bag in belt.bags:
+            if bag.stuck:
+                if now - self._stuck_since.get(bag.bag_id, now) < self.stuck_release_seconds:
+                    continue
+                bag.stuck = False
+                self._stuck_since.pop(bag.bag_id, None)
+
+            previous = bag.position
+            bag.position = round(min(100.0, previous + step), 1)
+            bag.last_movement = clock_label
+            if bag.position >= 100:
+                departed.append(bag)
+                continue
+            if previous <= STUCK_ZONE_START < bag.position and random.random() < self.stuck_chance:
+                bag.stuck = True
+                self._stuck_since[bag.bag_id] = now
+            self._refresh_eta(belt, bag)
+
+        if departed:
+            belt.bags = [bag for bag in belt.bags if bag.position < 100]
+            belt.total_processed_today += len(departed)
+            for bag in departed:
+                self._unindex_bag(bag)
+        return [bag.bag_id for bag in departed]
+
+    def _admit_bags(self, belt: Belt, dt: float, clock_label: str) -> List[str]:
+        """Load new bags at the start of the belt and return their IDs"""
+        if belt.status not in MOVING_STATUSES:
+            return []
+
+        credit = self._arrival_credit[belt.belt_id] + self.bag_arrival_rate * dt / 60
+        arrivals = int(credit)
+        self._arrival_credit[belt.belt_id] = credit - arrivals
+        arrivals = min(arrivals, BELT_CAPACITY - len(belt.bags))
+
+        added = []
+        for _ in range(arrivals):
+            bag = self.data_source_manager._new_bag(belt.belt_id, 0.0, belt.max_speed, clock_label)
+            self._refresh_eta(belt, bag)
+            belt.bags.append(bag)
+            self._index_bag(bag)
+            added.append(bag.bag_id)
+        return added
+
+    def _index_bag(self, bag: Bag) -> None:
+        self._bags_by_flight.setdefault(bag.flight, {})[id(bag)] = bag
+
+    def _unindex_bag(self, bag: Bag) -> None:
+        flight_bags = self._bags_by_flight.get(bag.flight)
+        if flight_bags is not None:
+            flight_bags.pop(id(bag), None)
+            if not flight_bags:
+                del self._bags_by_flight[bag.flight]
+
+    def _bags_moved(self, belt: Belt) -> bool:
+        return bool(belt.bags) and self.drive_speed(belt) > 0
+
+    def _refresh_eta(self, belt: Belt, bag: Bag) -> None:
+        speed = self.drive_speed(belt)
+        remaining_m = (100 - bag.position) / 100 * self.belt_length_m
+        bag.eta_seconds = round(remaining_m / speed, 1) if speed > 0 else 0
@@ -0,0 +1,142 @@
+import threading
+import uuid
+import logging
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bag fields that never change while a bag is on a belt, so deltas leave them out
+STATIC_BAG_FIELDS = ('bag_id', 'tracking_history')
+
+
+def diff_fields(previous: Dict[str, Any], current: Dict[str, Any], skip: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Fields of ``current`` whose values differ from ``previous``"""
+    return {key: value for key, value in current.items()
+            if key not in skip and previous.get(key) != value}
+
+
+def diff_belt(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Changed belt fields plus added, removed and changed bags"""
+    delta: Dict[str, Any] = {}
+    changed = diff_fields(previous, current, skip=('bags_on_belt',))
+    if changed:
+        delta['changed'] = changed
+
+    previous_bags = {bag['bag_id']: bag for bag in previous['bags_on_belt']}
+    current_ids = set()
+    added = []
+    changed_bags = {}
+    for bag in current['bags_on_belt']:
+        current_ids.add(bag['bag_id'])
+        old_bag = previous_bags.get(bag['bag_id'])
+        if old_bag is None:
+            added.append(bag)
+            continue
+        bag_changes = diff_fields(old_bag, bag, skip=STATIC_BAG_FIELDS)
+        if bag_changes:
+            changed_bags[bag['bag_id']] = bag_changes
+
+    removed = [bag_id for bag_id in previous_bags if bag_id not in current_ids]
+    if added:
+        delta['bags_added'] = added
+    if removed:
+        delta['bags_removed'] = removed
+    if changed_bags:
+        delta['bags_changed'] = changed_bags
+    return delta
+
+
+def diff_live_conveyors(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta between two /live-conveyors payloads; empty when nothing changed"""
+    previous_belts = {belt['belt_id']: belt for belt in previous['conveyor_belts']}
+    belts = {}
+    for belt in current['conveyor_belts']:
+        old_belt = previous_belts.pop(belt['belt_id'], None)
+        if old_belt is belt:
+            continue  # Unchanged belts keep the same serialized dict between ticks
+        if old_belt is None:
+            belts[belt['belt_id']] = {'added': belt}
+            continue
+        belt_delta = diff_belt(old_belt, belt)
+        if belt_delta:
+            belts[belt['belt_id']] = belt_delta
+
+    delta: Dict[str, Any] = {}
+    if belts:
+        delta['belts'] = belts
+    if previous_belts:
+        delta['belts_removed'] = list(previous_belts)
+    summary = diff_fields(previous, current, skip=('conveyor_belts',))
+    if summary:
+        delta['summary'] = summary
+    return delta
+
+
+def format_sse(event_id: str, event: str, data: str) -> str:
+    """One Server-Sent Events message; ``data`` must already be serialized to a single line"""
+    return f'id: {event_id}\nevent: {event}\ndata: {data}\n\n'
+
+
+class ConveyorDeltaFeed:
+    """Sequenced live-conveyor deltas for one airport, shared by every stream client.
+
+    Each new /live-conveyors payload is diffed against the previous one once,
+    no matter how many clients are connected. The last ``history`` deltas are
+    kept so a reconnecting client can resume from its Last-Event-ID. Event IDs
+    carry a per-process epoch, so IDs from before a restart are not mistaken
+    for current ones and those clients get a fresh snapshot instead.
+    """
+
+    def __init__(self, airport_code: str, history: int = 256):
+        self.airport_code = airport_code
+        self.epoch = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self._current: Optional[Dict[str, Any]] = None
+        self._events: deque = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def update(self, live_data: Dict[str, Any]) -> int:
+        """Publish a new payload, recording its delta; returns the latest sequence number"""
+        with self._lock:
+            if live_data is self._current or live_data.get('error'):
+                return self.seq
+
+            if self._current is None:
+                self._current = live_data
+                self.seq = 1
+                return self.seq
+
+            delta = diff_live_conveyors(self._current, live_data)
+            self._current = live_data
+            if delta:
+                self.seq += 1
+                delta['seq'] = self.seq
+                self._events.append((self.seq, delta))
+            return self.seq
+
+    def snapshot(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Latest full payload and the sequence number it corresponds to"""
+        with self._lock:
+            return self.seq, self._current
+
+    def events_since(self, seq: int) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """Deltas after ``seq``, or None if they are no longer buffered (send a snapshot instead)"""
+        with self._lock:
+            if seq == self.seq:
+                return []
+            if seq > self.seq or not self._events or self._events[0][0] > seq + 1:
+                return None
+            return [(event_seq, delta) for event_seq, delta in self._events if event_seq > seq]
+
+    def event_id(self, seq: int) -> str:
+        return f'{self.epoch}-{seq}'
+
+    def parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        """Sequence number of a Last-Event-ID issued by this feed, else None"""
+        if not event_id:
+            return None
+        epoch, _, seq = event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
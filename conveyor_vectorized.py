@@ -0,0 +1,323 @@
+"""
+Vectorized conveyor simulation for capacity planning.
+
+Mirrors the per-belt pipeline in DataSourceManager (sensor generation, bag
+placement, efficiency, issue prediction, delay risk and breakdown scoring) but
+works on whole arrays of belts at once, so thousands of belts can be simulated
+in a few milliseconds.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from data_sources import belt_status_weights
+from models import Bag, Belt, SensorReading
+
+BELT_STATUSES = ('Active', 'Idle', 'Maintenance', 'Slow', 'Overloaded')
+ACTIVE, IDLE, MAINTENANCE, SLOW, OVERLOADED = range(len(BELT_STATUSES))
+MOVING_STATUSES = (ACTIVE, SLOW, OVERLOADED)
+
+BEARING_HEALTH = ('Good', 'Fair', 'Poor')
+BEARING_WEIGHTS = (0.6, 0.2, 0.2)
+POOR_BEARING = 2
+
+# Level names indexed by how many thresholds a score reaches
+HEALTH_LEVELS = ('Critical', 'Poor', 'Fair', 'Good', 'Excellent')
+HEALTH_THRESHOLDS = (40, 60, 75, 90)
+RISK_LEVELS = ('Minimal', 'Low', 'Medium', 'High', 'Critical')
+BREAKDOWN_LEVELS = ('Very Low', 'Low', 'Medium', 'High', 'Very High')
+SCORE_THRESHOLDS = (20, 40, 60, 80)
+
+MAX_BAGS_PER_BELT = 15
+REFERENCE_SPEED = 5.0
+
+# Utilization ranges (inclusive low, exclusive high) by number of bags on a moving belt
+UTILIZATION_BUCKETS = ((0, 10, 31), (3, 20, 41), (6, 40, 61), (10, 60, 81), (MAX_BAGS_PER_BELT, 80, 96))
+
+
+@dataclass(slots=True)
+class ConveyorBatch:
+    """Simulated state of many belts, one array element (or row) per belt.
+
+    Sensor arrays for sensors that are not fitted are None. Bag arrays are
+    padded to MAX_BAGS_PER_BELT columns, and ``bag_mask`` marks the real bags.
+    """
+
+    sensor_types: tuple
+    max_speed: float
+    status: np.ndarray
+    speed: np.ndarray
+    utilization: np.ndarray
+    total_processed_today: np.ndarray
+    last_maintenance_days: np.ndarray
+    bag_count: np.ndarray
+    bag_mask: np.ndarray
+    bag_position: np.ndarray
+    bag_eta_seconds: np.ndarray
+    bag_stuck: np.ndarray
+    overload_warning: np.ndarray
+    overheating_warning: np.ndarray
+    abnormal_vibration: np.ndarray
+    current_load: Optional[np.ndarray] = None
+    last_calibration_days: Optional[np.ndarray] = None
+    speed_variation: Optional[np.ndarray] = None
+    stuck_detection: Optional[np.ndarray] = None
+    current_temp: Optional[np.ndarray] = None
+    vibration_level: Optional[np.ndarray] = None
+    bearing_health: Optional[np.ndarray] = None
+    bag_detection: Optional[np.ndarray] = None
+    jam_detection: Optional[np.ndarray] = None
+    foreign_object_detection: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def to_belt(self, index: int) -> Belt:
+        """Materialize one simulated belt as a record model (for drill-down and checks)"""
+        def value(array, cast):
+            return None if array is None else cast(array[index])
+
+        status = BELT_STATUSES[self.status[index]]
+        sensors = SensorReading(
+            sensor_types=self.sensor_types,
+            current_speed=float(self.speed[index]),
+            current_load=value(self.current_load, int),
+            last_calibration_days=value(self.last_calibration_days, int),
+            overload_warning=bool(self.overload_warning[index]),
+            speed_variation=value(self.speed_variation, float),
+            stuck_detection=value(self.stuck_detection, bool),
+            current_temp=value(self.current_temp, float),
+            overheating_warning=bool(self.overheating_warning[index]),
+            vibration_level=value(self.vibration_level, float),
+            bearing_health=None if self.bearing_health is None else BEARING_HEALTH[self.bearing_health[index]],
+            abnormal_vibration=bool(self.abnormal_vibration[index]),
+            bag_detection=value(self.bag_detection, int),
+            jam_detection=value(self.jam_detection, bool),
+            foreign_object_detection=value(self.foreign_object_detection, bool)
+        )
+        belt_id = f'SIM-Belt-{index + 1:05d}'
+        bags = [
+            Bag(
+                bag_id=f'SIM{index + 1:05d}-{slot + 1:02d}',
+                belt_id=belt_id,
+                position=float(self.bag_position[index, slot]),
+                flight='',
+                destination='',
+                priority='Normal',
+                weight_kg=0,
+                eta_seconds=float(self.bag_eta_seconds[index, slot]),
+                stuck=bool(self.bag_stuck[index, slot]),
+                last_movement=''
+            )
+            for slot in range(int(self.bag_count[index]))
+        ]
+        return Belt(
+            belt_id=belt_id,
+            terminal='SIM',
+            status=status,
+            max_speed=self.max_speed,
+            sensors=sensors,
+            bags=bags,
+            ai_insights={},
+            total_processed_today=int(self.total_processed_today[index]),
+            last_maintenance_days=int(self.last_maintenance_days[index]),
+            utilization=int(self.utilization[index]),
+            last_updated='',
+            belt_counter=index + 1
+        )
+
+
+@dataclass(slots=True)
+class ConveyorScores:
+    """Per-belt AI scores for a ConveyorBatch, as parallel arrays"""
+
+    efficiency_score: np.ndarray
+    health_level: np.ndarray
+    delay_risk_score: np.ndarray
+    risk_level: np.ndarray
+    estimated_delay_minutes: np.ndarray
+    breakdown_score: np.ndarray
+    breakdown_level: np.ndarray
+    issue_count: np.ndarray
+    critical_issue_count: np.ndarray
+
+
+def simulate_belts(num_belts: int, sensor_types: Sequence[str], max_speed: float, hour: int,
+                   weather_impact: str = 'Low', rng: Optional[np.random.Generator] = None) -> ConveyorBatch:
+    """Generate statuses, sensor readings and bags for ``num_belts`` belts in batched arrays"""
+    rng = rng if rng is not None else np.random.default_rng()
+    n = num_belts
+
+    weights = belt_status_weights(hour, weather_impact)
+    probabilities = np.array([weights.get(name, 0.0) for name in BELT_STATUSES])
+    status = rng.choice(len(BELT_STATUSES), size=n, p=probabilities / probabilities.sum()).astype(np.int8)
+    active = status == ACTIVE
+    moving = np.isin(status, MOVING_STATUSES)
+
+    speed = np.where(active, rng.uniform(1.0, 5.0, n), 0.0)
+    no_flags = np.zeros(n, dtype=bool)
+    sensors: Dict[str, Any] = {}
+    if 'weight' in sensor_types:
+        sensors['current_load'] = np.where(active, rng.integers(20, 96, n), 0)
+        sensors['last_calibration_days'] = rng.integers(1, 91, n)
+    if 'motion' in sensor_types:
+        sensors['speed_variation'] = rng.uniform(0.1, 0.5, n)
+        sensors['stuck_detection'] = rng.random(n) < 0.25
+    if 'temperature' in sensor_types:
+        sensors['current_temp'] = rng.uniform(18.0, 35.0, n)
+    if 'vibration' in sensor_types:
+        sensors['vibration_level'] = rng.uniform(0.1, 2.0, n)
+        sensors['bearing_health'] = rng.choice(len(BEARING_HEALTH), size=n, p=BEARING_WEIGHTS).astype(np.int8)
+    if 'optical' in sensor_types:
+        sensors['bag_detection'] = rng.integers(85, 100, n)
+        sensors['jam_detection'] = rng.random(n) < 0.2
+        sensors['foreign_object_detection'] = rng.random(n) < 1 / 6
+
+    # Bags: padded (belts x MAX_BAGS_PER_BELT) matrices, masked down to each belt's count
+    bag_count = np.where(active, rng.integers(3, 16, n), np.where(moving, rng.integers(1, 9, n), 0))
+    bag_mask = np.arange(MAX_BAGS_PER_BELT) < bag_count[:, None]
+    raw_position = rng.uniform(0, 100, (n, MAX_BAGS_PER_BELT))
+    bag_speed = max_speed * rng.uniform(0.8, 1.2, (n, MAX_BAGS_PER_BELT))
+    bag_eta_seconds = np.where(bag_mask, np.round((100 - raw_position) / bag_speed, 1), 0.0)
+    bag_stuck = bag_mask & (raw_position > 80) & (rng.random((n, MAX_BAGS_PER_BELT)) < 0.25)
+    bag_position = np.where(bag_mask, np.round(raw_position, 1), 0.0)
+
+    low = np.zeros(n, dtype=np.int64)
+    high = np.ones(n, dtype=np.int64)
+    lower_bound = -1
+    for upper_bound, bucket_low, bucket_high in UTILIZATION_BUCKETS:
+        in_bucket = moving & (bag_count > lower_bound) & (bag_count <= upper_bound)
+        low[in_bucket] = bucket_low
+        high[in_bucket] = bucket_high
+        lower_bound = upper_bound
+    utilization = rng.integers(low, high)
+
+    return ConveyorBatch(
+        sensor_types=tuple(sensor_types),
+        max_speed=max_speed,
+        status=status,
+        speed=speed,
+        utilization=utilization,
+        total_processed_today=rng.integers(200, 801, n),
+        last_maintenance_days=rng.integers(1, 31, n),
+        bag_count=bag_count,
+        bag_mask=bag_mask,
+        bag_position=bag_position,
+        bag_eta_seconds=bag_eta_seconds,
+        bag_stuck=bag_stuck,
+        overload_warning=no_flags,
+        overheating_warning=no_flags,
+        abnormal_vibration=no_flags,
+        **sensors
+    )
+
+
+def score_belts(batch: ConveyorBatch) -> ConveyorScores:
+    """Efficiency, issue, delay risk and breakdown scores for every belt, using array operations"""
+    moving = np.isin(batch.status, MOVING_STATUSES)
+    has_bags = batch.bag_count > 0
+    warnings = batch.overload_warning.astype(int) + batch.overheating_warning
+    abnormal = batch.abnormal_vibration.astype(int)
+
+    # Efficiency: bag flow, speed against the reference drive, and sensor health
+    avg_position = batch.bag_position.sum(axis=1) / np.maximum(batch.bag_count, 1)
+    flow_efficiency = np.where(has_bags, np.maximum(0, 100 - avg_position) / 100 * 0.4, 0.0)
+    speed_efficiency = np.minimum(1.0, batch.speed / REFERENCE_SPEED) * 0.3
+    sensor_health = np.maximum(0, 1.0 - 0.2 * warnings - 0.3 * abnormal) * 0.3
+    efficiency = np.where(moving, np.round((flow_efficiency + speed_efficiency + sensor_health) * 100, 1), 0.0)
+
+    # Predicted issues
+    stuck_bags = batch.bag_stuck.sum(axis=1)
+    issue_count = (stuck_bags > 0).astype(int)
+    if batch.current_load is not None:
+        issue_count += batch.current_load > 80
+    if batch.current_temp is not None:
+        issue_count += batch.current_temp > 30
+    if batch.vibration_level is not None:
+        issue_count += batch.vibration_level > 1.5
+
+    # Delay risk
+    total_risk = (np.minimum(100, stuck_bags * 25)
+                  + np.where(batch.speed < 2.0, np.minimum(100, (2.0 - batch.speed) * 50), 0.0)
+                  + 15 * warnings + 25 * abnormal)
+    estimated_delay = np.where(total_risk > 20, np.minimum(60, total_risk // 2), 0)
+
+    # Breakdown probability
+    breakdown = np.zeros(len(batch), dtype=np.int64)
+    if batch.current_temp is not None:
+        breakdown += 30 * (batch.current_temp > 35)
+    if batch.vibration_level is not None:
+        breakdown += 25 * (batch.vibration_level > 2.0)
+        breakdown += 40 * (batch.bearing_health == POOR_BEARING)
+    if batch.current_load is not None:
+        breakdown += 20 * (batch.current_load > 90)
+
+    return ConveyorScores(
+        efficiency_score=efficiency,
+        health_level=np.searchsorted(HEALTH_THRESHOLDS, efficiency, side='right'),
+        delay_risk_score=np.minimum(100, total_risk),
+        risk_level=np.searchsorted(SCORE_THRESHOLDS, total_risk, side='right'),
+        estimated_delay_minutes=estimated_delay,
+        breakdown_score=breakdown,
+        breakdown_level=np.searchsorted(SCORE_THRESHOLDS, breakdown, side='right'),
+        issue_count=issue_count,
+        critical_issue_count=(stuck_bags > 0).astype(int)
+    )
+
+
+def _distribution(levels: np.ndarray, names: Sequence[str]) -> Dict[str, int]:
+    counts = np.bincount(levels, minlength=len(names))
+    return {name: int(count) for name, count in zip(names, counts)}
+
+
+def summarize(batch: ConveyorBatch, scores: ConveyorScores, top: int = 5) -> Dict[str, Any]:
+    """Capacity-planning summary of a scored batch"""
+    active = batch.status == ACTIVE
+    moving = np.isin(batch.status, MOVING_STATUSES)
+    total_belts = len(batch)
+
+    # Highest breakdown score first, then highest delay risk
+    order = np.lexsort((-scores.delay_risk_score, -scores.breakdown_score))[:top]
+    highest_risk_belts: List[Dict[str, Any]] = [
+        {
+            'belt_index': int(i),
+            'status': BELT_STATUSES[batch.status[i]],
+            'efficiency_score': float(scores.efficiency_score[i]),
+            'delay_risk_score': float(scores.delay_risk_score[i]),
+            'breakdown_score': int(scores.breakdown_score[i])
+        }
+        for i in order
+    ]
+
+    return {
+        'simulated_belts': total_belts,
+        'status_counts': _distribution(batch.status, BELT_STATUSES),
+        'active_belts_ratio': round(float(active.mean()) * 100, 1) if total_belts else 0.0,
+        'total_bags': int(batch.bag_count.sum()),
+        'stuck_bags': int(batch.bag_stuck.sum()),
+        'avg_bags_per_active_belt': round(float(batch.bag_count[active].mean()), 2) if active.any() else 0.0,
+        'avg_utilization': round(float(batch.utilization[moving].mean()), 1) if moving.any() else 0.0,
+        'system_efficiency': round(float(scores.efficiency_score[active].mean()), 1) if active.any() else 0.0,
+        'health_distribution': _distribution(scores.health_level[active], HEALTH_LEVELS),
+        'delay_risk_distribution': _distribution(scores.risk_level, RISK_LEVELS),
+        'breakdown_distribution': _distribution(scores.breakdown_level, BREAKDOWN_LEVELS),
+        'avg_delay_risk_score': round(float(scores.delay_risk_score.mean()), 1) if total_belts else 0.0,
+        'total_issues_count': int(scores.issue_count.sum()),
+        'critical_issues_count': int(scores.critical_issue_count.sum()),
+        'belts_needing_immediate_maintenance': int((scores.breakdown_score >= 60).sum()),
+        'highest_risk_belts': highest_risk_belts
+    }
+
+
+def simulate_capacity(num_belts: int, sensor_types: Sequence[str], max_speed: float, hour: int,
+                      weather_impact: str = 'Low', seed: Optional[int] = None) -> Dict[str, Any]:
+    """Simulate, score and summarize ``num_belts`` belts; seeded runs are reproducible"""
+    started = time.perf_counter()
+    batch = simulate_belts(num_belts, sensor_types, max_speed, hour, weather_impact,
+                           rng=np.random.default_rng(seed))
+    summary = summarize(batch, score_belts(batch))
+    summary['simulation_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return summary
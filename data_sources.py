@@ -1,16 +1,101 @@
-import random
 import datetime
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from typing import Dict, List, Any, Optional, Set
 import logging
-import requests
 import json
+from caching import TTLCache
+from chart_layouts import (
+    BAGGAGE_UTILIZATION_LAYOUT, BAGGAGE_UTILIZATION_MARKER, FLIGHT_STATUS_LAYOUT, FLIGHT_STATUS_MARKER,
+    PASSENGER_FLOW_LAYOUT, PASSENGER_FLOW_LINE, QUEUE_LENGTH_MARKER, QUEUE_STATUS_LAYOUT,
+    RESOURCE_UTILIZATION_LAYOUT, RESOURCE_UTILIZATION_MARKER, SECURITY_STATUS_LAYOUT, SECURITY_STATUS_MARKER,
+    STAFF_AVAILABILITY_LAYOUT, STAFF_AVAILABILITY_MARKER, WAIT_TIME_MARKER
+)
+from conveyor_state import ConveyorState
+from upstream import CircuitOpenError, Deadline, UpstreamClient, UpstreamStatusError, fan_out
+from metrics import SIMULATION_FALLBACKS, observe_upstream_call
+# Simulated data draws from the seeded per-(airport, tick) generator when a snapshot is being built
+from rng import simulation_datetime, simulation_random as random, simulation_time
+from models import BELT_FIELDS, Bag, Belt, Issue, SensorReading
+from complaints import COMPLAINT_ISSUE_TYPES, ComplaintStore
+from persistence import SQLiteStore
 
 logger = logging.getLogger(__name__)
 
+OPENSKY_URL = "https://opensky-network.org/api/states/all"
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Top-level /live-conveyors keys that ``fields`` can pick; airport_code, state_version and last_update are always sent
+LIVE_CONVEYOR_SUMMARY_FIELDS = ('total_belts', 'active_belts', 'total_bags_active', 'avg_speed',
+                                'system_insights', 'ai_alerts', 'performance_metrics')
+LIVE_CONVEYOR_FIELDS = frozenset(BELT_FIELDS) | {'conveyor_belts'} | frozenset(LIVE_CONVEYOR_SUMMARY_FIELDS)
+
+# Enhanced conveyor belt configurations for each airport
+AIRPORT_CONVEYOR_CONFIGS = {
+    'DEL': {
+        'terminals': ['T1', 'T2', 'T3'],
+        'belts_per_terminal': {'T1': 8, 'T2': 6, 'T3': 10},
+        'max_speed': 5.0,
+        'sensor_types': ['weight', 'motion', 'temperature', 'vibration', 'optical']
+    },
+    'BLR': {
+        'terminals': ['T1', 'T2'],
+        'belts_per_terminal': {'T1': 6, 'T2': 5},
+        'max_speed': 4.5,
+        'sensor_types': ['weight', 'motion', 'temperature', 'vibration']
+    },
+    'GOX': {
+        'terminals': ['T1'],
+        'belts_per_terminal': {'T1': 4},
+        'max_speed': 4.0,
+        'sensor_types': ['weight', 'motion', 'temperature']
+    },
+    'PNY': {
+        'terminals': ['T1'],
+        'belts_per_terminal': {'T1': 3},
+        'max_speed': 3.5,
+        'sensor_types': ['weight', 'motion']
+    },
+    'IXJ': {
+        'terminals': ['T1'],
+        'belts_per_terminal': {'T1': 3},
+        'max_speed': 3.5,
+        'sensor_types': ['weight', 'motion']
+    },
+    'SXR': {
+        'terminals': ['T1'],
+        'belts_per_terminal': {'T1': 3},
+        'max_speed': 3.5,
+        'sensor_types': ['weight', 'motion']
+    }
+}
+
+
+def belt_status_weights(hour: int, weather_impact: str = 'Low') -> Dict[str, float]:
+    """Relative likelihood of each belt status for the hour of day and weather impact"""
+    if 6 <= hour <= 9 or 18 <= hour <= 21:  # Peak hours
+        status_weights = {'Active': 0.7, 'Overloaded': 0.2, 'Slow': 0.1}
+    elif 22 <= hour or hour <= 5:  # Off-peak
+        status_weights = {'Idle': 0.6, 'Active': 0.3, 'Maintenance': 0.1}
+    else:  # Regular hours
+        status_weights = {'Active': 0.8, 'Idle': 0.15, 'Slow': 0.05}
+    
+    # Weather impact adjustment
+    if weather_impact == 'High':
+        status_weights['Slow'] = status_weights.get('Slow', 0) + 0.2
+        status_weights['Maintenance'] = status_weights.get('Maintenance', 0) + 0.1
+    return status_weights
+
+
 class DataSourceManager:
     """Manages data sources for airport operations"""
     
-    def __init__(self):
+    def __init__(self, weather_ttl: float = 300.0, weather_stale_ttl: float = 600.0,
+                 opensky_url: str = OPENSKY_URL, weather_url: str = OPEN_METEO_URL,
+                 upstream_budget: float = 6.0, belt_length_m: float = 100.0,
+                 bag_arrival_rate: float = 6.0, belt_status_interval: float = 60.0,
+                 db_path: Optional[str] = None, tracked_bag_capacity: int = 10000,
+                 tracked_bag_ttl: float = 3600.0):
         self.flight_statuses = ['On Time', 'Delayed', 'Boarding', 'Departed', 'Cancelled', 'Arrived']
         self.airlines = ['Air India', 'IndiGo', 'SpiceJet', 'Vistara', 'GoAir', 'Emirates', 'Singapore Airlines']
         self.destinations = {
@@ -177,9 +262,40 @@ class DataSourceManager:
             }
         }
         
-        # Sample individual baggage for tracking
-        self.sample_baggage = {}
-        self.complaints = []
+        # Upstream endpoints and the shared deadline budget for fetching them concurrently
+        self.opensky_url = opensky_url
+        self.weather_url = weather_url
+        self.upstream_budget = upstream_budget
+        self.upstreams = {
+            'opensky': UpstreamClient('opensky'),
+            'open_meteo': UpstreamClient('open_meteo')
+        }
+        
+        # Shared per-airport weather cache so every belt and flight view reuses one upstream call
+        self.weather_cache = TTLCache(ttl=weather_ttl, stale_ttl=weather_stale_ttl, name='weather')
+        
+        # Persistent per-airport conveyor simulation, advanced a little on every refresh
+        self.belt_length_m = belt_length_m
+        self.bag_arrival_rate = bag_arrival_rate
+        self.belt_status_interval = belt_status_interval
+        self.conveyor_states: Dict[str, ConveyorState] = {}
+        self._conveyor_states_lock = threading.Lock()
+        
+        # Sample individual baggage for tracking, bounded so unseen bag IDs cannot grow memory without limit
+        self.sample_baggage = TTLCache(ttl=tracked_bag_ttl, max_entries=tracked_bag_capacity, name='tracked_bags',
+                                       on_evict=self._unindex_tracked_bag)
+        # flight number -> IDs of cached tracked bags, kept in step with the cache
+        self._tracked_bags_by_flight: Dict[str, Set[str]] = {}
+        self._tracked_bags_index_lock = threading.Lock()
+        # Optional SQLite database shared by every worker; without it state lives only in this process
+        self.db = SQLiteStore(db_path) if db_path else None
+        
+        # Complaints indexed by airport, status, priority and issue type, with running counts
+        self.complaints = ComplaintStore(
+            id_allocator=self.db.id_allocator('complaint', 100000) if self.db else None
+        )
+        self._complaint_change_id = 0
+        self._complaint_sync_lock = threading.Lock()
         
         # Initialize OpenAI for AI-powered insights
         self.openai_client = None
@@ -200,7 +316,7 @@ class DataSourceManager:
     def get_passenger_flow_data(self, airport_code: str) -> Dict[str, Any]:
         """Generate realistic passenger flow data for 24-hour period"""
         try:
-            current_time = datetime.datetime.now()
+            current_time = simulation_datetime()
             hours = []
             passengers = []
             
@@ -227,14 +343,9 @@ class DataSourceManager:
                     'type': 'scatter',
                     'mode': 'lines+markers',
                     'name': 'Passenger Flow',
-                    'line': {'color': '#3b82f6', 'width': 3}
-                },
-                'layout': {
-                    'title': '24-Hour Passenger Flow',
-                    'xaxis': {'title': 'Time'},
-                    'yaxis': {'title': 'Number of Passengers'},
-                    'showlegend': False
+                    'line': PASSENGER_FLOW_LINE
                 },
+                'layout': PASSENGER_FLOW_LAYOUT,
                 'current_hour_passengers': passengers[0],
                 'peak_hour': f"{hours[passengers.index(max(passengers))]}",
                 'total_daily': sum(passengers[:current_time.hour + 1])
@@ -265,20 +376,15 @@ class DataSourceManager:
                     'y': queue_lengths,
                     'type': 'bar',
                     'name': 'Queue Length',
-                    'marker': {'color': '#10b981'}
-                },
-                'layout': {
-                    'title': 'Current Queue Status',
-                    'xaxis': {'title': 'Checkpoints'},
-                    'yaxis': {'title': 'Number of People'},
-                    'showlegend': False
+                    'marker': QUEUE_LENGTH_MARKER
                 },
+                'layout': QUEUE_STATUS_LAYOUT,
                 'wait_times_chart': {
                     'x': checkpoint_names,
                     'y': wait_times,
                     'type': 'bar',
                     'name': 'Wait Time',
-                    'marker': {'color': '#f59e0b'}
+                    'marker': WAIT_TIME_MARKER
                 },
                 'checkpoints': checkpoints,
                 'total_in_queues': sum(queue_lengths),
@@ -288,11 +394,12 @@ class DataSourceManager:
             logger.error(f"Error generating queue status data: {e}")
             return {'error': 'Failed to generate queue status data'}
     
-    def get_baggage_tracking_data(self, airport_code: str) -> Dict[str, Any]:
+    def get_baggage_tracking_data(self, airport_code: str, live_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate enhanced baggage tracking data with live conveyor visualization"""
         try:
-            # Get live conveyor data
-            live_data = self.get_live_conveyor_data(airport_code)
+            # Get live conveyor data unless the caller already has a snapshot of it
+            if live_data is None:
+                live_data = self.get_live_conveyor_data(airport_code)
             
             if live_data.get('error'):
                 return live_data
@@ -309,15 +416,12 @@ class DataSourceManager:
                     len([b for b in conveyor_belts if b['utilization'] <= 20])
                 ],
                 'type': 'pie',
-                'marker': {'colors': ['#ef4444', '#f59e0b', '#10b981', '#6b7280']}
+                'marker': BAGGAGE_UTILIZATION_MARKER
             }
             
             return {
                 'chart': utilization_data,
-                'layout': {
-                    'title': 'Conveyor Belt Utilization',
-                    'showlegend': True
-                },
+                'layout': BAGGAGE_UTILIZATION_LAYOUT,
                 'conveyor_belts': conveyor_belts,
                 'total_belts': live_data['total_belts'],
                 'active_belts': live_data['active_belts'],
@@ -330,17 +434,18 @@ class DataSourceManager:
             logger.error(f"Error generating baggage tracking data: {e}")
             return {'error': 'Failed to generate baggage tracking data'}
     
-    def get_flight_status_data(self, airport_code: str) -> Dict[str, Any]:
+    def get_flight_status_data(self, airport_code: str, weather: Optional[Dict[str, Any]] = None,
+                               real_flights: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """Generate real-time flight status data with weather integration"""
         try:
-            # Try to get real flight data using OpenSky API (free)
-            real_flights = self.get_opensky_flights(airport_code)
-            
-            # Get weather data for impact on flights
-            weather = self.get_weather_data(airport_code)
+            # Fetch real flight data (OpenSky, free) and weather concurrently unless already provided
+            if weather is None or real_flights is None:
+                external = self.fetch_external_data(airport_code)
+                weather = external['weather'] if weather is None else weather
+                real_flights = external['opensky_flights'] if real_flights is None else real_flights
             
             flights = []
-            current_time = datetime.datetime.now()
+            current_time = simulation_datetime()
             
             # Use real flight data if available, otherwise generate realistic data
             if real_flights and len(real_flights) > 0:
@@ -404,12 +509,9 @@ class DataSourceManager:
                     'labels': list(status_counts.keys()),
                     'values': list(status_counts.values()),
                     'type': 'pie',
-                    'marker': {'colors': ['#10b981', '#f59e0b', '#3b82f6', '#6b7280', '#ef4444', '#8b5cf6']}
-                },
-                'layout': {
-                    'title': 'Flight Status Distribution',
-                    'showlegend': True
+                    'marker': FLIGHT_STATUS_MARKER
                 },
+                'layout': FLIGHT_STATUS_LAYOUT,
                 'flights': flights,
                 'total_flights': len(flights),
                 'on_time_flights': len([f for f in flights if f['status'] == 'On Time']),
@@ -422,7 +524,19 @@ class DataSourceManager:
             logger.error(f"Error generating flight status data: {e}")
             return {'error': 'Failed to generate flight status data'}
     
-    def get_opensky_flights(self, airport_code: str) -> List[Dict[str, Any]]:
+    def fetch_external_data(self, airport_code: str, budget: Optional[float] = None) -> Dict[str, Any]:
+        """Fetch weather and live flights concurrently within one shared deadline budget"""
+        deadline = Deadline(self.upstream_budget if budget is None else budget)
+        return fan_out(
+            {
+                'weather': lambda: self.get_weather_data(airport_code, timeout=deadline.timeout(5)),
+                'opensky_flights': lambda: self.get_opensky_flights(airport_code, timeout=deadline.timeout(10))
+            },
+            deadline,
+            fallbacks={'weather': self._get_simulated_weather, 'opensky_flights': list}
+        )
+    
+    def get_opensky_flights(self, airport_code: str, timeout: float = 10) -> List[Dict[str, Any]]:
         """Get real flight data from OpenSky Network API"""
         try:
             # Airport bounding boxes (approximate)
@@ -438,7 +552,7 @@ class DataSourceManager:
             bounds = airport_bounds.get(airport_code, airport_bounds['DEL'])
             
             # Free OpenSky API call
-            url = "https://opensky-network.org/api/states/all"
+            url = self.opensky_url
             params = {
                 'lamin': bounds['lamin'],
                 'lomin': bounds['lomin'],
@@ -446,7 +560,7 @@ class DataSourceManager:
                 'lomax': bounds['lomax']
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.upstreams['opensky'].get(url, params=params, timeout=timeout)
             if response.status_code == 200:
                 data = response.json()
                 flights = []
@@ -471,9 +585,14 @@ class DataSourceManager:
                 return flights
             else:
                 logger.warning(f"OpenSky API error: {response.status_code}")
+                SIMULATION_FALLBACKS.inc(source='opensky_flights', reason='http_status')
                 return []
+        except CircuitOpenError:
+            SIMULATION_FALLBACKS.inc(source='opensky_flights', reason='circuit_open')
+            return []
         except Exception as e:
             logger.warning(f"OpenSky API error: {e}")
+            SIMULATION_FALLBACKS.inc(source='opensky_flights', reason='error')
             return []
     
     def _determine_flight_status(self, flight_data: Dict[str, Any], weather: Dict[str, Any]) -> str:
@@ -549,12 +668,9 @@ class DataSourceManager:
                     'labels': list(status_counts.keys()),
                     'values': list(status_counts.values()),
                     'type': 'pie',
-                    'marker': {'colors': ['#10b981', '#f59e0b', '#ef4444']}
-                },
-                'layout': {
-                    'title': 'Security Checkpoint Status',
-                    'showlegend': True
+                    'marker': SECURITY_STATUS_MARKER
                 },
+                'layout': SECURITY_STATUS_LAYOUT,
                 'checkpoints': checkpoints,
                 'total_checkpoints': len(checkpoints),
                 'operational_checkpoints': len([cp for cp in checkpoints if cp['status'] == 'Operational']),
@@ -581,12 +697,9 @@ class DataSourceManager:
                     'labels': list(resources.keys()),
                     'values': list(resources.values()),
                     'type': 'pie',
-                    'marker': {'colors': ['#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']}
-                },
-                'layout': {
-                    'title': 'System Resource Utilization (%)',
-                    'showlegend': True
+                    'marker': RESOURCE_UTILIZATION_MARKER
                 },
+                'layout': RESOURCE_UTILIZATION_LAYOUT,
                 'resources': resources,
                 'overall_health': 'Good' if max(resources.values()) < 85 else 'Warning',
                 'peak_usage': max(resources.values()),
@@ -621,14 +734,9 @@ class DataSourceManager:
                     'y': availability_percentages,
                     'type': 'bar',
                     'name': 'Staff Availability %',
-                    'marker': {'color': '#3b82f6'}
-                },
-                'layout': {
-                    'title': 'Staff Availability by Department',
-                    'xaxis': {'title': 'Department'},
-                    'yaxis': {'title': 'Availability %'},
-                    'showlegend': False
+                    'marker': STAFF_AVAILABILITY_MARKER
                 },
+                'layout': STAFF_AVAILABILITY_LAYOUT,
                 'departments': departments,
                 'total_staff': sum([dept['total'] for dept in departments]),
                 'available_staff': sum([dept['available'] for dept in departments]),
@@ -638,58 +746,82 @@ class DataSourceManager:
             logger.error(f"Error generating staff availability data: {e}")
             return {'error': 'Failed to generate staff availability data'}
     
-    def get_weather_data(self, airport_code: str) -> Dict[str, Any]:
-        """Get real weather data for airport using free API"""
+    def get_weather_data(self, airport_code: str, timeout: float = 5) -> Dict[str, Any]:
+        """Get weather data for airport, served from the shared TTL cache, or simulated if the API is down"""
+        # Failed loads raise, so the cache keeps serving the last good value and never stores simulated weather
         try:
-            # Airport coordinates (approximate)
-            coordinates = {
-                'DEL': {'lat': 28.5562, 'lon': 77.1000},
-                'BLR': {'lat': 13.1986, 'lon': 77.7066}, 
-                'GOX': {'lat': 15.3808, 'lon': 73.8389},
-                'PNY': {'lat': 11.9696, 'lon': 79.8125},
-                'IXJ': {'lat': 32.6890, 'lon': 74.8378},
-                'SXR': {'lat': 33.9871, 'lon': 74.7747}
+            weather = self.weather_cache.get(airport_code, lambda: self._fetch_weather_data(airport_code, timeout))
+        except CircuitOpenError:
+            SIMULATION_FALLBACKS.inc(source='weather', reason='circuit_open')
+            return self._get_simulated_weather()
+        except UpstreamStatusError:
+            SIMULATION_FALLBACKS.inc(source='weather', reason='http_status')
+            return self._get_simulated_weather()
+        except Exception as e:
+            logger.warning(f"Weather API error: {e}, using simulated data")
+            SIMULATION_FALLBACKS.inc(source='weather', reason='error')
+            return self._get_simulated_weather()
+        return dict(weather)
+    
+    def get_weather_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and entry ages for the weather cache"""
+        return self.weather_cache.stats()
+    
+    def get_tracked_bag_cache_stats(self) -> Dict[str, Any]:
+        """Get size, hit/miss and eviction counters for the tracked-bag cache"""
+        return self.sample_baggage.stats(include_entries=False)
+    
+    def get_upstream_stats(self) -> Dict[str, Any]:
+        """Get call counts and circuit breaker state for each upstream API"""
+        return {name: client.stats() for name, client in self.upstreams.items()}
+    
+    def _fetch_weather_data(self, airport_code: str, timeout: float = 5) -> Dict[str, Any]:
+        """Get real weather data for airport using free API; raises if it is unavailable"""
+        # Airport coordinates (approximate)
+        coordinates = {
+            'DEL': {'lat': 28.5562, 'lon': 77.1000},
+            'BLR': {'lat': 13.1986, 'lon': 77.7066}, 
+            'GOX': {'lat': 15.3808, 'lon': 73.8389},
+            'PNY': {'lat': 11.9696, 'lon': 79.8125},
+            'IXJ': {'lat': 32.6890, 'lon': 74.8378},
+            'SXR': {'lat': 33.9871, 'lon': 74.7747}
+        }
+        
+        coord = coordinates.get(airport_code, coordinates['DEL'])
+        
+        # Free weather API call
+        url = self.weather_url
+        params = {
+            'latitude': coord['lat'],
+            'longitude': coord['lon'],
+            'current_weather': 'true',
+            'hourly': 'temperature_2m,weathercode,windspeed_10m,visibility'
+        }
+        
+        response = self.upstreams['open_meteo'].get(url, params=params, timeout=timeout)
+        if response.status_code == 200:
+            data = response.json()
+            current = data.get('current_weather', {})
+            
+            # Weather code to condition mapping
+            weather_codes = {
+                0: 'Clear', 1: 'Mainly Clear', 2: 'Partly Cloudy', 3: 'Overcast',
+                45: 'Fog', 48: 'Depositing Rime Fog', 51: 'Light Drizzle',
+                61: 'Rain', 63: 'Moderate Rain', 65: 'Heavy Rain',
+                71: 'Light Snow', 95: 'Thunderstorm'
             }
             
-            coord = coordinates.get(airport_code, coordinates['DEL'])
+            condition = weather_codes.get(current.get('weathercode', 0), 'Unknown')
             
-            # Free weather API call
-            url = "https://api.open-meteo.com/v1/forecast"
-            params = {
-                'latitude': coord['lat'],
-                'longitude': coord['lon'],
-                'current_weather': 'true',
-                'hourly': 'temperature_2m,weathercode,windspeed_10m,visibility'
+            return {
+                'temperature': current.get('temperature', 25),
+                'condition': condition,
+                'wind_speed': current.get('windspeed', 10),
+                'visibility': 'Good' if condition in ['Clear', 'Mainly Clear'] else 'Limited',
+                'impact': 'Low' if condition in ['Clear', 'Mainly Clear', 'Partly Cloudy'] else 'High'
             }
-            
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                current = data.get('current_weather', {})
-                
-                # Weather code to condition mapping
-                weather_codes = {
-                    0: 'Clear', 1: 'Mainly Clear', 2: 'Partly Cloudy', 3: 'Overcast',
-                    45: 'Fog', 48: 'Depositing Rime Fog', 51: 'Light Drizzle',
-                    61: 'Rain', 63: 'Moderate Rain', 65: 'Heavy Rain',
-                    71: 'Light Snow', 95: 'Thunderstorm'
-                }
-                
-                condition = weather_codes.get(current.get('weathercode', 0), 'Unknown')
-                
-                return {
-                    'temperature': current.get('temperature', 25),
-                    'condition': condition,
-                    'wind_speed': current.get('windspeed', 10),
-                    'visibility': 'Good' if condition in ['Clear', 'Mainly Clear'] else 'Limited',
-                    'impact': 'Low' if condition in ['Clear', 'Mainly Clear', 'Partly Cloudy'] else 'High'
-                }
-            else:
-                # Fallback to simulated data
-                return self._get_simulated_weather()
-        except Exception as e:
-            logger.warning(f"Weather API error: {e}, using simulated data")
-            return self._get_simulated_weather()
+        else:
+            raise UpstreamStatusError(f"Weather API returned HTTP {response.status_code}")
     
     def _get_simulated_weather(self) -> Dict[str, Any]:
         """Generate simulated weather data as fallback"""
@@ -704,140 +836,192 @@ class DataSourceManager:
             'impact': 'Low' if condition in ['Clear', 'Partly Cloudy'] else 'High'
         }
     
-    def get_live_conveyor_data(self, airport_code: str) -> Dict[str, Any]:
-        """Generate enhanced live conveyor belt data with AI monitoring and sensor data"""
+    def get_live_conveyor_data(self, airport_code: str, weather: Optional[Dict[str, Any]] = None,
+                               fields: Optional[Set[str]] = None, terminal: Optional[str] = None,
+                               status: Optional[str] = None, cursor: Optional[int] = None,
+                               limit: Optional[int] = None) -> Dict[str, Any]:
+        """Generate enhanced live conveyor belt data with AI monitoring and sensor data.
+        
+        ``fields`` picks belt fields and top-level keys (see LIVE_CONVEYOR_FIELDS); anything
+        not picked is never computed. ``terminal`` and ``status`` filter belts, and the
+        summary covers the filtered belts. ``limit`` pages through them, continuing after
+        the ``belt_counter`` given as ``cursor``.
+        """
         try:
-            conveyor_belts = []
-            current_time = datetime.datetime.now()
-            
-            # Enhanced conveyor belt configurations for each airport
-            airport_conveyor_configs = {
-                'DEL': {
-                    'terminals': ['T1', 'T2', 'T3'],
-                    'belts_per_terminal': {'T1': 8, 'T2': 6, 'T3': 10},
-                    'max_speed': 5.0,
-                    'sensor_types': ['weight', 'motion', 'temperature', 'vibration', 'optical']
-                },
-                'BLR': {
-                    'terminals': ['T1', 'T2'],
-                    'belts_per_terminal': {'T1': 6, 'T2': 5},
-                    'max_speed': 4.5,
-                    'sensor_types': ['weight', 'motion', 'temperature', 'vibration']
-                },
-                'GOX': {
-                    'terminals': ['T1'],
-                    'belts_per_terminal': {'T1': 4},
-                    'max_speed': 4.0,
-                    'sensor_types': ['weight', 'motion', 'temperature']
-                },
-                'PNY': {
-                    'terminals': ['T1'],
-                    'belts_per_terminal': {'T1': 3},
-                    'max_speed': 3.5,
-                    'sensor_types': ['weight', 'motion']
-                },
-                'IXJ': {
-                    'terminals': ['T1'],
-                    'belts_per_terminal': {'T1': 3},
-                    'max_speed': 3.5,
-                    'sensor_types': ['weight', 'motion']
-                },
-                'SXR': {
-                    'terminals': ['T1'],
-                    'belts_per_terminal': {'T1': 3},
-                    'max_speed': 3.5,
-                    'sensor_types': ['weight', 'motion']
+            current_time = simulation_datetime()
+            if weather is None:
+                weather = self.get_weather_data(airport_code)
+            
+            # Move the airport's persistent belts forward to now instead of regenerating them
+            state = self.get_conveyor_state(airport_code)
+            with state.lock:
+                state.advance_to(simulation_time(), weather.get('impact', 'Low'))
+                conveyor_belts = list(state.belts.values())
+                if terminal is not None or status is not None:
+                    conveyor_belts = [b for b in conveyor_belts
+                                      if terminal in (None, b.terminal) and status in (None, b.status)]
+                
+                page = conveyor_belts
+                if cursor is not None:
+                    page = [b for b in page if b.belt_counter > cursor]
+                next_cursor = None
+                if limit is not None:
+                    if len(page) > limit:
+                        next_cursor = page[limit - 1].belt_counter
+                    page = page[:limit]
+                
+                def wanted(name):
+                    return fields is None or name in fields
+                
+                result = {}
+                belt_fields = None if fields is None else self._selected_belt_fields(fields)
+                if belt_fields is None:
+                    # Records are only converted to the JSON shape here, at the edge
+                    serialized = state.serialized_belts()
+                    if len(page) != len(serialized):
+                        by_id = dict(zip(state.belts, serialized))
+                        serialized = [by_id[belt.belt_id] for belt in page]
+                    result['conveyor_belts'] = serialized
+                elif belt_fields:
+                    result['conveyor_belts'] = [belt.to_dict(belt_fields) for belt in page]
+                
+                summary = {
+                    'total_belts': lambda: len(conveyor_belts),
+                    'active_belts': lambda: len([b for b in conveyor_belts if b.status == 'Active']),
+                    'total_bags_active': lambda: sum(len(b.bags) for b in conveyor_belts),
+                    'avg_speed': lambda: (sum(b.speed for b in conveyor_belts) / len(conveyor_belts)
+                                          if conveyor_belts else 0),
+                    # AI-powered system insights
+                    'system_insights': lambda: self._generate_system_insights(conveyor_belts, airport_code),
+                    'ai_alerts': lambda: self._generate_ai_alerts(conveyor_belts),
+                    'performance_metrics': lambda: self._calculate_performance_metrics(conveyor_belts)
                 }
-            }
-            
-            config = airport_conveyor_configs.get(airport_code, airport_conveyor_configs['DEL'])
-            belt_counter = 1
-            
-            for terminal in config['terminals']:
-                for belt_num in range(1, config['belts_per_terminal'][terminal] + 1):
-                    belt_id = f'{terminal}-Belt-{belt_num:02d}'
-                    
-                    # AI-powered status determination
-                    status, ai_insights = self._get_ai_belt_status(belt_id, airport_code)
-                    
-                    # Generate sensor data
-                    sensor_data = self._generate_sensor_data(config['sensor_types'], status)
-                    
-                    # Generate bags with realistic positioning and tracking
-                    bags_on_belt = self._generate_live_bags(belt_id, status, config['max_speed'])
-                    
-                    # Calculate AI-powered metrics
-                    efficiency_score = self._calculate_belt_efficiency(bags_on_belt, sensor_data, status)
-                    predicted_issues = self._predict_belt_issues(sensor_data, bags_on_belt)
-                    
-                    belt_data = {
-                        'belt_id': belt_id,
-                        'terminal': terminal,
-                        'status': status,
-                        'speed': sensor_data.get('current_speed', 0),
-                        'max_speed': config['max_speed'],
-                        'bags_on_belt': bags_on_belt,
-                        'total_processed_today': random.randint(200, 800),
-                        'last_maintenance': f'{random.randint(1, 30)} days ago',
-                        'utilization': self._calculate_utilization(bags_on_belt, status),
-                        'sensor_data': sensor_data,
-                        'ai_insights': ai_insights,
-                        'efficiency_score': efficiency_score,
-                        'predicted_issues': predicted_issues,
-                        'health_status': self._get_belt_health_status(sensor_data, efficiency_score),
-                        'delay_risk': self._calculate_delay_risk(bags_on_belt, sensor_data),
-                        'breakdown_probability': self._calculate_breakdown_probability(sensor_data),
-                        'last_updated': current_time.strftime('%H:%M:%S'),
-                        'belt_counter': belt_counter
-                    }
-                    
-                    conveyor_belts.append(belt_data)
-                    belt_counter += 1
-            
-            # AI-powered system insights
-            system_insights = self._generate_system_insights(conveyor_belts, airport_code)
-            
-            return {
-                'conveyor_belts': conveyor_belts,
-                'total_belts': len(conveyor_belts),
-                'active_belts': len([b for b in conveyor_belts if b['status'] == 'Active']),
-                'total_bags_active': sum(len(b['bags_on_belt']) for b in conveyor_belts),
-                'avg_speed': sum(b['speed'] for b in conveyor_belts) / len(conveyor_belts),
-                'system_insights': system_insights,
-                'ai_alerts': self._generate_ai_alerts(conveyor_belts),
-                'performance_metrics': self._calculate_performance_metrics(conveyor_belts),
-                'airport_code': airport_code,
-                'last_update': current_time.strftime('%Y-%m-%d %H:%M:%S')
-            }
+                for name, compute in summary.items():
+                    if wanted(name):
+                        result[name] = compute()
+                
+                result.update({
+                    'airport_code': airport_code,
+                    'state_version': state.version,
+                    'last_update': current_time.strftime('%Y-%m-%d %H:%M:%S')
+                })
+                if limit is not None:
+                    result['next_cursor'] = next_cursor
+                return result
         except Exception as e:
             logger.error(f"Error generating live conveyor data: {e}")
             return {'error': 'Failed to generate live conveyor data'}
     
-    def _get_ai_belt_status(self, belt_id: str, airport_code: str) -> tuple:
+    def _selected_belt_fields(self, fields: Set[str]) -> List[str]:
+        """Belt fields picked by ``fields``, in output order; belt_id is always kept"""
+        if 'conveyor_belts' in fields:
+            return list(BELT_FIELDS)
+        selected = [name for name in BELT_FIELDS if name in fields]
+        if selected and 'belt_id' not in fields:
+            selected.insert(0, 'belt_id')
+        return selected
+    
+    def get_conveyor_state(self, airport_code: str) -> ConveyorState:
+        """Get the airport's persistent conveyor state, creating it on first use"""
+        config = AIRPORT_CONVEYOR_CONFIGS.get(airport_code)
+        if config is None:
+            # Unknown codes get a throwaway state so arbitrary codes cannot grow memory
+            return self._new_conveyor_state(airport_code, AIRPORT_CONVEYOR_CONFIGS['DEL'])
+        
+        state = self.conveyor_states.get(airport_code)
+        if state is None:
+            with self._conveyor_states_lock:
+                state = self.conveyor_states.get(airport_code)
+                if state is None:
+                    state = self.conveyor_states[airport_code] = self._new_conveyor_state(airport_code, config)
+        return state
+    
+    def _new_conveyor_state(self, airport_code: str, config: Dict[str, Any]) -> ConveyorState:
+        return ConveyorState(self, airport_code, config,
+                             belt_length_m=self.belt_length_m,
+                             bag_arrival_rate=self.bag_arrival_rate,
+                             status_interval=self.belt_status_interval)
+    
+    def _build_belt(self, airport_code: str, belt_id: str, terminal: str, config: Dict[str, Any],
+                    weather_impact: str, belt_counter: int, last_updated: str) -> Belt:
+        """Build and score one belt from scratch"""
+        # AI-powered status determination
+        status, ai_insights = self._get_ai_belt_status(belt_id, airport_code, weather_impact)
+        
+        # Generate sensor data
+        sensors = self._generate_sensor_data(config['sensor_types'], status)
+        
+        # Generate bags with realistic positioning and tracking
+        bags_on_belt = self._generate_live_bags(belt_id, status, config['max_speed'])
+        
+        belt = Belt(
+            belt_id=belt_id,
+            terminal=terminal,
+            status=status,
+            max_speed=config['max_speed'],
+            sensors=sensors,
+            bags=bags_on_belt,
+            ai_insights=ai_insights,
+            total_processed_today=random.randint(200, 800),
+            last_maintenance_days=random.randint(1, 30),
+            utilization=self._calculate_utilization(bags_on_belt, status),
+            last_updated=last_updated,
+            belt_counter=belt_counter
+        )
+        self._score_belt(belt)
+        return belt
+    
+    def _score_belt(self, belt: Belt) -> None:
+        """Calculate AI-powered metrics for a belt from its current sensors and bags"""
+        belt.efficiency_score = self._calculate_belt_efficiency(belt.bags, belt.sensors, belt.status)
+        belt.predicted_issues = self._predict_belt_issues(belt.sensors, belt.bags)
+        belt.health_status = self._get_belt_health_status(belt.sensors, belt.efficiency_score)
+        belt.delay_risk = self._calculate_delay_risk(belt.bags, belt.sensors)
+        belt.breakdown_probability = self._calculate_breakdown_probability(belt.sensors)
+    
+    def simulate_conveyor_capacity(self, airport_code: str, num_belts: int, hour: Optional[int] = None,
+                                   seed: Optional[int] = None) -> Dict[str, Any]:
+        """Simulate and score many belts at once with the airport's belt configuration, for capacity planning"""
+        try:
+            from conveyor_vectorized import simulate_capacity
+        except ImportError:
+            logger.info("NumPy not installed. Capacity simulation will be unavailable.")
+            return {'error': 'Capacity simulation requires NumPy'}
+        
+        try:
+            config = AIRPORT_CONVEYOR_CONFIGS.get(airport_code, AIRPORT_CONVEYOR_CONFIGS['DEL'])
+            if hour is None:
+                hour = simulation_datetime().hour
+            weather_impact = self.get_weather_data(airport_code).get('impact', 'Low')
+            
+            result = simulate_capacity(num_belts, config['sensor_types'], config['max_speed'], hour,
+                                       weather_impact=weather_impact, seed=seed)
+            result.update({
+                'airport_code': airport_code,
+                'configured_belts': sum(config['belts_per_terminal'].values()),
+                'hour': hour,
+                'weather_impact': weather_impact
+            })
+            return result
+        except Exception as e:
+            logger.error(f"Error simulating conveyor capacity: {e}")
+            return {'error': 'Failed to simulate conveyor capacity'}
+    
+    def _get_ai_belt_status(self, belt_id: str, airport_code: str, weather_impact: Optional[str] = None) -> tuple:
         """AI-powered belt status determination with predictive analysis"""
         try:
             # Simulate AI analysis based on historical patterns and current conditions
             base_statuses = ['Active', 'Idle', 'Maintenance', 'Slow', 'Overloaded']
             
             # AI factors that influence status
-            time_factor = datetime.datetime.now().hour
-            weather_impact = self.get_weather_data(airport_code).get('impact', 'Low')
+            time_factor = simulation_datetime().hour
+            if weather_impact is None:
+                weather_impact = self.get_weather_data(airport_code).get('impact', 'Low')
             
             # AI probability calculation
-            if 6 <= time_factor <= 9 or 18 <= time_factor <= 21:  # Peak hours
-                status_weights = {'Active': 0.7, 'Overloaded': 0.2, 'Slow': 0.1}
-            elif 22 <= time_factor or time_factor <= 5:  # Off-peak
-                status_weights = {'Idle': 0.6, 'Active': 0.3, 'Maintenance': 0.1}
-            else:  # Regular hours
-                status_weights = {'Active': 0.8, 'Idle': 0.15, 'Slow': 0.05}
-            
-            # Weather impact adjustment
-            if weather_impact == 'High':
-                status_weights['Slow'] = status_weights.get('Slow', 0) + 0.2
-                status_weights['Maintenance'] = status_weights.get('Maintenance', 0) + 0.1
+            status_weights = belt_status_weights(time_factor, weather_impact)
             
             # AI decision
-            import random
             status = random.choices(list(status_weights.keys()), weights=list(status_weights.values()))[0]
             
             # AI insights
@@ -854,64 +1038,43 @@ class DataSourceManager:
             logger.error(f"Error in AI belt status: {e}")
             return 'Active', {'status_reason': 'AI analysis failed', 'recommendation': 'Manual check required'}
     
-    def _generate_sensor_data(self, sensor_types: List[str], status: str) -> Dict[str, Any]:
+    def _generate_sensor_data(self, sensor_types: List[str], status: str) -> SensorReading:
         """Generate realistic sensor data for conveyor belt monitoring"""
         try:
-            sensor_data = {}
+            reading = SensorReading(sensor_types=tuple(sensor_types), current_speed=0)
             
             if 'weight' in sensor_types:
-                sensor_data['weight_sensor'] = {
-                    'current_load': random.randint(20, 95) if status == 'Active' else 0,
-                    'max_capacity': 100,
-                    'overload_warning': False,
-                    'last_calibration': f'{random.randint(1, 90)} days ago'
-                }
+                reading.current_load = random.randint(20, 95) if status == 'Active' else 0
+                reading.last_calibration_days = random.randint(1, 90)
             
             if 'motion' in sensor_types:
-                sensor_data['motion_sensor'] = {
-                    'current_speed': random.uniform(1.0, 5.0) if status == 'Active' else 0,
-                    'speed_variation': random.uniform(0.1, 0.5),
-                    'direction': 'forward',
-                    'stuck_detection': random.choice([True, False, False, False])  # 25% chance of stuck
-                }
+                reading.current_speed = random.uniform(1.0, 5.0) if status == 'Active' else 0
+                reading.speed_variation = random.uniform(0.1, 0.5)
+                reading.stuck_detection = random.choice([True, False, False, False])  # 25% chance of stuck
             
             if 'temperature' in sensor_types:
-                sensor_data['temperature_sensor'] = {
-                    'current_temp': random.uniform(18.0, 35.0),
-                    'max_safe_temp': 40.0,
-                    'overheating_warning': False,
-                    'cooling_system_status': 'Normal'
-                }
+                reading.current_temp = random.uniform(18.0, 35.0)
             
             if 'vibration' in sensor_types:
-                sensor_data['vibration_sensor'] = {
-                    'vibration_level': random.uniform(0.1, 2.0),
-                    'max_safe_vibration': 3.0,
-                    'abnormal_vibration': False,
-                    'bearing_health': random.choice(['Good', 'Good', 'Good', 'Fair', 'Poor'])
-                }
+                reading.vibration_level = random.uniform(0.1, 2.0)
+                reading.bearing_health = random.choice(['Good', 'Good', 'Good', 'Fair', 'Poor'])
             
             if 'optical' in sensor_types:
-                sensor_data['optical_sensor'] = {
-                    'bag_detection': random.randint(85, 99),
-                    'jam_detection': random.choice([True, False, False, False, False]),
-                    'foreign_object_detection': random.choice([True, False, False, False, False, False]),
-                    'camera_status': 'Operational'
-                }
+                reading.bag_detection = random.randint(85, 99)
+                reading.jam_detection = random.choice([True, False, False, False, False])
+                reading.foreign_object_detection = random.choice([True, False, False, False, False, False])
             
-            # Calculate current speed based on motion sensor
-            if 'motion_sensor' in sensor_data:
-                sensor_data['current_speed'] = sensor_data['motion_sensor']['current_speed']
-            else:
-                sensor_data['current_speed'] = random.uniform(1.0, 5.0) if status == 'Active' else 0
+            # Without a motion sensor the belt speed comes from the drive instead
+            if 'motion' not in sensor_types:
+                reading.current_speed = random.uniform(1.0, 5.0) if status == 'Active' else 0
             
-            return sensor_data
+            return reading
             
         except Exception as e:
             logger.error(f"Error generating sensor data: {e}")
-            return {'current_speed': 0, 'error': 'Sensor data generation failed'}
+            return SensorReading(sensor_types=(), current_speed=0)
     
-    def _generate_live_bags(self, belt_id: str, status: str, max_speed: float) -> List[Dict[str, Any]]:
+    def _generate_live_bags(self, belt_id: str, status: str, max_speed: float) -> List[Bag]:
         """Generate realistic live baggage with positioning and tracking"""
         try:
             if status not in ['Active', 'Slow', 'Overloaded']:
@@ -919,39 +1082,11 @@ class DataSourceManager:
             
             bags = []
             num_bags = random.randint(3, 15) if status == 'Active' else random.randint(1, 8)
+            last_movement = simulation_datetime().strftime('%H:%M:%S')
             
             for i in range(num_bags):
                 # Realistic bag positioning (0-100% of belt length)
-                position = random.uniform(0, 100)
-                
-                # Bag properties
-                bag_id = f'BAG{random.randint(10000, 99999)}'
-                priority = random.choice(['Normal', 'Priority', 'Transfer', 'Fragile'])
-                
-                # Calculate estimated arrival time based on position and speed
-                speed = max_speed * random.uniform(0.8, 1.2)  # Speed variation
-                remaining_distance = 100 - position
-                eta_seconds = remaining_distance / speed if speed > 0 else 0
-                
-                bag_data = {
-                    'bag_id': bag_id,
-                    'position': round(position, 1),
-                    'flight': f'{random.choice(["AI", "6E", "SG", "UK", "G8"])}{random.randint(100, 999)}',
-                    'destination': random.choice(['Mumbai', 'Delhi', 'Chennai', 'Bangalore', 'Hyderabad']),
-                    'status': 'In Transit',
-                    'priority': priority,
-                    'weight': f'{random.randint(15, 30)} kg',
-                    'eta_seconds': round(eta_seconds, 1),
-                    'stuck_status': random.choice([False, False, False, True]) if position > 80 else False,
-                    'last_movement': datetime.datetime.now().strftime('%H:%M:%S'),
-                    'tracking_history': [
-                        {'time': '14:30', 'status': 'Checked In', 'location': 'Check-in Counter'},
-                        {'time': '14:45', 'status': 'In Sorting', 'location': 'Baggage Sorting Area'},
-                        {'time': '15:00', 'status': 'On Conveyor', 'location': belt_id}
-                    ]
-                }
-                
-                bags.append(bag_data)
+                bags.append(self._new_bag(belt_id, random.uniform(0, 100), max_speed, last_movement))
             
             return bags
             
@@ -959,7 +1094,31 @@ class DataSourceManager:
             logger.error(f"Error generating live bags: {e}")
             return []
     
-    def _calculate_belt_efficiency(self, bags: List[Dict], sensor_data: Dict, status: str) -> float:
+    def _new_bag(self, belt_id: str, position: float, max_speed: float, last_movement: str) -> Bag:
+        """Create one bag at a position (0-100% of belt length)"""
+        # Bag properties
+        bag_id = f'BAG{random.randint(10000, 99999)}'
+        priority = random.choice(['Normal', 'Priority', 'Transfer', 'Fragile'])
+        
+        # Calculate estimated arrival time based on position and speed
+        speed = max_speed * random.uniform(0.8, 1.2)  # Speed variation
+        remaining_distance = 100 - position
+        eta_seconds = remaining_distance / speed if speed > 0 else 0
+        
+        return Bag(
+            bag_id=bag_id,
+            belt_id=belt_id,
+            position=round(position, 1),
+            flight=f'{random.choice(["AI", "6E", "SG", "UK", "G8"])}{random.randint(100, 999)}',
+            destination=random.choice(['Mumbai', 'Delhi', 'Chennai', 'Bangalore', 'Hyderabad']),
+            priority=priority,
+            weight_kg=random.randint(15, 30),
+            eta_seconds=round(eta_seconds, 1),
+            stuck=random.choice([False, False, False, True]) if position > 80 else False,
+            last_movement=last_movement
+        )
+    
+    def _calculate_belt_efficiency(self, bags: List[Bag], sensors: SensorReading, status: str) -> float:
         """Calculate AI-powered belt efficiency score"""
         try:
             if status not in ['Active', 'Slow', 'Overloaded']:
@@ -969,24 +1128,20 @@ class DataSourceManager:
             
             # Bag flow efficiency
             if bags:
-                avg_position = sum(bag['position'] for bag in bags) / len(bags)
+                avg_position = sum(bag.position for bag in bags) / len(bags)
                 flow_efficiency = max(0, 100 - avg_position) / 100
                 efficiency_factors.append(flow_efficiency * 0.4)
             
-            # Speed efficiency
-            current_speed = sensor_data.get('current_speed', 0)
-            max_speed = sensor_data.get('max_speed', 5.0)
+            # Speed efficiency (rated against the 5 m/s reference drive)
+            current_speed = sensors.current_speed
+            max_speed = 5.0
             speed_efficiency = min(1.0, current_speed / max_speed) if max_speed > 0 else 0
             efficiency_factors.append(speed_efficiency * 0.3)
             
             # Sensor health efficiency
             sensor_health = 1.0
-            for sensor_type, sensor_info in sensor_data.items():
-                if isinstance(sensor_info, dict):
-                    if sensor_info.get('warning', False):
-                        sensor_health -= 0.2
-                    if sensor_info.get('abnormal', False):
-                        sensor_health -= 0.3
+            for sensor_key, level in sensors.alerts():
+                sensor_health -= 0.2 if level == 'warning' else 0.3
             sensor_health = max(0, sensor_health)
             efficiency_factors.append(sensor_health * 0.3)
             
@@ -997,57 +1152,51 @@ class DataSourceManager:
             logger.error(f"Error calculating belt efficiency: {e}")
             return 75.0
     
-    def _predict_belt_issues(self, sensor_data: Dict, bags: List[Dict]) -> List[Dict[str, Any]]:
+    def _predict_belt_issues(self, sensors: SensorReading, bags: List[Bag]) -> List[Issue]:
         """AI-powered prediction of potential belt issues"""
         try:
             issues = []
             
             # Overload prediction
-            if 'weight_sensor' in sensor_data:
-                weight_data = sensor_data['weight_sensor']
-                if weight_data['current_load'] > 80:
-                    issues.append({
-                        'type': 'Overload Warning',
-                        'severity': 'Medium',
-                        'description': f"Belt load at {weight_data['current_load']}% capacity",
-                        'probability': min(95, weight_data['current_load'] + 10),
-                        'recommended_action': 'Monitor load and consider redistribution'
-                    })
+            if sensors.has('weight') and sensors.current_load > 80:
+                issues.append(Issue(
+                    issue_type='Overload Warning',
+                    severity='Medium',
+                    description=f"Belt load at {sensors.current_load}% capacity",
+                    probability=min(95, sensors.current_load + 10),
+                    recommended_action='Monitor load and consider redistribution'
+                ))
             
             # Stuck bag detection
-            stuck_bags = [bag for bag in bags if bag.get('stuck_status', False)]
+            stuck_bags = sum(1 for bag in bags if bag.stuck)
             if stuck_bags:
-                issues.append({
-                    'type': 'Stuck Baggage',
-                    'severity': 'High',
-                    'description': f"{len(stuck_bags)} bags detected as stuck",
-                    'probability': 90,
-                    'recommended_action': 'Immediate intervention required'
-                })
+                issues.append(Issue(
+                    issue_type='Stuck Baggage',
+                    severity='High',
+                    description=f"{stuck_bags} bags detected as stuck",
+                    probability=90,
+                    recommended_action='Immediate intervention required'
+                ))
             
             # Temperature warning
-            if 'temperature_sensor' in sensor_data:
-                temp_data = sensor_data['temperature_sensor']
-                if temp_data['current_temp'] > 30:
-                    issues.append({
-                        'type': 'Temperature Warning',
-                        'severity': 'Medium',
-                        'description': f"Belt temperature at {temp_data['current_temp']:.1f}°C",
-                        'probability': 75,
-                        'recommended_action': 'Check cooling system and reduce load'
-                    })
+            if sensors.has('temperature') and sensors.current_temp > 30:
+                issues.append(Issue(
+                    issue_type='Temperature Warning',
+                    severity='Medium',
+                    description=f"Belt temperature at {sensors.current_temp:.1f}°C",
+                    probability=75,
+                    recommended_action='Check cooling system and reduce load'
+                ))
             
             # Vibration warning
-            if 'vibration_sensor' in sensor_data:
-                vib_data = sensor_data['vibration_sensor']
-                if vib_data['vibration_level'] > 1.5:
-                    issues.append({
-                        'type': 'Vibration Warning',
-                        'severity': 'Medium',
-                        'description': f"High vibration level: {vib_data['vibration_level']:.1f}",
-                        'probability': 75,
-                        'recommended_action': 'Schedule maintenance check'
-                    })
+            if sensors.has('vibration') and sensors.vibration_level > 1.5:
+                issues.append(Issue(
+                    issue_type='Vibration Warning',
+                    severity='Medium',
+                    description=f"High vibration level: {sensors.vibration_level:.1f}",
+                    probability=75,
+                    recommended_action='Schedule maintenance check'
+                ))
             
             return issues
             
@@ -1055,7 +1204,7 @@ class DataSourceManager:
             logger.error(f"Error predicting belt issues: {e}")
             return []
     
-    def _get_belt_health_status(self, sensor_data: Dict, efficiency_score: float) -> str:
+    def _get_belt_health_status(self, sensors: SensorReading, efficiency_score: float) -> str:
         """Determine belt health status based on sensors and efficiency"""
         try:
             if efficiency_score >= 90:
@@ -1072,7 +1221,7 @@ class DataSourceManager:
             logger.error(f"Error determining belt health: {e}")
             return 'Unknown'
     
-    def _calculate_delay_risk(self, bags: List[Dict], sensor_data: Dict) -> Dict[str, Any]:
+    def _calculate_delay_risk(self, bags: List[Bag], sensors: SensorReading) -> Dict[str, Any]:
         """Calculate AI-powered delay risk assessment"""
         try:
             risk_factors = []
@@ -1080,28 +1229,23 @@ class DataSourceManager:
             
             # Bag positioning risk
             if bags:
-                stuck_bags = len([b for b in bags if b.get('stuck_status', False)])
+                stuck_bags = sum(1 for bag in bags if bag.stuck)
                 if stuck_bags > 0:
                     positioning_risk = min(100, stuck_bags * 25)
                     risk_factors.append(f"Stuck bags: {positioning_risk}%")
                     total_risk += positioning_risk
             
             # Speed risk
-            current_speed = sensor_data.get('current_speed', 0)
+            current_speed = sensors.current_speed
             if current_speed < 2.0:
                 speed_risk = min(100, (2.0 - current_speed) * 50)
                 risk_factors.append(f"Low speed: {speed_risk:.1f}%")
                 total_risk += speed_risk
             
             # Sensor warning risk
-            for sensor_type, sensor_info in sensor_data.items():
-                if isinstance(sensor_info, dict):
-                    if sensor_info.get('warning', False):
-                        total_risk += 15
-                        risk_factors.append(f"{sensor_type} warning")
-                    if sensor_info.get('abnormal', False):
-                        total_risk += 25
-                        risk_factors.append(f"{sensor_type} abnormal")
+            for sensor_key, level in sensors.alerts():
+                total_risk += 15 if level == 'warning' else 25
+                risk_factors.append(f"{sensor_key} {level}")
             
             # Overall risk assessment
             if total_risk >= 80:
@@ -1126,35 +1270,30 @@ class DataSourceManager:
             logger.error(f"Error calculating delay risk: {e}")
             return {'risk_level': 'Unknown', 'risk_score': 0, 'risk_factors': [], 'estimated_delay': 'Unknown'}
     
-    def _calculate_breakdown_probability(self, sensor_data: Dict) -> Dict[str, Any]:
+    def _calculate_breakdown_probability(self, sensors: SensorReading) -> Dict[str, Any]:
         """Calculate AI-powered breakdown probability"""
         try:
             breakdown_score = 0
             contributing_factors = []
             
             # Temperature factor
-            if 'temperature_sensor' in sensor_data:
-                temp_data = sensor_data['temperature_sensor']
-                if temp_data['current_temp'] > 35:
-                    breakdown_score += 30
-                    contributing_factors.append(f"High temperature: {temp_data['current_temp']:.1f}°C")
+            if sensors.has('temperature') and sensors.current_temp > 35:
+                breakdown_score += 30
+                contributing_factors.append(f"High temperature: {sensors.current_temp:.1f}°C")
             
             # Vibration factor
-            if 'vibration_sensor' in sensor_data:
-                vib_data = sensor_data['vibration_sensor']
-                if vib_data['vibration_level'] > 2.0:
+            if sensors.has('vibration'):
+                if sensors.vibration_level > 2.0:
                     breakdown_score += 25
-                    contributing_factors.append(f"High vibration: {vib_data['vibration_level']:.1f}")
-                if vib_data['bearing_health'] == 'Poor':
+                    contributing_factors.append(f"High vibration: {sensors.vibration_level:.1f}")
+                if sensors.bearing_health == 'Poor':
                     breakdown_score += 40
                     contributing_factors.append("Poor bearing health")
             
             # Weight factor
-            if 'weight_sensor' in sensor_data:
-                weight_data = sensor_data['weight_sensor']
-                if weight_data['current_load'] > 90:
-                    breakdown_score += 20
-                    contributing_factors.append(f"Overload: {weight_data['current_load']}%")
+            if sensors.has('weight') and sensors.current_load > 90:
+                breakdown_score += 20
+                contributing_factors.append(f"Overload: {sensors.current_load}%")
             
             # Probability calculation
             if breakdown_score >= 80:
@@ -1185,22 +1324,24 @@ class DataSourceManager:
             logger.error(f"Error calculating breakdown probability: {e}")
             return {'probability': 'Unknown', 'score': 0, 'contributing_factors': [], 'time_to_breakdown': 'Unknown'}
     
-    def _generate_system_insights(self, conveyor_belts: List[Dict], airport_code: str) -> Dict[str, Any]:
+    def _generate_system_insights(self, conveyor_belts: List[Belt], airport_code: str) -> Dict[str, Any]:
         """Generate AI-powered system-wide insights"""
         try:
             total_belts = len(conveyor_belts)
-            active_belts = len([b for b in conveyor_belts if b['status'] == 'Active'])
+            active_belts = len([b for b in conveyor_belts if b.status == 'Active'])
+            # A terminal= or status= filter can match no belts at all
+            active_ratio = active_belts / total_belts if total_belts else 0.0
             
             # Performance analysis
-            efficiency_scores = [b['efficiency_score'] for b in conveyor_belts if b['status'] == 'Active']
+            efficiency_scores = [b.efficiency_score for b in conveyor_belts if b.status == 'Active']
             avg_efficiency = sum(efficiency_scores) / len(efficiency_scores) if efficiency_scores else 0
             
             # Issue analysis
             all_issues = []
             for belt in conveyor_belts:
-                all_issues.extend(belt.get('predicted_issues', []))
+                all_issues.extend(belt.predicted_issues)
             
-            critical_issues = [i for i in all_issues if i.get('severity') == 'High']
+            critical_issues = [i for i in all_issues if i.severity == 'High']
             
             # AI recommendations
             recommendations = []
@@ -1208,12 +1349,12 @@ class DataSourceManager:
                 recommendations.append("System efficiency below optimal. Consider load balancing and maintenance.")
             if len(critical_issues) > 2:
                 recommendations.append("Multiple critical issues detected. Prioritize immediate interventions.")
-            if active_belts / total_belts < 0.8:
+            if total_belts and active_ratio < 0.8:
                 recommendations.append("Low belt utilization. Review operational scheduling.")
             
             return {
                 'system_efficiency': round(avg_efficiency, 1),
-                'active_belts_ratio': round((active_belts / total_belts) * 100, 1),
+                'active_belts_ratio': round(active_ratio * 100, 1),
                 'critical_issues_count': len(critical_issues),
                 'total_issues_count': len(all_issues),
                 'recommendations': recommendations,
@@ -1226,45 +1367,46 @@ class DataSourceManager:
             logger.error(f"Error generating system insights: {e}")
             return {'error': 'Failed to generate system insights'}
     
-    def _generate_ai_alerts(self, conveyor_belts: List[Dict]) -> List[Dict[str, Any]]:
+    def _generate_ai_alerts(self, conveyor_belts: List[Belt]) -> List[Dict[str, Any]]:
         """Generate AI-powered alerts for staff attention"""
         try:
             alerts = []
+            timestamp = simulation_datetime().strftime('%H:%M:%S')
             
             for belt in conveyor_belts:
                 # Critical alerts
-                if belt.get('health_status') == 'Critical':
+                if belt.health_status == 'Critical':
                     alerts.append({
                         'type': 'Critical Alert',
-                        'belt_id': belt['belt_id'],
-                        'message': f"Critical health status detected on {belt['belt_id']}",
+                        'belt_id': belt.belt_id,
+                        'message': f"Critical health status detected on {belt.belt_id}",
                         'priority': 'Immediate',
                         'action_required': 'Immediate shutdown and maintenance',
-                        'timestamp': datetime.datetime.now().strftime('%H:%M:%S')
+                        'timestamp': timestamp
                     })
                 
                 # High delay risk alerts
-                delay_risk = belt.get('delay_risk', {})
+                delay_risk = belt.delay_risk
                 if delay_risk.get('risk_level') in ['High', 'Critical']:
                     alerts.append({
                         'type': 'Delay Risk Alert',
-                        'belt_id': belt['belt_id'],
-                        'message': f"High delay risk on {belt['belt_id']}: {delay_risk.get('estimated_delay')}",
+                        'belt_id': belt.belt_id,
+                        'message': f"High delay risk on {belt.belt_id}: {delay_risk.get('estimated_delay')}",
                         'priority': 'High',
                         'action_required': 'Monitor closely and prepare intervention',
-                        'timestamp': datetime.datetime.now().strftime('%H:%M:%S')
+                        'timestamp': timestamp
                     })
                 
                 # Breakdown probability alerts
-                breakdown_prob = belt.get('breakdown_probability', {})
+                breakdown_prob = belt.breakdown_probability
                 if breakdown_prob.get('probability') in ['High', 'Very High']:
                     alerts.append({
                         'type': 'Breakdown Alert',
-                        'belt_id': belt['belt_id'],
-                        'message': f"High breakdown probability on {belt['belt_id']}: {breakdown_prob.get('time_to_breakdown')}",
+                        'belt_id': belt.belt_id,
+                        'message': f"High breakdown probability on {belt.belt_id}: {breakdown_prob.get('time_to_breakdown')}",
                         'priority': 'High',
                         'action_required': 'Schedule immediate maintenance',
-                        'timestamp': datetime.datetime.now().strftime('%H:%M:%S')
+                        'timestamp': timestamp
                     })
             
             return alerts
@@ -1273,34 +1415,33 @@ class DataSourceManager:
             logger.error(f"Error generating AI alerts: {e}")
             return []
     
-    def _calculate_performance_metrics(self, conveyor_belts: List[Dict]) -> Dict[str, Any]:
+    def _calculate_performance_metrics(self, conveyor_belts: List[Belt]) -> Dict[str, Any]:
         """Calculate comprehensive performance metrics"""
         try:
-            active_belts = [b for b in conveyor_belts if b['status'] == 'Active']
+            active_belts = [b for b in conveyor_belts if b.status == 'Active']
             
             if not active_belts:
                 return {'error': 'No active belts to analyze'}
             
             # Speed metrics
-            speeds = [b['speed'] for b in active_belts]
+            speeds = [b.speed for b in active_belts]
             avg_speed = sum(speeds) / len(speeds)
             max_speed = max(speeds)
             min_speed = min(speeds)
             
             # Efficiency metrics
-            efficiencies = [b['efficiency_score'] for b in active_belts]
+            efficiencies = [b.efficiency_score for b in active_belts]
             avg_efficiency = sum(efficiencies) / len(efficiencies)
             min_efficiency = min(efficiencies)
             
             # Bag processing metrics
-            total_bags = sum(len(b['bags_on_belt']) for b in active_belts)
+            total_bags = sum(len(b.bags) for b in active_belts)
             bags_per_belt = total_bags / len(active_belts) if active_belts else 0
             
             # Health metrics
-            health_statuses = [b['health_status'] for b in active_belts]
             health_distribution = {}
-            for status in health_statuses:
-                health_distribution[status] = health_distribution.get(status, 0) + 1
+            for belt in active_belts:
+                health_distribution[belt.health_status] = health_distribution.get(belt.health_status, 0) + 1
             
             return {
                 'speed_metrics': {
@@ -1349,7 +1490,7 @@ class DataSourceManager:
             logger.error(f"Error getting AI recommendation: {e}")
             return 'Manual intervention recommended.'
     
-    def _calculate_utilization(self, bags: List[Dict], status: str) -> int:
+    def _calculate_utilization(self, bags: List[Bag], status: str) -> int:
         """Calculate belt utilization percentage"""
         try:
             if status not in ['Active', 'Slow', 'Overloaded']:
@@ -1378,19 +1519,19 @@ class DataSourceManager:
         try:
             if bag_id:
                 # Track specific bag
-                if bag_id not in self.sample_baggage:
+                def new_tracking_record():
                     # Generate new bag tracking data
                     statuses = ['Checked In', 'In Sorting', 'On Conveyor', 'Loading Aircraft', 'In Transit', 'Arrived']
                     current_status = random.choice(statuses)
                     
                     flight_num = flight_number if flight_number else f'{random.choice(["AI", "6E", "SG"])}{random.randint(100, 999)}'
-                    self.sample_baggage[bag_id] = {
+                    return {
                         'bag_id': bag_id,
                         'flight_number': flight_num,
                         'passenger_name': 'John Doe',  # In real system, this would be from booking
                         'current_status': current_status,
                         'location': f'Terminal {random.randint(1, 3)} - Belt {random.randint(1, 5)}',
-                        'last_updated': datetime.datetime.now().strftime('%H:%M:%S'),
+                        'last_updated': simulation_datetime().strftime('%H:%M:%S'),
                         'weight': f'{random.randint(15, 30)} kg',
                         'destination': random.choice(['Mumbai', 'Delhi', 'Chennai']),
                         'tracking_history': [
@@ -1400,25 +1541,82 @@ class DataSourceManager:
                         ]
                     }
                 
-                return self.sample_baggage[bag_id]
+                def load_tracking_record():
+                    # Another worker may already have tracked this bag
+                    record = self.db.tracked_bag(bag_id) if self.db else None
+                    if record is None:
+                        record = new_tracking_record()
+                        if self.db:
+                            self.db.save_tracked_bag(record)
+                    self._index_tracked_bag(record)
+                    return record
+                
+                # Concurrent first lookups of the same bag all get one record
+                return self.sample_baggage.get(bag_id, load_tracking_record)
+            elif flight_number:
+                return self.get_flight_bags(flight_number)
             else:
                 # Return sample tracking data
                 return {
                     'message': 'Enter your bag ID or flight number to track your baggage',
-                    'sample_bags': list(self.sample_baggage.keys())[:5]
+                    'sample_bags': self.sample_baggage.keys()[:-6:-1]
                 }
         except Exception as e:
             logger.error(f"Error tracking baggage: {e}")
             return {'error': 'Failed to track baggage'}
     
+    def get_flight_bags(self, flight_number: str) -> Dict[str, Any]:
+        """Every known bag on a flight: bags on conveyor belts with their belt and position, then tracked bags"""
+        try:
+            conveyor_bags = []
+            for airport_code, state in list(self.conveyor_states.items()):
+                for bag in state.bags_for_flight(flight_number):
+                    conveyor_bags.append(dict(bag.to_dict(), airport_code=airport_code, belt_id=bag.belt_id))
+            
+            with self._tracked_bags_index_lock:
+                bag_ids = list(self._tracked_bags_by_flight.get(flight_number, ()))
+            tracked = {}
+            for bag_id in bag_ids:
+                record = self.sample_baggage.peek(bag_id)
+                if record is not None:
+                    tracked[bag_id] = record
+            if self.db:
+                # Bags tracked by other workers, or evicted from this one's cache
+                for record in self.db.tracked_bags_for_flight(flight_number):
+                    tracked.setdefault(record['bag_id'], record)
+            
+            return {
+                'flight_number': flight_number,
+                'total_bags': len(conveyor_bags) + len(tracked),
+                'conveyor_bags': conveyor_bags,
+                'tracked_bags': list(tracked.values())
+            }
+        except Exception as e:
+            logger.error(f"Error getting bags for flight {flight_number}: {e}")
+            return {'error': 'Failed to get flight bags'}
+    
+    def _index_tracked_bag(self, record: Dict[str, Any]) -> None:
+        with self._tracked_bags_index_lock:
+            self._tracked_bags_by_flight.setdefault(record['flight_number'], set()).add(record['bag_id'])
+    
+    def _unindex_tracked_bag(self, bag_id: str, record: Dict[str, Any]) -> None:
+        with self._tracked_bags_index_lock:
+            bag_ids = self._tracked_bags_by_flight.get(record['flight_number'])
+            if bag_ids is not None:
+                bag_ids.discard(bag_id)
+                if not bag_ids:
+                    del self._tracked_bags_by_flight[record['flight_number']]
+    
     def submit_baggage_complaint(self, passenger_name: str, flight_number: str, 
-                                bag_id: str, issue_type: str, description: str) -> Dict[str, Any]:
+                                bag_id: str, issue_type: str, description: str,
+                                airport_code: str) -> Dict[str, Any]:
         """Submit baggage complaint"""
         try:
-            complaint_id = f'COMP{random.randint(10000, 99999)}'
+            complaint_id = self.complaints.new_complaint_id()
             
             complaint = {
                 'complaint_id': complaint_id,
+                'airport_code': airport_code,
                 'passenger_name': passenger_name,
                 'flight_number': flight_number,
                 'bag_id': bag_id,
@@ -1430,7 +1628,9 @@ class DataSourceManager:
                 'estimated_resolution': '24-48 hours'
             }
             
-            self.complaints.append(complaint)
+            self.complaints.add(complaint)
+            if self.db:
+                self.db.save_complaint(complaint)
             
             return {
                 'success': True,
@@ -1463,14 +1663,19 @@ class DataSourceManager:
             logger.error(f"Error getting airport facilities: {e}")
             return {'error': 'Failed to get airport facilities'}
     
-    def get_complaints_data(self, airport_code: str) -> Dict[str, Any]:
-        """Get complaints data for staff dashboard"""
+    def get_complaints_data(self, airport_code: str, status: Optional[str] = None,
+                            priority: Optional[str] = None, issue_type: Optional[str] = None,
+                            cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """Get one airport's complaints for the staff dashboard, newest first and paged with ``cursor``"""
         try:
-            # Add some sample complaints if none exist
-            if not self.complaints:
+            self._sync_complaints()
+            
+            # Add some sample complaints the first time a known airport with none is viewed
+            if airport_code in AIRPORT_CONVEYOR_CONFIGS and not self.complaints.stats(airport_code)['total']:
                 sample_complaints = [
                     {
-                        'complaint_id': 'COMP12345',
+                        'complaint_id': f'COMP12345-{airport_code}',
+                        'airport_code': airport_code,
                         'passenger_name': 'Jane Smith',
                         'flight_number': 'AI401',
                         'bag_id': 'BAG67890',
@@ -1482,7 +1687,8 @@ class DataSourceManager:
                         'estimated_resolution': '24-48 hours'
                     },
                     {
-                        'complaint_id': 'COMP12346',
+                        'complaint_id': f'COMP12346-{airport_code}',
+                        'airport_code': airport_code,
                         'passenger_name': 'Bob Johnson',
                         'flight_number': '6E123',
                         'bag_id': 'BAG54321',
@@ -1494,33 +1700,70 @@ class DataSourceManager:
                         'estimated_resolution': '24-48 hours'
                     }
                 ]
-                self.complaints.extend(sample_complaints)
-            
-            # Get complaint statistics
-            total_complaints = len(self.complaints)
-            open_complaints = len([c for c in self.complaints if c['status'] != 'Resolved'])
-            high_priority = len([c for c in self.complaints if c['priority'] == 'High'])
+                if self.complaints.seed_if_empty(airport_code, sample_complaints) and self.db:
+                    for complaint in sample_complaints:
+                        self.db.save_complaint(complaint)
+            
+            # Counts are kept up to date by the store, so no scan over the complaint log
+            stats = self.complaints.stats(airport_code)
+            counts = stats['counts']
+            complaints, next_cursor = self.complaints.query(
+                airport_code,
+                {'status': status, 'priority': priority, 'issue_type': issue_type},
+                cursor=cursor,
+                limit=limit
+            )
+            total_complaints = stats['total']
+            resolved_complaints = counts.get('status', {}).get('Resolved', 0)
+            complaint_types = dict.fromkeys(COMPLAINT_ISSUE_TYPES, 0)
+            complaint_types.update(counts.get('issue_type', {}))
             
             return {
-                'complaints': self.complaints,
+                'complaints': complaints,
+                'next_cursor': next_cursor,
                 'total_complaints': total_complaints,
-                'open_complaints': open_complaints,
-                'resolved_complaints': total_complaints - open_complaints,
-                'high_priority_complaints': high_priority,
-                'complaint_types': {
-                    'Lost Baggage': len([c for c in self.complaints if c['issue_type'] == 'Lost Baggage']),
-                    'Damaged Baggage': len([c for c in self.complaints if c['issue_type'] == 'Damaged Baggage']),
-                    'Delayed Baggage': len([c for c in self.complaints if c['issue_type'] == 'Delayed Baggage'])
-                }
+                'open_complaints': total_complaints - resolved_complaints,
+                'resolved_complaints': resolved_complaints,
+                'high_priority_complaints': counts.get('priority', {}).get('High', 0),
+                'complaint_types': complaint_types
             }
         except Exception as e:
             logger.error(f"Error getting complaints data: {e}")
             return {'error': 'Failed to get complaints data'}
     
-    def get_ai_baggage_insights(self, airport_code: str) -> Dict[str, Any]:
+    def update_complaint_status(self, complaint_id: str, status: str) -> Optional[Dict[str, Any]]:
+        """Move a complaint to a new status; None if there is no such complaint"""
+        self._sync_complaints()
+        complaint = self.complaints.update_status(complaint_id, status)
+        if complaint is not None and self.db:
+            self.db.save_complaint(complaint)
+        return complaint
+    
+    def _sync_complaints(self) -> None:
+        """Pull complaints other workers added or updated since the last sync"""
+        # One thread syncs at a time; the others read what is already here instead of waiting
+        if self.db is None or not self._complaint_sync_lock.acquire(blocking=False):
+            return
+        try:
+            while True:
+                changes = self.db.complaint_changes(self._complaint_change_id)
+                for change_id, complaint in changes:
+                    self.complaints.apply(complaint)
+                    self._complaint_change_id = change_id
+                if len(changes) < 10000:
+                    break
+        except Exception as e:
+            logger.error(f"Error syncing complaints from the database: {e}")
+        finally:
+            self._complaint_sync_lock.release()
+    
+    def get_ai_baggage_insights(self, airport_code: str, conveyor_data: Optional[Dict[str, Any]] = None,
+                                baggage_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate AI-powered insights for baggage process improvement"""
+        complaints_data: Dict[str, Any] = {}
         try:
             if not self.openai_client:
+                SIMULATION_FALLBACKS.inc(source='ai_insights', reason='not_configured')
                 return {
                     'insights': [
                         'AI insights are not available. Please configure OpenAI API key.',
@@ -1536,9 +1779,11 @@ class DataSourceManager:
                     'ai_enabled': False
                 }
             
-            # Get current data for analysis
-            baggage_data = self.get_baggage_tracking_data(airport_code)
-            conveyor_data = self.get_live_conveyor_data(airport_code)
+            # Get current data for analysis, reusing any snapshot the caller passed in
+            if conveyor_data is None:
+                conveyor_data = self.get_live_conveyor_data(airport_code)
+            if baggage_data is None:
+                baggage_data = self.get_baggage_tracking_data(airport_code, live_data=conveyor_data)
             complaints_data = self.get_complaints_data(airport_code)
             
             # Prepare data summary for AI analysis
@@ -1567,21 +1812,27 @@ class DataSourceManager:
             # Generate AI insights
             # the newest OpenAI model is "gpt-5" which was released August 7, 2025.
             # do not change this unless explicitly requested by the user
-            response = self.openai_client.chat.completions.create(
-                model="gpt-5",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an AI expert in airport baggage handling systems. Analyze the provided data and provide actionable insights for improving baggage processing efficiency, reducing delays, and optimizing conveyor belt operations. Focus on practical recommendations that airport staff can implement."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze this airport baggage system data and provide insights: {data_summary}"
-                    }
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=800
-            )
+            started = time.monotonic()
+            outcome = 'error'
+            try:
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-5",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an AI expert in airport baggage handling systems. Analyze the provided data and provide actionable insights for improving baggage processing efficiency, reducing delays, and optimizing conveyor belt operations. Focus on practical recommendations that airport staff can implement."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Analyze this airport baggage system data and provide insights: {data_summary}"
+                        }
+                    ],
+                    response_format={"type": "json_object"},
+                    max_tokens=800
+                )
+                outcome = 'success'
+            finally:
+                observe_upstream_call('openai', outcome, time.monotonic() - started)
             
             import json
             ai_response = json.loads(response.choices[0].message.content)
@@ -1592,11 +1843,14 @@ class DataSourceManager:
                 'efficiency_score': ai_response.get('efficiency_score', 75),
                 'priority_actions': ai_response.get('priority_actions', []),
                 'ai_enabled': True,
-                'last_analysis': datetime.datetime.now().strftime('%H:%M:%S')
+                'last_analysis': simulation_datetime().strftime('%H:%M:%S')
             }
             
         except Exception as e:
             logger.error(f"Error generating AI insights: {e}")
+            SIMULATION_FALLBACKS.inc(source='ai_insights', reason='error')
+            baggage_data = baggage_data or {}
+            conveyor_data = conveyor_data or {}
             return {
                 'insights': [
                     'AI analysis failed. Using manual insights:',
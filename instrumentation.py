@@ -0,0 +1,192 @@
+import bisect
+import contextvars
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from metrics import Family, histogram_samples
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds; anything slower lands in the +Inf bucket
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# Most stages reported per response; browsers and proxies cap header sizes
+MAX_SERVER_TIMING_STAGES = 20
+
+
+class Histogram:
+    """Latency histogram: a (non-cumulative) count per bucket plus the running sum and count"""
+
+    __slots__ = ('buckets', 'counts', 'count', 'total_ms')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        return {
+            'count': self.count,
+            'sum_ms': round(self.total_ms, 3),
+            'buckets': dict(zip(bounds, self.counts))
+        }
+
+
+class RequestTimings:
+    """Per-request stage timings; stages can run on fan-out worker threads too"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, ms: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += ms
+
+    def server_timing(self, limit: int = MAX_SERVER_TIMING_STAGES) -> str:
+        """Server-Timing header value: the slowest stages first, then the request total"""
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        parts = [f'{stage};dur={total:.3f};desc="{count}x"' for stage, (count, total) in stages]
+        parts.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.3f}')
+        return ', '.join(parts)
+
+
+_current_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    'request_timings', default=None)
+
+
+class Instrumentation:
+    """Opt-in per-stage timing for the request path.
+
+    ``instrument`` wraps every method of an object (public and private) so each
+    call is timed. Durations are inclusive: a stage's time contains the stages
+    it calls. Every call feeds a histogram per stage. Calls made while serving
+    a request also feed that request's RequestTimings, which ``init_app``
+    returns in a Server-Timing header. ``/api/debug/profile`` runs a single
+    request under cProfile and returns the stats.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets = buckets
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, ms: float) -> None:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(stage, ms)
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(ms)
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        """Wrap ``func`` so every call is recorded under ``stage``"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, (time.perf_counter() - started) * 1000)
+        wrapper.__instrumented__ = True
+        return wrapper
+
+    def instrument(self, obj: Any, prefix: Optional[str] = None) -> Any:
+        """Time every method of ``obj``, recording each as ``<prefix>.<method>``"""
+        prefix = prefix or type(obj).__name__
+        for name, member in inspect.getmembers(type(obj), inspect.isfunction):
+            if name.startswith('__') or getattr(member, '__instrumented__', False):
+                continue
+            bound = getattr(obj, name)
+            setattr(obj, name, self.timed(f'{prefix}.{name}', bound))
+        return obj
+
+    def histograms(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {stage: histogram.to_dict() for stage, histogram in sorted(self._histograms.items())}
+
+    def metric_families(self) -> List[Family]:
+        """Stage histograms for ``/metrics``, converted to seconds"""
+        with self._lock:
+            histograms = [(stage, list(h.counts), h.total_ms, h.count) for stage, h in sorted(self._histograms.items())]
+        name = 'airport_stage_duration_seconds'
+        buckets = [bound / 1000 for bound in self.buckets]
+        samples = []
+        for stage, counts, total_ms, count in histograms:
+            samples.extend(histogram_samples(name, {'stage': stage}, buckets, counts, total_ms / 1000, count))
+        return [(name, 'histogram', 'Inclusive time per instrumented stage (PROFILING=1 only)', samples)]
+
+    def init_app(self, app) -> None:
+        from flask import Response, request
+
+        app.extensions['instrumentation'] = self
+        app.json.response = self.timed('json.response', app.json.response)
+        app.json.dumps_bytes = self.timed('json.dumps_bytes', app.json.dumps_bytes)
+
+        @app.before_request
+        def start_request_timings():
+            request.environ['instrumentation.token'] = _current_timings.set(RequestTimings())
+
+        @app.after_request
+        def add_server_timing(response):
+            timings = _current_timings.get()
+            if timings is not None:
+                response.headers['Server-Timing'] = timings.server_timing()
+                self.record(f'request.{request.endpoint}', (time.perf_counter() - timings.started) * 1000)
+            return response
+
+        @app.teardown_request
+        def clear_request_timings(error=None):
+            token = request.environ.pop('instrumentation.token', None)
+            if token is not None:
+                _current_timings.reset(token)
+
+        @app.route('/api/debug/timings')
+        def get_stage_timings():
+            """Latency histograms for every instrumented stage"""
+            return {'stages': self.histograms()}
+
+        @app.route('/api/debug/profile')
+        def profile_request():
+            """Run one GET request under cProfile and return the stats as text"""
+            path = request.args.get('path', '')
+            if not path.startswith('/') or path.startswith('/api/debug/'):
+                return {'error': 'path must be an app path outside /api/debug/'}, 400
+            sort = request.args.get('sort', 'cumulative')
+            if sort not in ('cumulative', 'tottime', 'calls'):
+                return {'error': 'sort must be cumulative, tottime or calls'}, 400
+            limit = request.args.get('limit', 40, type=int)
+
+            profiler = cProfile.Profile()
+            with app.test_client() as client:
+                profiler.enable()
+                try:
+                    profiled = client.get(path)
+                finally:
+                    profiler.disable()
+
+            output = io.StringIO()
+            output.write(f'GET {path} -> {profiled.status_code}\n')
+            output.write(f"Server-Timing: {profiled.headers.get('Server-Timing', '')}\n\n")
+            pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+            return Response(output.getvalue(), mimetype='text/plain')
+
@@ -0,0 +1,90 @@
+import os
+import logging
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+from chart_layouts import StaticJSON
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask's standard-library JSON provider, plus ``dumps_bytes`` for pre-encoding response bodies"""
+
+    name = 'stdlib'
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return self.dumps(obj).encode()
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson.
+
+    Output matches the default provider's JSON (keys sorted when ``sort_keys``
+    is set), but encoding runs in native code. When the installed orjson
+    supports fragments, StaticJSON blocks such as chart layouts are spliced
+    in from their cached bytes instead of being re-encoded on every response.
+    Pretty-printed debug responses go through the standard library.
+    """
+
+    name = 'orjson'
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._splice_static = hasattr(orjson, 'Fragment')
+
+    @property
+    def _options(self) -> int:
+        # Dates go through Flask's default handler so they keep its HTTP date format
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self._splice_static:
+            options |= orjson.OPT_PASSTHROUGH_SUBCLASS
+        return options
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, StaticJSON):
+            return orjson.Fragment(obj.encoded(self.dumps_bytes, self._options))
+        # Other subclasses only reach here because of OPT_PASSTHROUGH_SUBCLASS
+        for base in (dict, list, str, int):
+            if isinstance(obj, base):
+                return base(obj)
+        return DefaultJSONProvider.default(obj)
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=self._default, option=self._options)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+
+def create_json_provider(app, name: str = None) -> JSONProvider:
+    """Pick the app's JSON provider: ``orjson`` when installed unless ``JSON_PROVIDER=stdlib``"""
+    name = (name or os.environ.get('JSON_PROVIDER', 'orjson')).lower()
+    if name == 'orjson':
+        if orjson is not None:
+            return OrjsonProvider(app)
+        logger.info("orjson not installed. Using the standard library JSON provider.")
+    elif name != 'stdlib':
+        logger.warning(f"Unknown JSON_PROVIDER '{name}'. Using the standard library JSON provider.")
+    return JSONProvider(app)
@@ -0,0 +1,299 @@
+import bisect
+import math
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Request and upstream latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Response body size buckets in bytes
+PAYLOAD_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# One exposition sample: (sample name, labels, value)
+Sample = Tuple[str, Dict[str, str], float]
+# One metric family: (name, type, help text, samples)
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+def render_families(families: Iterable[Family]) -> str:
+    """Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+    for name, kind, documentation, samples in families:
+        lines.append(f'# HELP {name} {_escape(documentation)}')
+        lines.append(f'# TYPE {name} {kind}')
+        for sample_name, labels, value in samples:
+            lines.append(f'{sample_name}{_format_labels(labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+class _Metric:
+    """A named metric with one value per combination of label values"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def value(self, **labels: Any) -> Any:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> Family:
+        with self._lock:
+            samples = [(self.name, self._labels(key), value) for key, value in sorted(self._values.items())]
+        return self.name, self.kind, self.documentation, samples
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, amount: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Non-cumulative bucket counts (the last one is +Inf), then sum and count
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect.bisect_left(self.buckets, amount)] += 1
+            entry[1] += amount
+            entry[2] += 1
+
+    def value(self, **labels: Any) -> Dict[str, float]:
+        """Count and sum of the observations for these labels"""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return {'count': entry[2], 'sum': entry[1]} if entry else {'count': 0, 'sum': 0.0}
+
+    def collect(self) -> Family:
+        with self._lock:
+            entries = [(key, list(counts), total, count) for key, (counts, total, count) in sorted(self._values.items())]
+        samples: List[Sample] = []
+        for key, counts, total, count in entries:
+            labels = self._labels(key)
+            samples.extend(histogram_samples(self.name, labels, self.buckets, counts, total, count))
+        return self.name, self.kind, self.documentation, samples
+
+
+def histogram_samples(name: str, labels: Dict[str, str], buckets: Iterable[float], counts: List[int],
+                      total: float, count: int) -> List[Sample]:
+    """Exposition samples for one histogram series from its non-cumulative bucket counts"""
+    samples: List[Sample] = []
+    cumulative = 0
+    for bound, bucket_count in zip(list(buckets) + [math.inf], counts):
+        cumulative += bucket_count
+        samples.append((f'{name}_bucket', dict(labels, le=_format_value(bound)), cumulative))
+    samples.append((f'{name}_sum', labels, total))
+    samples.append((f'{name}_count', labels, count))
+    return samples
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered in the Prometheus text format.
+
+    Metrics are registered once by name; asking for an existing name returns
+    the same metric. Values live in this process only: under gunicorn every
+    worker keeps and reports its own series.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Tuple[str, ...], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def collect(self) -> List[Family]:
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return [metric.collect() for _, metric in metrics]
+
+
+REGISTRY = MetricsRegistry()
+
+UPSTREAM_CALLS = REGISTRY.counter(
+    'airport_upstream_calls_total', 'Calls to upstream APIs by outcome', ('upstream', 'outcome'))
+UPSTREAM_DURATION = REGISTRY.histogram(
+    'airport_upstream_call_duration_seconds', 'Upstream API call latency', ('upstream',))
+SIMULATION_FALLBACKS = REGISTRY.counter(
+    'airport_simulation_fallbacks_total', 'Responses built from simulated data because an upstream failed',
+    ('source', 'reason'))
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'airport_http_request_duration_seconds', 'Time to produce a response, per route', ('method', 'route', 'status'))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    'airport_http_requests_in_flight', 'Requests currently being handled')
+HTTP_RESPONSE_SIZE = REGISTRY.histogram(
+    'airport_http_response_size_bytes', 'Response body size as sent (after compression), per route',
+    ('method', 'route'), buckets=PAYLOAD_SIZE_BUCKETS)
+
+
+def observe_upstream_call(upstream: str, outcome: str, seconds: float) -> None:
+    UPSTREAM_CALLS.inc(upstream=upstream, outcome=outcome)
+    UPSTREAM_DURATION.observe(seconds, upstream=upstream)
+
+
+class RequestMetrics:
+    """Per-route latency, in-flight and payload size metrics, served with everything else at ``/metrics``.
+
+    Register it before other ``after_request`` handlers (such as compression),
+    since Flask runs those in reverse order and the size should be the one sent.
+    Collectors added with ``add_collector`` are called on every scrape and
+    turn existing stats (caches, circuit breakers) into metric families.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.registry = registry
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families = self.registry.collect()
+        for collector in self._collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.error(f"Error collecting metrics from {getattr(collector, '__name__', collector)}: {e}")
+        return render_families(families)
+
+    def init_app(self, app) -> None:
+        from flask import Response, request
+
+        app.extensions['request_metrics'] = self
+
+        @app.before_request
+        def start_request_metrics():
+            request.environ['metrics.started'] = time.perf_counter()
+            HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        @app.after_request
+        def record_request_metrics(response):
+            started = request.environ.get('metrics.started')
+            if started is not None:
+                # The route template, not the path, so per-airport and per-bag URLs share one series
+                route = request.url_rule.rule if request.url_rule else 'unmatched'
+                HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method=request.method,
+                                              route=route, status=response.status_code)
+                if not response.is_streamed and response.content_length is not None:
+                    HTTP_RESPONSE_SIZE.observe(response.content_length, method=request.method, route=route)
+            return response
+
+        @app.teardown_request
+        def finish_request_metrics(error=None):
+            if request.environ.pop('metrics.started', None) is not None:
+                HTTP_REQUESTS_IN_FLIGHT.dec()
+
+        @app.route('/metrics')
+        def get_metrics():
+            """Every metric in the Prometheus text exposition format"""
+            return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+def cache_families(caches: Dict[str, Callable[[], Dict[str, Any]]]) -> List[Family]:
+    """Metric families from TTLCache stats, keyed by cache name"""
+    events: List[Sample] = []
+    sizes: List[Sample] = []
+    for name, stats in caches.items():
+        stats = stats()
+        for event in ('hits', 'stale_hits', 'misses', 'evictions', 'expirations'):
+            if event in stats:
+                events.append(('airport_cache_events_total', {'cache': name, 'event': event}, stats[event]))
+        sizes.append(('airport_cache_entries', {'cache': name}, stats['size']))
+    return [
+        ('airport_cache_events_total', 'counter', 'Cache lookups and removals by event', events),
+        ('airport_cache_entries', 'gauge', 'Entries currently cached', sizes)
+    ]
+
+
+def circuit_families(upstream_stats: Dict[str, Dict[str, Any]]) -> List[Family]:
+    """Metric families from UpstreamClient stats: one series per circuit state, 1 for the current one"""
+    states: List[Sample] = []
+    opened: List[Sample] = []
+    for name, stats in upstream_stats.items():
+        circuit = stats['circuit']
+        for state in ('closed', 'open', 'half_open'):
+            states.append(('airport_upstream_circuit_state', {'upstream': name, 'state': state},
+                           1 if circuit['state'] == state else 0))
+        opened.append(('airport_upstream_circuit_opened_total', {'upstream': name}, circuit['times_opened']))
+    return [
+        ('airport_upstream_circuit_state', 'gauge', 'Circuit breaker state per upstream', states),
+        ('airport_upstream_circuit_opened_total', 'counter', 'Times each circuit breaker opened', opened)
+    ]
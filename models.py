@@ -0,0 +1,200 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Check-in and sorting stages every bag passes through before reaching a belt
+BAG_TRACKING_STAGES = (
+    ('14:30', 'Checked In', 'Check-in Counter'),
+    ('14:45', 'In Sorting', 'Baggage Sorting Area')
+)
+
+
+@dataclass(slots=True)
+class Bag:
+    """A bag travelling along a conveyor belt"""
+
+    bag_id: str
+    belt_id: str
+    position: float
+    flight: str
+    destination: str
+    priority: str
+    weight_kg: int
+    eta_seconds: float
+    stuck: bool
+    last_movement: str
+    status: str = 'In Transit'
+
+    def tracking_history(self) -> List[Dict[str, str]]:
+        history = [{'time': time, 'status': status, 'location': location}
+                   for time, status, location in BAG_TRACKING_STAGES]
+        history.append({'time': '15:00', 'status': 'On Conveyor', 'location': self.belt_id})
+        return history
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'bag_id': self.bag_id,
+            'position': self.position,
+            'flight': self.flight,
+            'destination': self.destination,
+            'status': self.status,
+            'priority': self.priority,
+            'weight': f'{self.weight_kg} kg',
+            'eta_seconds': self.eta_seconds,
+            'stuck_status': self.stuck,
+            'last_movement': self.last_movement,
+            'tracking_history': self.tracking_history()
+        }
+
+
+@dataclass(slots=True)
+class SensorReading:
+    """One reading of every sensor fitted to a belt; unfitted sensors stay None"""
+
+    sensor_types: Tuple[str, ...]
+    current_speed: float
+    # Weight sensor
+    current_load: Optional[int] = None
+    last_calibration_days: Optional[int] = None
+    overload_warning: bool = False
+    # Motion sensor
+    speed_variation: Optional[float] = None
+    stuck_detection: Optional[bool] = None
+    # Temperature sensor
+    current_temp: Optional[float] = None
+    overheating_warning: bool = False
+    # Vibration sensor
+    vibration_level: Optional[float] = None
+    bearing_health: Optional[str] = None
+    abnormal_vibration: bool = False
+    # Optical sensor
+    bag_detection: Optional[int] = None
+    jam_detection: Optional[bool] = None
+    foreign_object_detection: Optional[bool] = None
+
+    def has(self, sensor_type: str) -> bool:
+        return sensor_type in self.sensor_types
+
+    def alerts(self) -> Iterator[Tuple[str, str]]:
+        """Yield (sensor key, 'warning' | 'abnormal') for every raised sensor flag"""
+        if self.overload_warning:
+            yield 'weight_sensor', 'warning'
+        if self.overheating_warning:
+            yield 'temperature_sensor', 'warning'
+        if self.abnormal_vibration:
+            yield 'vibration_sensor', 'abnormal'
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        if self.has('weight'):
+            data['weight_sensor'] = {
+                'current_load': self.current_load,
+                'max_capacity': 100,
+                'overload_warning': self.overload_warning,
+                'last_calibration': f'{self.last_calibration_days} days ago'
+            }
+        if self.has('motion'):
+            data['motion_sensor'] = {
+                'current_speed': self.current_speed,
+                'speed_variation': self.speed_variation,
+                'direction': 'forward',
+                'stuck_detection': self.stuck_detection
+            }
+        if self.has('temperature'):
+            data['temperature_sensor'] = {
+                'current_temp': self.current_temp,
+                'max_safe_temp': 40.0,
+                'overheating_warning': self.overheating_warning,
+                'cooling_system_status': 'Normal'
+            }
+        if self.has('vibration'):
+            data['vibration_sensor'] = {
+                'vibration_level': self.vibration_level,
+                'max_safe_vibration': 3.0,
+                'abnormal_vibration': self.abnormal_vibration,
+                'bearing_health': self.bearing_health
+            }
+        if self.has('optical'):
+            data['optical_sensor'] = {
+                'bag_detection': self.bag_detection,
+                'jam_detection': self.jam_detection,
+                'foreign_object_detection': self.foreign_object_detection,
+                'camera_status': 'Operational'
+            }
+        data['current_speed'] = self.current_speed
+        return data
+
+
+@dataclass(slots=True)
+class Issue:
+    """A predicted belt issue"""
+
+    issue_type: str
+    severity: str
+    description: str
+    probability: int
+    recommended_action: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'type': self.issue_type,
+            'severity': self.severity,
+            'description': self.description,
+            'probability': self.probability,
+            'recommended_action': self.recommended_action
+        }
+
+
+@dataclass(slots=True)
+class Belt:
+    """A conveyor belt with its sensors, bags and AI scores"""
+
+    belt_id: str
+    terminal: str
+    status: str
+    max_speed: float
+    sensors: SensorReading
+    bags: List[Bag]
+    ai_insights: Dict[str, Any]
+    total_processed_today: int
+    last_maintenance_days: int
+    utilization: int
+    last_updated: str
+    belt_counter: int
+    efficiency_score: float = 0.0
+    predicted_issues: List[Issue] = field(default_factory=list)
+    health_status: str = 'Unknown'
+    delay_risk: Dict[str, Any] = field(default_factory=dict)
+    breakdown_probability: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def speed(self) -> float:
+        return self.sensors.current_speed
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """JSON shape of the belt; ``fields`` limits it to those keys, and only they are computed"""
+        if fields is None:
+            fields = BELT_FIELDS
+        return {name: BELT_FIELDS[name](self) for name in fields}
+
+
+# JSON field name -> how to compute it from a Belt, in output order
+BELT_FIELDS = {
+    'belt_id': lambda belt: belt.belt_id,
+    'terminal': lambda belt: belt.terminal,
+    'status': lambda belt: belt.status,
+    'speed': lambda belt: belt.speed,
+    'max_speed': lambda belt: belt.max_speed,
+    'bags_on_belt': lambda belt: [bag.to_dict() for bag in belt.bags],
+    'total_processed_today': lambda belt: belt.total_processed_today,
+    'last_maintenance': lambda belt: f'{belt.last_maintenance_days} days ago',
+    'utilization': lambda belt: belt.utilization,
+    'sensor_data': lambda belt: belt.sensors.to_dict(),
+    'ai_insights': lambda belt: belt.ai_insights,
+    'efficiency_score': lambda belt: belt.efficiency_score,
+    'predicted_issues': lambda belt: [issue.to_dict() for issue in belt.predicted_issues],
+    'health_status': lambda belt: belt.health_status,
+    'delay_risk': lambda belt: belt.delay_risk,
+    'breakdown_probability': lambda belt: belt.breakdown_probability,
+    'last_updated': lambda belt: belt.last_updated,
+    'belt_counter': lambda belt: belt.belt_counter
+}
@@ -0,0 +1,227 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Primary result codes for a database another connection holds; any other error is not worth retrying
+SQLITE_BUSY = 5
+SQLITE_LOCKED = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS complaints (
+    complaint_id TEXT PRIMARY KEY,
+    change_id INTEGER NOT NULL,
+    airport_code TEXT NOT NULL,
+    status TEXT NOT NULL,
+    bag_id TEXT,
+    flight_number TEXT,
+    data TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS complaints_change_id ON complaints (change_id);
+CREATE INDEX IF NOT EXISTS complaints_airport_status ON complaints (airport_code, status);
+CREATE INDEX IF NOT EXISTS complaints_bag_id ON complaints (bag_id);
+CREATE INDEX IF NOT EXISTS complaints_flight_number ON complaints (flight_number);
+
+CREATE TABLE IF NOT EXISTS tracked_bags (
+    bag_id TEXT PRIMARY KEY,
+    flight_number TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tracked_bags_flight_number ON tracked_bags (flight_number);
+
+CREATE TABLE IF NOT EXISTS id_blocks (
+    name TEXT PRIMARY KEY,
+    next_id INTEGER NOT NULL
+);
+"""
+
+# Every write gets the next change_id, so other workers can pick up new and updated complaints in order
+UPSERT_COMPLAINT = """
+INSERT INTO complaints (complaint_id, change_id, airport_code, status, bag_id, flight_number, data)
+VALUES (?, (SELECT COALESCE(MAX(change_id), 0) + 1 FROM complaints), ?, ?, ?, ?, ?)
+ON CONFLICT (complaint_id) DO UPDATE SET
+    change_id = excluded.change_id,
+    status = excluded.status,
+    data = excluded.data
+"""
+INSERT_TRACKED_BAG = "INSERT OR IGNORE INTO tracked_bags (bag_id, flight_number, data) VALUES (?, ?, ?)"
+SELECT_COMPLAINT_CHANGES = "SELECT change_id, data FROM complaints WHERE change_id > ? ORDER BY change_id LIMIT ?"
+SELECT_TRACKED_BAG = "SELECT data FROM tracked_bags WHERE bag_id = ?"
+SELECT_FLIGHT_TRACKED_BAGS = "SELECT data FROM tracked_bags WHERE flight_number = ? LIMIT ?"
+
+
+def _is_busy(error: sqlite3.Error) -> bool:
+    """Whether an error means another connection holds the database, so a later attempt can succeed"""
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        # Extended codes such as SQLITE_BUSY_SNAPSHOT keep the primary code in the low byte
+        return code & 0xFF in (SQLITE_BUSY, SQLITE_LOCKED)
+    # Python < 3.11 has no error codes on exceptions
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class SQLiteStore:
+    """Complaints and tracked bags in an SQLite database shared by every worker process.
+
+    The database runs in WAL mode, so readers never wait for the writer.
+    Writes are queued and committed by one background thread per process
+    (group commit): whatever piles up within ``flush_interval`` seconds, up to
+    ``batch_size`` statements, goes into a single transaction. Callers
+    therefore return as soon as a write is queued. A crash can lose at most
+    the writes from the last flush interval. A batch that cannot commit
+    because the database stays locked past ``busy_timeout`` is retried with
+    backoff until it does, so acknowledged writes are never dropped; later
+    writes wait in the queue meanwhile. The SQL statements are fixed
+    strings, so each connection compiles them once and reuses them from its
+    statement cache.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 0.005,
+                 busy_timeout: float = 5.0, retry_delay: float = 0.05, max_retry_delay: float = 2.0,
+                 max_retries: int = 20):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.busy_timeout = busy_timeout
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_retries = max_retries
+        self.stats = {'writes': 0, 'commits': 0, 'retries': 0, 'errors': 0}
+        self._local = threading.local()
+        self._queue: 'queue.Queue[Tuple[str, Any]]' = queue.Queue()
+        self._id_lock = threading.Lock()
+        self._id_blocks: Dict[str, List[int]] = {}
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name='sqlite-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        # With WAL, NORMAL only syncs at checkpoints: committed data survives a process crash
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # Writes
+
+    def save_complaint(self, complaint: Dict[str, Any]) -> None:
+        """Queue an insert or update of a complaint"""
+        self._queue.put((UPSERT_COMPLAINT, (
+            complaint['complaint_id'], complaint['airport_code'], complaint['status'],
+            complaint.get('bag_id'), complaint.get('flight_number'), json.dumps(complaint)
+        )))
+
+    def save_tracked_bag(self, bag: Dict[str, Any]) -> None:
+        """Queue a tracked bag; the first record stored for a bag ID wins"""
+        self._queue.put((INSERT_TRACKED_BAG, (bag['bag_id'], bag.get('flight_number'), json.dumps(bag))))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is committed"""
+        done = threading.Event()
+        self._queue.put(('', done))
+        return done.wait(timeout)
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._commit(conn, batch)
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Tuple[str, Any]]) -> None:
+        waiters = [params for sql, params in batch if not sql]
+        writes = [(sql, params) for sql, params in batch if sql]
+        try:
+            if writes:
+                self._commit_writes(conn, writes)
+        finally:
+            for done in waiters:
+                done.set()
+
+    def _commit_writes(self, conn: sqlite3.Connection, writes: List[Tuple[str, Any]], retry: bool = True) -> None:
+        """Commit writes in one transaction, retrying a bounded number of times while the database is locked"""
+        delay = self.retry_delay
+        attempts = 0
+        while True:
+            try:
+                with conn:
+                    for sql, params in writes:
+                        conn.execute(sql, params)
+                self.stats['writes'] += len(writes)
+                self.stats['commits'] += 1
+                return
+            except sqlite3.Error as e:
+                if retry and attempts < self.max_retries and _is_busy(e):
+                    # Locked past busy_timeout, e.g. by another worker's writer or an ID reservation
+                    attempts += 1
+                    self.stats['retries'] += 1
+                    logger.warning(f"Retrying {len(writes)} queued writes to {self.path} in {delay:.2f}s: {e}")
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.max_retry_delay)
+                    continue
+                # Anything else would fail every retry; commit the writes on their own and drop only those that fail
+                self.stats['errors'] += 1
+                if len(writes) == 1:
+                    logger.error(f"Error committing a queued write to {self.path}, dropping it: {e} {writes[0]!r}")
+                    return
+                logger.error(f"Error committing {len(writes)} queued writes to {self.path}, retrying one by one: {e}")
+                for write in writes:
+                    self._commit_writes(conn, [write], retry=False)
+                return
+
+    # Reads
+
+    def complaint_changes(self, since: int, limit: int = 10000) -> List[Tuple[int, Dict[str, Any]]]:
+        """Complaints inserted or updated by any worker after change ``since``, oldest first"""
+        rows = self._reader().execute(SELECT_COMPLAINT_CHANGES, (since, limit)).fetchall()
+        return [(change_id, json.loads(data)) for change_id, data in rows]
+
+    def tracked_bag(self, bag_id: str) -> Optional[Dict[str, Any]]:
+        row = self._reader().execute(SELECT_TRACKED_BAG, (bag_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def tracked_bags_for_flight(self, flight_number: str, limit: int = 10000) -> List[Dict[str, Any]]:
+        rows = self._reader().execute(SELECT_FLIGHT_TRACKED_BAGS, (flight_number, limit)).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def id_allocator(self, name: str, first_id: int, block_size: int = 1000) -> Callable[[], int]:
+        """Callable returning IDs unique across every worker, reserved from the database in blocks"""
+        def allocate() -> int:
+            with self._id_lock:
+                block = self._id_blocks.get(name)
+                if not block or block[0] >= block[1]:
+                    start = self._reserve_ids(name, first_id, block_size)
+                    block = self._id_blocks[name] = [start, start + block_size]
+                block[0] += 1
+                return block[0] - 1
+        return allocate
+
+    def _reserve_ids(self, name: str, first_id: int, count: int) -> int:
+        conn = self._reader()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT next_id FROM id_blocks WHERE name = ?', (name,)).fetchone()
+            start = row[0] if row else first_id
+            conn.execute('INSERT OR REPLACE INTO id_blocks (name, next_id) VALUES (?, ?)', (name, start + count))
+        return start
@@ -0,0 +1,65 @@
+import contextlib
+import contextvars
+import datetime
+import hashlib
+import random as _random
+import time
+from typing import Any, Iterator, Optional
+
+# Generator for the code currently running; outside a seeded context, the random module itself, whose public
+# functions share the same names as a Random instance's methods
+_generator: contextvars.ContextVar[Any] = contextvars.ContextVar('simulation_random', default=_random)
+# Simulated epoch seconds for the code currently running, if its clock is fixed
+_now: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('simulation_now', default=None)
+
+
+def derive_seed(*parts: Any) -> int:
+    """Stable 64-bit seed from any parts; unlike hash(), the same in every process"""
+    key = '\x1f'.join(str(part) for part in parts).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+
+class SimulationRandom:
+    """Stand-in for the ``random`` module that draws from the current seeded context.
+
+    Inside ``seeded_simulation`` every call goes to that context's own
+    ``random.Random``. Outside one it falls through to the global ``random``
+    module, so unseeded callers (and ``random.seed`` in scripts) behave as before.
+    """
+
+    __slots__ = ()
+
+    # Every attribute is delegated, so skip the normal lookup (and the AttributeError __getattr__ would cost)
+    def __getattribute__(self, name: str) -> Any:
+        return getattr(_generator.get(), name)
+
+
+simulation_random = SimulationRandom()
+
+
+@contextlib.contextmanager
+def seeded_simulation(*key: Any, now: Optional[float] = None) -> Iterator[_random.Random]:
+    """Run the enclosed code with a generator seeded from ``key`` and, if given, a fixed clock.
+
+    Generators are per context, so concurrent builds never share random state,
+    and identical keys always produce identical draws. Context copies (such as
+    upstream fan-out tasks) inherit the same generator.
+    """
+    generator = _random.Random(derive_seed(*key))
+    generator_token = _generator.set(generator)
+    now_token = _now.set(now)
+    try:
+        yield generator
+    finally:
+        _now.reset(now_token)
+        _generator.reset(generator_token)
+
+
+def simulation_time() -> float:
+    """Epoch seconds of the simulated moment: the seeded context's clock, else the wall clock"""
+    now = _now.get()
+    return time.time() if now is None else now
+
+
+def simulation_datetime() -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(simulation_time())
@@ -0,0 +1,118 @@
+import heapq
+import os
+import random
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotScheduler:
+    """Refreshes airport snapshots on a background thread.
+
+    Each airport is refreshed every ``interval`` seconds, with up to
+    ``jitter * interval`` of random spread so airports (and gunicorn workers)
+    do not all hit the upstream APIs at the same instant. Slow sources keep
+    their own, longer intervals through the engine's ``source_intervals``.
+    """
+
+    def __init__(self, engine, airport_codes: Iterable[str], interval: Optional[float] = None,
+                 jitter: float = 0.1):
+        self.engine = engine
+        self.airport_codes = list(airport_codes)
+        self.interval = interval if interval is not None else engine.refresh_interval
+        self.jitter = jitter
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.stats = {'refreshes': 0, 'failures': 0, 'last_refresh': {}}
+
+    def _jittered(self, delay: float) -> float:
+        """Spread a delay by up to +/- jitter of the refresh interval"""
+        return max(0.0, delay + random.uniform(-self.jitter, self.jitter) * self.interval)
+
+    def refresh_airport(self, airport_code: str) -> None:
+        """Refresh one airport, logging rather than raising on failure"""
+        started = time.time()
+        try:
+            self.engine.refresh(airport_code)
+            self.stats['refreshes'] += 1
+            self.stats['last_refresh'][airport_code] = {
+                'at': started,
+                'duration_seconds': round(time.time() - started, 3)
+            }
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"Error refreshing snapshot for {airport_code}: {e}")
+
+    def run_once(self) -> None:
+        """Refresh every airport once in the calling thread"""
+        for airport_code in self.airport_codes:
+            self.refresh_airport(airport_code)
+
+    def _run(self) -> None:
+        """Scheduler loop: always refresh whichever airport is due next"""
+        now = time.monotonic()
+        spacing = self.interval / max(1, len(self.airport_codes))
+        queue: List[Tuple[float, str]] = [
+            (now + index * spacing, code) for index, code in enumerate(self.airport_codes)
+        ]
+        heapq.heapify(queue)
+
+        while queue and not self._stop_event.is_set():
+            due, airport_code = heapq.heappop(queue)
+            delay = due - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                break
+
+            self.refresh_airport(airport_code)
+            heapq.heappush(queue, (max(due, time.monotonic()) + self._jittered(self.interval), airport_code))
+
+    def start(self) -> None:
+        """Start the refresh thread and switch the engine to background mode"""
+        with self._lock:
+            if self.running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='snapshot-scheduler', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+            self.engine.background = True
+            logger.info(f"Snapshot scheduler started for {len(self.airport_codes)} airports "
+                        f"every {self.interval}s")
+
+    def ensure_started(self) -> None:
+        """Start the scheduler in this process if it is not already running.
+
+        Safe to call on every request: threads do not survive a fork, so a
+        gunicorn worker forked from a preloaded master starts its own.
+        """
+        if not self.running:
+            self.start()
+
+    @property
+    def running(self) -> bool:
+        return (self._thread is not None and self._thread.is_alive()
+                and self._pid == os.getpid())
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the refresh thread and fall back to per-request snapshots"""
+        self._stop_event.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+        self._thread = None
+        self.engine.background = False
+
+
+def parse_source_intervals(value: str) -> Dict[str, float]:
+    """Parse ``section=seconds`` pairs, e.g. ``"flight_status=60,weather=300"``"""
+    intervals = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        section, _, seconds = item.partition('=')
+        intervals[section.strip()] = float(seconds)
+    return intervals
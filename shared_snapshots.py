@@ -0,0 +1,259 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from snapshot import AirportSnapshot
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+MAGIC = b'APTSNAP\x00'
+FORMAT_VERSION = 1
+# magic, format version, section count, snapshot version, tick, created_at
+HEADER = struct.Struct('<8sIIqqd')
+# section name, etag (sha1 hex), built_at, body offset, body length
+ENTRY = struct.Struct('<32s40sdQQ')
+
+
+class SharedSnapshot:
+    """Read-only view of one airport's snapshot file, memory-mapped.
+
+    The header and section index are parsed once per file. Bodies stay in the
+    mapping (page cache, shared by every process) and are sliced out per
+    response. Files are replaced, never rewritten, so a mapping stays valid
+    for as long as anyone holds it.
+    """
+
+    def __init__(self, airport_code: str, path: str):
+        self.airport_code = airport_code
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_ino, stat.st_mtime_ns)
+
+        magic, format_version, count, self.version, self.tick, self.created_at = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} snapshot file")
+        self.sections: Dict[str, Tuple[str, float, int, int]] = {}
+        for index in range(count):
+            name, etag, built_at, offset, length = ENTRY.unpack_from(self._map, HEADER.size + index * ENTRY.size)
+            self.sections[name.rstrip(b'\x00').decode()] = (etag.decode(), built_at, offset, length)
+        self._decoded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def serialized(self, section: str, serializer: Optional[Callable[[Any], bytes]] = None) -> Tuple[bytes, str]:
+        """A section's encoded body and ETag, as the refresher wrote them; ``serializer`` is unused"""
+        etag, _, offset, length = self.sections[section]
+        return self._map[offset:offset + length], etag
+
+    def get(self, section: str) -> Any:
+        """A section decoded from its JSON, once per file"""
+        try:
+            return self._decoded[section]
+        except KeyError:
+            pass
+        data = json.loads(self.serialized(section)[0])
+        with self._lock:
+            return self._decoded.setdefault(section, data)
+
+    def built_at(self, section: str) -> Optional[float]:
+        entry = self.sections.get(section)
+        return entry[1] if entry else None
+
+    def to_snapshot(self, builders: Dict[str, Callable], carry: Iterable[str]) -> AirportSnapshot:
+        """An AirportSnapshot holding the ``carry`` sections, so a new refresher can reuse slow sources"""
+        carried = {section: self.get(section) for section in carry if section in self.sections}
+        return AirportSnapshot(
+            self.airport_code, self.tick, builders, version=self.version, carried=carried,
+            carried_built_at={section: self.built_at(section) for section in carried},
+            carried_serialized={section: self.serialized(section) for section in carried}
+        )
+
+
+def write_snapshot(path: str, snapshot: AirportSnapshot, serializer: Callable[[Any], bytes],
+                   sections: Iterable[str], version: int) -> None:
+    """Serialize every section into a new snapshot file and atomically put it at ``path``"""
+    encoded = [(name, *snapshot.serialized(name, serializer)) for name in sections]
+    offset = HEADER.size + ENTRY.size * len(encoded)
+    header = [HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded), version, snapshot.tick, snapshot.created_at)]
+    bodies = []
+    for name, body, etag in encoded:
+        header.append(ENTRY.pack(name.encode(), etag.encode(), snapshot.built_at(name) or 0.0, offset, len(body)))
+        bodies.append(body)
+        offset += len(body)
+
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(b''.join(header + bodies))
+    os.replace(temporary, path)
+
+
+class SharedSnapshotStore:
+    """Snapshots shared by every worker on a host through memory-mapped files.
+
+    One worker at a time is the refresher, elected with an exclusive
+    ``flock`` that it keeps until it exits. It builds each airport's snapshot
+    once per tick and writes every section, already serialized with its
+    ETag, to ``<directory>/<airport>.snapshot``. Every other worker maps
+    those files and serves the bytes as they are. Only the refresher calls
+    the upstream APIs or simulates, however many workers run.
+
+    When the refresher dies the kernel drops its lock, and the next worker to
+    find the data stale takes over, reusing the slow sources from the last
+    file. A worker whose refresher has fallen more than ``max_lag_ticks``
+    behind builds its own snapshot rather than serve old data.
+    """
+
+    def __init__(self, directory: str, engine, serializer: Callable[[Any], bytes],
+                 airport_codes: Iterable[str], max_lag_ticks: int = 2, publish_in_background: bool = True):
+        if fcntl is None:
+            raise RuntimeError('Shared snapshots need fcntl (POSIX file locks)')
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.engine = engine
+        self.serializer = serializer
+        self.airport_codes = list(airport_codes)
+        self.max_lag_ticks = max_lag_ticks
+        self.publish_in_background = publish_in_background
+        self.stats = {'published': 0, 'remapped': 0, 'local_fallbacks': 0, 'takeovers': 0}
+        self._mapped: Dict[str, SharedSnapshot] = {}
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._leader_file = None
+        self._leader_pid: Optional[int] = None
+        # Tick of this process's last election attempt, so followers contend at most once per tick
+        self._attempted: Optional[Tuple[int, int]] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _path(self, airport_code: str) -> str:
+        return os.path.join(self.directory, f'{airport_code}.snapshot')
+
+    # Leadership
+
+    @property
+    def is_refresher(self) -> bool:
+        # A forked child inherits the file but must win the election itself
+        return self._leader_file is not None and self._leader_pid == os.getpid()
+
+    def try_lead(self) -> bool:
+        """Become the refresher if no live process is; returns whether this process is it"""
+        with self._lock:
+            if self.is_refresher:
+                return True
+            leader_file = open(os.path.join(self.directory, 'refresher.lock'), 'a+')
+            try:
+                fcntl.flock(leader_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                leader_file.close()
+                return False
+            self._leader_file, self._leader_pid = leader_file, os.getpid()
+            self.stats['takeovers'] += 1
+            logger.info(f"Process {os.getpid()} is now the shared snapshot refresher")
+
+        if self.publish_in_background:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._publish_loop, name='snapshot-refresher', daemon=True)
+            self._thread.start()
+        return True
+
+    def ensure_started(self) -> bool:
+        """Stand for refresher once per process per tick; cheap enough to call on every request"""
+        if self.is_refresher:
+            return True
+        attempt = (os.getpid(), self.engine.current_tick())
+        if self._attempted == attempt:
+            return False
+        self._attempted = attempt
+        return self.try_lead()
+
+    def close(self) -> None:
+        """Stop publishing and give up the refresher role"""
+        self._stop_event.set()
+        if self._thread is not None and self._leader_pid == os.getpid():
+            self._thread.join(5.0)
+        self._thread = None
+        with self._lock:
+            if self._leader_file is not None:
+                self._leader_file.close()
+            self._leader_file = self._leader_pid = None
+
+    def _publish_loop(self) -> None:
+        """Refresher thread: publish every airport at the start of each tick"""
+        while not self._stop_event.is_set():
+            for airport_code in self.airport_codes:
+                try:
+                    self.publish(airport_code)
+                except Exception as e:
+                    logger.error(f"Error publishing shared snapshot for {airport_code}: {e}")
+            interval = self.engine.refresh_interval
+            self._stop_event.wait(interval - time.time() % interval)
+
+    # Writing
+
+    def publish(self, airport_code: str) -> SharedSnapshot:
+        """Build this tick's snapshot and write it for every worker (refresher only)"""
+        with self._publish_lock:
+            current = self._read(airport_code)
+            if current is not None and current.tick >= self.engine.current_tick():
+                return current
+            previous = self.engine.peek(airport_code)
+            if previous is None and current is not None:
+                previous = current.to_snapshot(self.engine.builders, self.engine.source_intervals)
+            snapshot = self.engine.refresh(airport_code, previous=previous)
+            version = (current.version if current is not None else 0) + 1
+            write_snapshot(self._path(airport_code), snapshot, self.serializer, self.engine.builders, version)
+            self.stats['published'] += 1
+            return self._read(airport_code)
+
+    # Reading
+
+    def _read(self, airport_code: str) -> Optional[SharedSnapshot]:
+        """The newest file for an airport, re-mapped only when it was replaced"""
+        path = self._path(airport_code)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        mapped = self._mapped.get(airport_code)
+        if mapped is not None and mapped.identity == (stat.st_ino, stat.st_mtime_ns):
+            return mapped
+        try:
+            mapped = SharedSnapshot(airport_code, path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error mapping shared snapshot {path}: {e}")
+            return None
+        self._mapped[airport_code] = mapped
+        self.stats['remapped'] += 1
+        return mapped
+
+    def peek(self, airport_code: str) -> Optional[SharedSnapshot]:
+        return self._read(airport_code)
+
+    def get(self, airport_code: str):
+        """The airport's current snapshot: the shared file, or a local one if the refresher is missing"""
+        if airport_code not in self.airport_codes:
+            return self.engine.get_snapshot(airport_code)
+
+        shared = self._read(airport_code)
+        tick = self.engine.current_tick()
+        if shared is not None and shared.tick >= tick:
+            return shared
+        if self.ensure_started():
+            return self.publish(airport_code)
+        # The refresher publishes at each tick boundary; serve its last file until it falls behind
+        if shared is not None and tick - shared.tick <= self.max_lag_ticks:
+            return shared
+
+        self.stats['local_fallbacks'] += 1
+        logger.warning(f"Shared snapshot for {airport_code} is missing or stale; building locally")
+        return self.engine.get_snapshot(airport_code)
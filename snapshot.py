@@ -0,0 +1,269 @@
+import contextlib
+import hashlib
+import itertools
+import threading
+import time
+import logging
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from rng import seeded_simulation
+
+logger = logging.getLogger(__name__)
+
+# Sections that make up the combined /dashboard-data payload
+DASHBOARD_SECTIONS = [
+    'passenger_flow',
+    'queue_status',
+    'baggage_tracking',
+    'flight_status',
+    'security_status',
+    'resource_utilization',
+    'staff_availability'
+]
+
+# Sections whose JSON is assembled from the already-encoded bytes of other sections
+COMPOSITE_SECTIONS = {
+    'dashboard_data': DASHBOARD_SECTIONS
+}
+
+# Sources that are slow or rate limited upstream and can be reused across several ticks
+DEFAULT_SOURCE_INTERVALS = {
+    'external_feeds': 60.0,
+    'ai_insights': 300.0
+}
+
+
+class AirportSnapshot:
+    """All datasets for one airport, each computed at most once per refresh tick.
+
+    Sections are built lazily on first access and then shared by every view
+    that needs them, so /dashboard-data, /live-conveyors, /baggage-tracking and
+    /ai-insights all agree on the same numbers within a tick. Callers must
+    treat returned sections as read-only.
+
+    With a ``seed``, each section is built with its own generator seeded from
+    (seed, airport, tick, section) and a clock fixed at ``simulated_at``. The
+    same inputs then give the same section in every process, whatever order
+    sections are built in.
+    """
+
+    def __init__(self, airport_code: str, tick: int, builders: Dict[str, Callable[['AirportSnapshot'], Any]],
+                 version: int = 0, carried: Optional[Dict[str, Any]] = None,
+                 carried_built_at: Optional[Dict[str, float]] = None,
+                 carried_serialized: Optional[Dict[str, Tuple[bytes, str]]] = None,
+                 seed: Optional[int] = None, simulated_at: Optional[float] = None):
+        self.airport_code = airport_code
+        self.tick = tick
+        self.version = version
+        self.seed = seed
+        self.simulated_at = simulated_at
+        self.created_at = time.time()
+        self._builders = builders
+        self._sections: Dict[str, Any] = dict(carried or {})
+        self._built_at: Dict[str, float] = dict(carried_built_at or {})
+        self._serialized: Dict[str, Tuple[bytes, str]] = dict(carried_serialized or {})
+        self._lock = threading.RLock()
+
+    def get(self, section: str) -> Any:
+        """Get a section, building it (and its dependencies) on first access"""
+        try:
+            return self._sections[section]
+        except KeyError:
+            pass
+
+        builder = self._builders.get(section)
+        if builder is None:
+            raise KeyError(f"Unknown snapshot section: {section}")
+
+        with self._lock:
+            if section not in self._sections:
+                if self.seed is None:
+                    self._sections[section] = builder(self)
+                else:
+                    with seeded_simulation(self.seed, self.airport_code, self.tick, section, now=self.simulated_at):
+                        self._sections[section] = builder(self)
+                self._built_at[section] = time.time()
+            return self._sections[section]
+
+    def build_all(self) -> 'AirportSnapshot':
+        """Build every section so the snapshot can be published read-only"""
+        for section in self._builders:
+            self.get(section)
+        return self
+
+    def serialized(self, section: str, serializer: Callable[[Any], bytes]) -> Tuple[bytes, str]:
+        """A section's encoded body and strong ETag (content hash), computed once per snapshot"""
+        try:
+            return self._serialized[section]
+        except KeyError:
+            pass
+
+        parts = COMPOSITE_SECTIONS.get(section)
+        data = self.get(section) if parts is None else None
+        with self._lock:
+            if section not in self._serialized:
+                if parts is None:
+                    body = serializer(data)
+                else:
+                    body = b'{' + b','.join(serializer(name) + b':' + self.serialized(name, serializer)[0]
+                                            for name in sorted(parts)) + b'}'
+                self._serialized[section] = (body, hashlib.sha1(body).hexdigest())
+            return self._serialized[section]
+
+    def built_at(self, section: str) -> Optional[float]:
+        """Wall-clock time a section was computed, if it has been"""
+        return self._built_at.get(section)
+
+    def serialized_if_built(self, section: str) -> Optional[Tuple[bytes, str]]:
+        """A section's encoded body and ETag if it has been serialized, without serializing it"""
+        return self._serialized.get(section)
+
+    @property
+    def sections(self) -> Mapping[str, Any]:
+        """Read-only view of the sections computed so far"""
+        return MappingProxyType(self._sections)
+
+
+class SnapshotEngine:
+    """Serves every airport view from a per-tick AirportSnapshot.
+
+    Without a scheduler, snapshots are built lazily by the first request in
+    each tick. Once ``background`` is set, request handlers only read the
+    snapshot most recently published by ``refresh`` and never build one
+    themselves unless none exists yet or the published one is badly stale.
+    """
+
+    def __init__(self, data_source_manager, refresh_interval: float = 5.0,
+                 airport_codes: Optional[Iterable[str]] = None,
+                 source_intervals: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.time, seed: Optional[int] = 0):
+        # Ticks are clock // refresh_interval; a tiny interval is how to rebuild on (nearly) every request
+        if refresh_interval <= 0:
+            raise ValueError(f"refresh_interval must be positive, got {refresh_interval}")
+        self.data_source_manager = data_source_manager
+        self.refresh_interval = refresh_interval
+        # Seed for simulated data; None draws from the global random module as unseeded code does
+        self.seed = seed
+        self.airport_codes = set(airport_codes) if airport_codes is not None else None
+        self.source_intervals = dict(DEFAULT_SOURCE_INTERVALS if source_intervals is None else source_intervals)
+        self.background = False
+        self.max_staleness = refresh_interval * 10
+        self._clock = clock
+        self._snapshots: Dict[str, AirportSnapshot] = {}
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self.builders = self._create_builders()
+
+    def _create_builders(self) -> Dict[str, Callable[[AirportSnapshot], Any]]:
+        """Map each section name to the function that computes it from a snapshot"""
+        dsm = self.data_source_manager
+
+        builders = {
+            'external_feeds': lambda snap: dsm.fetch_external_data(snap.airport_code),
+            'weather': lambda snap: snap.get('external_feeds')['weather'],
+            'live_conveyors': lambda snap: dsm.get_live_conveyor_data(
+                snap.airport_code, weather=snap.get('weather')),
+            'baggage_tracking': lambda snap: dsm.get_baggage_tracking_data(
+                snap.airport_code, live_data=snap.get('live_conveyors')),
+            'flight_status': lambda snap: dsm.get_flight_status_data(
+                snap.airport_code, weather=snap.get('weather'),
+                real_flights=snap.get('external_feeds')['opensky_flights']),
+            'passenger_flow': lambda snap: dsm.get_passenger_flow_data(snap.airport_code),
+            'queue_status': lambda snap: dsm.get_queue_status_data(snap.airport_code),
+            'security_status': lambda snap: dsm.get_security_status_data(snap.airport_code),
+            'resource_utilization': lambda snap: dsm.get_resource_utilization_data(snap.airport_code),
+            'staff_availability': lambda snap: dsm.get_staff_availability_data(snap.airport_code),
+            'ai_insights': lambda snap: dsm.get_ai_baggage_insights(
+                snap.airport_code,
+                conveyor_data=snap.get('live_conveyors'),
+                baggage_data=snap.get('baggage_tracking')),
+            'dashboard_data': lambda snap: {name: snap.get(name) for name in DASHBOARD_SECTIONS}
+        }
+        return builders
+
+    def current_tick(self) -> int:
+        """Index of the refresh window the clock is currently in"""
+        return int(self._clock() // self.refresh_interval)
+
+    def seeded(self, airport_code: str, scope: str):
+        """Seeded context for computing ``scope`` outside a snapshot, tied to the current tick like its sections"""
+        if self.seed is None:
+            return contextlib.nullcontext()
+        tick = self.current_tick()
+        return seeded_simulation(self.seed, airport_code, tick, scope, now=tick * self.refresh_interval)
+
+    def _new_snapshot(self, airport_code: str, tick: int, **kwargs) -> AirportSnapshot:
+        # Every section of a tick simulates the moment the tick started
+        return AirportSnapshot(airport_code, tick, self.builders, seed=self.seed,
+                               simulated_at=tick * self.refresh_interval, **kwargs)
+
+    def _next_snapshot(self, airport_code: str, previous: Optional[AirportSnapshot]) -> AirportSnapshot:
+        """Start a new snapshot, reusing slow sources whose interval has not elapsed yet"""
+        carried = {}
+        carried_built_at = {}
+        carried_serialized = {}
+        if previous is not None:
+            now = time.time()
+            for section, interval in self.source_intervals.items():
+                built_at = previous.built_at(section)
+                if built_at is not None and now - built_at < interval:
+                    carried[section] = previous.sections[section]
+                    carried_built_at[section] = built_at
+                    serialized = previous.serialized_if_built(section)
+                    if serialized is not None:
+                        carried_serialized[section] = serialized
+
+        return self._new_snapshot(airport_code, self.current_tick(),
+                                  version=next(self._versions), carried=carried,
+                                  carried_built_at=carried_built_at,
+                                  carried_serialized=carried_serialized)
+
+    def refresh(self, airport_code: str, previous: Optional[AirportSnapshot] = None) -> AirportSnapshot:
+        """Build a complete snapshot off the request path and publish it.
+
+        Slow sources are carried over from ``previous`` if given, else from the
+        airport's current snapshot.
+        """
+        with self._lock:
+            refresh_lock = self._refresh_locks.setdefault(airport_code, threading.Lock())
+
+        with refresh_lock:
+            if previous is None:
+                previous = self._snapshots.get(airport_code)
+            snapshot = self._next_snapshot(airport_code, previous).build_all()
+            self._snapshots[airport_code] = snapshot
+            return snapshot
+
+    def get_snapshot(self, airport_code: str) -> AirportSnapshot:
+        """Get the airport's current snapshot"""
+        # Unknown airports get a throwaway snapshot so arbitrary codes cannot grow the cache
+        if self.airport_codes is not None and airport_code not in self.airport_codes:
+            return self._new_snapshot(airport_code, self.current_tick())
+
+        snapshot = self._snapshots.get(airport_code)
+
+        if self.background:
+            if snapshot is None or time.time() - snapshot.created_at > self.max_staleness:
+                return self.refresh(airport_code)
+            return snapshot
+
+        tick = self.current_tick()
+        if snapshot is not None and snapshot.tick == tick:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshots.get(airport_code)
+            if snapshot is None or snapshot.tick != tick:
+                snapshot = self._next_snapshot(airport_code, snapshot)
+                self._snapshots[airport_code] = snapshot
+            return snapshot
+
+    def peek(self, airport_code: str) -> Optional[AirportSnapshot]:
+        """Get the airport's latest snapshot without building one"""
+        return self._snapshots.get(airport_code)
+
+    def get_section(self, airport_code: str, section: str) -> Any:
+        """Get one section of an airport's current snapshot"""
+        return self.get_snapshot(airport_code).get(section)
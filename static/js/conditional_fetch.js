@@ -0,0 +1,20 @@
+// Conditional GET for polled JSON endpoints: resend the last ETag and reuse the cached body on 304
+const conditionalFetchCache = new Map();
+
+async function conditionalFetch(url) {
+    const cached = conditionalFetchCache.get(url);
+    const headers = cached ? {'If-None-Match': cached.etag} : {};
+
+    // Bypass the browser cache so the 304 reaches us instead of being resolved internally
+    const response = await fetch(url, {headers, cache: 'no-store'});
+    if (response.status === 304 && cached) {
+        return cached.data;
+    }
+
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (response.ok && etag) {
+        conditionalFetchCache.set(url, {etag, data});
+    }
+    return data;
+}
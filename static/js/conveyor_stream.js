@@ -0,0 +1,94 @@
+// Live conveyor updates over Server-Sent Events: one full snapshot, then per-belt and per-bag deltas
+class ConveyorStream {
+    constructor(airportCode, onUpdate, onFallback) {
+        this.airportCode = airportCode;
+        this.onUpdate = onUpdate;
+        this.onFallback = onFallback;
+        this.data = null;
+        this.source = null;
+        this.failures = 0;
+        this.maxFailures = 3;
+        this.open();
+    }
+
+    get connected() {
+        return this.source !== null && this.data !== null;
+    }
+
+    open() {
+        if (!window.EventSource) {
+            this.fallBack();
+            return;
+        }
+
+        // EventSource resends the last event id on reconnect, so the server resumes with deltas
+        this.source = new EventSource(`/api/airport/${this.airportCode}/live-conveyors/stream`);
+
+        this.source.addEventListener('snapshot', (event) => {
+            this.failures = 0;
+            this.data = JSON.parse(event.data);
+            this.onUpdate(this.data);
+        });
+
+        this.source.addEventListener('delta', (event) => {
+            this.failures = 0;
+            if (!this.data) return;
+            this.data = ConveyorStream.applyDelta(this.data, JSON.parse(event.data));
+            this.onUpdate(this.data);
+        });
+
+        this.source.onerror = () => {
+            this.failures += 1;
+            if (this.source.readyState === EventSource.CLOSED || this.failures >= this.maxFailures) {
+                this.fallBack();
+            }
+        };
+    }
+
+    fallBack() {
+        console.warn(`Live conveyor stream unavailable for ${this.airportCode}, falling back to polling`);
+        this.close();
+        if (this.onFallback) this.onFallback();
+    }
+
+    close() {
+        if (this.source) {
+            this.source.close();
+            this.source = null;
+        }
+        this.data = null;
+    }
+
+    static applyDelta(data, delta) {
+        const updated = Object.assign({}, data, delta.summary || {});
+        const beltDeltas = delta.belts || {};
+        const removedBelts = new Set(delta.belts_removed || []);
+
+        updated.conveyor_belts = data.conveyor_belts
+            .filter(belt => !removedBelts.has(belt.belt_id))
+            .map(belt => {
+                const beltDelta = beltDeltas[belt.belt_id];
+                if (!beltDelta) return belt;
+                if (beltDelta.added) return beltDelta.added;
+
+                const updatedBelt = Object.assign({}, belt, beltDelta.changed || {});
+                const removedBags = new Set(beltDelta.bags_removed || []);
+                const changedBags = beltDelta.bags_changed || {};
+                updatedBelt.bags_on_belt = belt.bags_on_belt
+                    .filter(bag => !removedBags.has(bag.bag_id))
+                    .map(bag => changedBags[bag.bag_id] ? Object.assign({}, bag, changedBags[bag.bag_id]) : bag)
+                    .concat(beltDelta.bags_added || []);
+                return updatedBelt;
+            });
+
+        // Belts that were not in the previous payload
+        const knownBelts = new Set(data.conveyor_belts.map(belt => belt.belt_id));
+        Object.entries(beltDeltas).forEach(([beltId, beltDelta]) => {
+            if (beltDelta.added && !knownBelts.has(beltId)) {
+                updated.conveyor_belts.push(beltDelta.added);
+            }
+        });
+
+        return updated;
+    }
+}
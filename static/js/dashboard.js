@@ -4,12 +4,15 @@ class AirportDashboard {
         this.airportCode = airportCode;
         this.refreshInterval = 90000; // 90 seconds (1.5 minutes) for real-time updates
         this.conveyorData = null;
+        this.conveyorStream = null;
+        this.conveyorAnimationStarted = false;
         this.aiAlerts = [];
         this.init();
     }
 
     init() {
         this.loadAllData();
+        this.setupConveyorStream();
         this.setupAutoRefresh();
         this.setupEventListeners();
     }
@@ -27,22 +30,19 @@ class AirportDashboard {
             this.showLoading(true);
             
             // Load all dashboard data including conveyor system
-            const response = await fetch(`/api/airport/${this.airportCode}/dashboard-data`);
-            const data = await response.json();
+            const data = await conditionalFetch(`/api/airport/${this.airportCode}/dashboard-data`);
             
             if (data.error) {
                 throw new Error(data.error);
             }
             
-            // Load conveyor system data separately for enhanced features
-            const conveyorResponse = await fetch(`/api/airport/${this.airportCode}/live-conveyors`);
-            const conveyorData = await conveyorResponse.json();
-            
-            if (!conveyorData.error) {
-                this.conveyorData = conveyorData;
-                this.renderConveyorSystem();
-                this.renderAIAlerts();
-                this.renderAIInsights();
+            // Load conveyor system data separately unless it is already arriving over the live stream
+            if (!(this.conveyorStream && this.conveyorStream.connected)) {
+                const conveyorData = await conditionalFetch(`/api/airport/${this.airportCode}/live-conveyors`);
+                
+                if (!conveyorData.error) {
+                    this.updateConveyorData(conveyorData);
+                }
             }
 
             // Render all other widgets
@@ -67,6 +67,26 @@ class AirportDashboard {
         }
     }
 
+    setupConveyorStream() {
+        if (typeof ConveyorStream === 'undefined') return;
+
+        this.conveyorStream = new ConveyorStream(
+            this.airportCode,
+            (data) => this.updateConveyorData(data),
+            () => {
+                // Polling via setupAutoRefresh takes over
+                this.conveyorStream = null;
+            }
+        );
+    }
+
+    updateConveyorData(conveyorData) {
+        this.conveyorData = conveyorData;
+        this.renderConveyorSystem();
+        this.renderAIAlerts();
+        this.renderAIInsights();
+    }
+
     renderConveyorSystem() {
         if (!this.conveyorData || this.conveyorData.error) return;
 
@@ -81,8 +101,11 @@ class AirportDashboard {
         // Render system performance
         performanceContainer.innerHTML = this.generateSystemPerformanceHTML();
         
-        // Animate bags on belts
-        this.animateConveyorBelts();
+        // Animate bags on belts (one animation loop, however often the belts are re-rendered)
+        if (!this.conveyorAnimationStarted) {
+            this.conveyorAnimationStarted = true;
+            this.animateConveyorBelts();
+        }
     }
 
     generateConveyorBeltsHTML() {
@@ -606,8 +629,7 @@ class AirportDashboard {
 
     async loadFacilitiesData() {
         try {
-            const response = await fetch(`/api/airport/${this.airportCode}/facilities`);
-            const data = await response.json();
+            const data = await conditionalFetch(`/api/airport/${this.airportCode}/facilities`);
             
             if (data.error) {
                 throw new Error(data.error);
@@ -1,4 +1,11 @@
 // Staff Portal JavaScript - AI-Powered Airport Operations Management
+// Only the conveyor fields the staff portal renders, so the server skips the rest
+const STAFF_CONVEYOR_FIELDS = [
+    'belt_id', 'terminal', 'status', 'speed', 'utilization', 'health_status', 'efficiency_score',
+    'bags_on_belt', 'sensor_data', 'predicted_issues',
+    'total_belts', 'active_belts', 'total_bags_active', 'system_insights', 'ai_alerts'
+].join(',');
+
 class StaffPortal {
     constructor() {
         this.currentAirport = null;
@@ -6,6 +13,8 @@ class StaffPortal {
         this.staffData = null;
         this.complaintsData = null;
         this.aiInsightsData = null;
+        this.conveyorStream = null;
+        this.conveyorAnimationStarted = false;
         this.refreshInterval = 90000; // 90 seconds (1.5 minutes)
         this.init();
     }
@@ -49,27 +58,93 @@ class StaffPortal {
     }
 
     async loadAllAirportsData() {
-        // Load data for all airports
+        // Load data for all airports in a single batch request
         const airports = ['DEL', 'BLR', 'GOX', 'PNY', 'IXJ', 'SXR'];
+        const sections = ['staff_availability', 'complaints', 'ai_insights'];
+        const batches = [[airports, sections]];
+        // The streamed airport's conveyors arrive as live deltas, so poll conveyors for the other airports only
+        const streamedAirport = this.conveyorStream && this.conveyorStream.connected ? this.conveyorStream.airportCode : null;
+        if (streamedAirport) {
+            batches.push([airports.filter(airportCode => airportCode !== streamedAirport), ['live_conveyors']]);
+        } else {
+            sections.unshift('live_conveyors');
+        }
         
-        for (const airportCode of airports) {
-            try {
-                await this.loadAirportData(airportCode);
-            } catch (error) {
-                console.error(`Error loading data for ${airportCode}:`, error);
+        try {
+            const responses = await Promise.all(batches.map(async ([codes, batchSections]) => {
+                const response = await fetch(`/api/airports/batch?codes=${codes.join(',')}&sections=${batchSections.join(',')}`);
+                return [codes, await response.json()];
+            }));
+            
+            responses.forEach(([codes, data]) => {
+                if (data.error) {
+                    throw new Error(data.error);
+                }
+                
+                codes.forEach(airportCode => {
+                    const airportData = data.airports[airportCode];
+                    if (airportData && !airportData.error) {
+                        this.storeAirportData(airportCode, airportData);
+                    }
+                });
+            });
+        } catch (error) {
+            console.error('Error loading batch airport data, falling back to per-airport requests:', error);
+            for (const airportCode of airports) {
+                try {
+                    await this.loadAirportData(airportCode);
+                } catch (error) {
+                    console.error(`Error loading data for ${airportCode}:`, error);
+                }
             }
         }
         
         // Set default airport to DEL for initial display
         this.currentAirport = 'DEL';
         this.renderCurrentAirportData();
+        this.setupConveyorStream();
+    }
+
+    setupConveyorStream() {
+        if (this.conveyorStream || typeof ConveyorStream === 'undefined') return;
+
+        this.conveyorStream = new ConveyorStream(
+            this.currentAirport,
+            (data) => {
+                if (!this.conveyorData) this.conveyorData = {};
+                this.conveyorData[this.conveyorStream.airportCode] = data;
+                this.renderConveyorSystem();
+                this.renderAIAlerts();
+            },
+            () => {
+                // Polling via setupAutoRefresh takes over
+                this.conveyorStream = null;
+            }
+        );
+    }
+
+    storeAirportData(airportCode, data) {
+        // Keep only sections that loaded without errors
+        const targets = {
+            live_conveyors: 'conveyorData',
+            staff_availability: 'staffData',
+            complaints: 'complaintsData',
+            ai_insights: 'aiInsightsData'
+        };
+        
+        Object.entries(targets).forEach(([section, property]) => {
+            const sectionData = data[section];
+            if (sectionData && !sectionData.error) {
+                if (!this[property]) this[property] = {};
+                this[property][airportCode] = sectionData;
+            }
+        });
     }
 
     async loadAirportData(airportCode) {
         try {
             // Load conveyor system data
-            const conveyorResponse = await fetch(`/api/airport/${airportCode}/live-conveyors`);
-            const conveyorData = await conveyorResponse.json();
+            const conveyorData = await conditionalFetch(`/api/airport/${airportCode}/live-conveyors?fields=${STAFF_CONVEYOR_FIELDS}`);
             
             if (!conveyorData.error) {
                 if (!this.conveyorData) this.conveyorData = {};
@@ -77,8 +152,7 @@ class StaffPortal {
             }
 
             // Load staff availability data
-            const staffResponse = await fetch(`/api/airport/${airportCode}/staff-availability`);
-            const staffData = await staffResponse.json();
+            const staffData = await conditionalFetch(`/api/airport/${airportCode}/staff-availability`);
             
             if (!staffData.error) {
                 if (!this.staffData) this.staffData = {};
@@ -86,8 +160,7 @@ class StaffPortal {
             }
 
             // Load complaints data
-            const complaintsResponse = await fetch(`/api/airport/${airportCode}/complaints`);
-            const complaintsData = await complaintsResponse.json();
+            const complaintsData = await conditionalFetch(`/api/airport/${airportCode}/complaints`);
             
             if (!complaintsData.error) {
                 if (!this.complaintsData) this.complaintsData = {};
@@ -95,8 +168,7 @@ class StaffPortal {
             }
 
             // Load AI insights
-            const aiResponse = await fetch(`/api/airport/${airportCode}/ai-insights`);
-            const aiData = await aiResponse.json();
+            const aiData = await conditionalFetch(`/api/airport/${airportCode}/ai-insights`);
             
             if (!aiData.error) {
                 if (!this.aiInsightsData) this.aiInsightsData = {};
@@ -136,8 +208,11 @@ class StaffPortal {
 
         gridContainer.innerHTML = this.generateConveyorBeltsGrid(data.conveyor_belts);
         
-        // Animate conveyor belts
-        this.animateConveyorBelts();
+        // Animate conveyor belts (one animation loop, however often the belts are re-rendered)
+        if (!this.conveyorAnimationStarted) {
+            this.conveyorAnimationStarted = true;
+            this.animateConveyorBelts();
+        }
     }
 
     generateConveyorBeltsGrid(belts) {
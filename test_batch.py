@@ -0,0 +1,47 @@
+"""
+Tests for the cross-airport batch endpoint
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def client(offline_app):
+    with offline_app.test_client() as client:
+        yield client
+
+
+def test_batch_returns_every_requested_airport_and_section(client):
+    response = client.get('/api/airports/batch?codes=DEL,BLR,GOX,PNY,IXJ,SXR'
+                          '&sections=live_conveyors,staff_availability,complaints,ai_insights')
+    data = json.loads(response.get_data())
+
+    assert response.status_code == 200
+    assert set(data['airports']) == {'DEL', 'BLR', 'GOX', 'PNY', 'IXJ', 'SXR'}
+    for airport_data in data['airports'].values():
+        assert set(airport_data) == {'live_conveyors', 'staff_availability', 'complaints', 'ai_insights'}
+    assert data['airports']['DEL']['live_conveyors']['total_belts'] == 24
+
+
+def test_batch_matches_single_airport_routes(client):
+    data = json.loads(client.get('/api/airports/batch?codes=BLR&sections=live_conveyors').get_data())
+    single = client.get('/api/airport/BLR/live-conveyors').get_json()
+
+    assert data['airports']['BLR']['live_conveyors'] == single
+
+
+def test_batch_rejects_unknown_and_internal_sections_and_unknown_airports(client):
+    assert client.get('/api/airports/batch?sections=bogus').status_code == 400
+    assert client.get('/api/airports/batch?sections=external_feeds').status_code == 400
+    assert client.get('/api/airports/batch?sections=dashboard_data').status_code == 400
+
+    unknown = client.get('/api/airports/batch?codes=DEL,XXX&sections=weather')
+    flood = client.get('/api/airports/batch?sections=weather&codes=' + ','.join(f'X{n}' for n in range(3000)))
+    assert unknown.status_code == flood.status_code == 400
+    assert 'XXX' in unknown.get_json()['error']
+
+    data = json.loads(client.get('/api/airports/batch?codes=DEL,DEL&sections=weather').get_data())
+    assert list(data['airports']) == ['DEL']
+    assert data['airports']['DEL']['weather']['condition'] == 'Clear'
@@ -0,0 +1,143 @@
+"""
+Tests for the TTL cache and the shared weather cache in DataSourceManager
+"""
+
+import threading
+import time
+
+from caching import TTLCache
+from data_sources import DataSourceManager
+
+
+def test_fresh_entries_are_hits(fake_clock):
+    cache = TTLCache(ttl=10, clock=fake_clock)
+    calls = []
+
+    assert cache.get('DEL', lambda: calls.append(1) or 'sunny') == 'sunny'
+    fake_clock.now = 5
+    assert cache.get('DEL', lambda: calls.append(1) or 'rain') == 'sunny'
+
+    stats = cache.stats()
+    assert len(calls) == 1
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    assert stats['entries']['DEL']['age_seconds'] == 5
+
+
+def test_stale_entry_is_served_while_revalidating(fake_clock, wait_until):
+    cache = TTLCache(ttl=10, stale_ttl=20, clock=fake_clock)
+    cache.get('DEL', lambda: 'old')
+
+    fake_clock.now = 15
+    assert cache.get('DEL', lambda: 'new') == 'old'
+    assert wait_until(lambda: cache.peek('DEL') == 'new')
+
+    stats = cache.stats()
+    assert stats['stale_hits'] == 1
+    assert stats['refreshes'] == 1
+
+
+def test_expired_entry_is_reloaded_synchronously(fake_clock):
+    cache = TTLCache(ttl=10, stale_ttl=5, clock=fake_clock)
+    cache.get('DEL', lambda: 'old')
+
+    fake_clock.now = 16
+    assert cache.get('DEL', lambda: 'new') == 'new'
+    assert cache.stats()['misses'] == 2
+
+
+def test_concurrent_misses_make_one_upstream_call():
+    cache = TTLCache(ttl=60)
+    calls = []
+    release = threading.Event()
+
+    def slow_loader():
+        calls.append(1)
+        release.wait(2)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('BLR', slow_loader)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ['value'] * 8
+
+
+def test_conveyor_snapshot_fetches_weather_once_per_airport(clear_weather):
+    manager = DataSourceManager()
+    calls = []
+
+    def fake_fetch(airport_code, timeout=5):
+        calls.append(airport_code)
+        return clear_weather
+
+    manager._fetch_weather_data = fake_fetch
+
+    data = manager.get_live_conveyor_data('DEL')
+    manager.get_weather_data('DEL')
+
+    assert data['total_belts'] == 24
+    assert calls == ['DEL']
+    assert manager.get_weather_cache_stats()['hits'] >= 1
+
+
+def test_failed_weather_fetch_is_simulated_but_not_cached(fake_clock, wait_until, clear_weather):
+    manager = DataSourceManager()
+    manager.weather_cache = TTLCache(ttl=10, stale_ttl=10, clock=fake_clock, name='weather')
+    responses = [clear_weather]
+
+    def fake_fetch(airport_code, timeout=5):
+        if not responses:
+            raise ConnectionError('upstream down')
+        return responses.pop()
+
+    manager._fetch_weather_data = fake_fetch
+    first = manager.get_weather_data('DEL')
+    fake_clock.now = 15
+    assert manager.get_weather_data('DEL') == first, 'stale value is served while revalidating'
+    assert wait_until(lambda: manager.get_weather_cache_stats()['load_failures'] == 1)
+    assert manager.get_weather_data('DEL') == first, 'a failed refresh keeps the last good value'
+
+    fake_clock.now = 30
+    simulated = manager.get_weather_data('DEL')
+    stats = manager.get_weather_cache_stats()
+
+    assert simulated['condition'] in ['Clear', 'Partly Cloudy', 'Overcast', 'Rain', 'Fog']
+    assert stats['loads'] == 1 and stats['load_failures'] >= 2
+    assert stats['size'] == 0, 'simulated weather must not be cached'
+
+
+def test_bounded_cache_evicts_least_recently_used(fake_clock):
+    cache = TTLCache(ttl=10, clock=fake_clock, max_entries=2)
+    cache.get('a', lambda: 1)
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: 'reloaded')
+    cache.get('c', lambda: 3)
+
+    assert cache.keys() == ['a', 'c']
+    assert cache.stats()['evictions'] == 1
+
+    fake_clock.now = 11
+    assert cache.get('a', lambda: 'expired') == 'expired'
+    assert cache.stats(include_entries=False)['expirations'] == 1
+    assert 'entries' not in cache.stats(include_entries=False)
+
+
+def test_tracked_bags_stay_within_capacity():
+    dsm = DataSourceManager(tracked_bag_capacity=10)
+    first = dsm.track_passenger_baggage('BAG0')
+    for n in range(1, 500):
+        dsm.track_passenger_baggage(f'BAG{n}')
+        assert dsm.track_passenger_baggage('BAG0') is first
+
+    stats = dsm.get_tracked_bag_cache_stats()
+    assert stats['size'] == 10
+    assert stats['evictions'] == 490
+    assert stats['hits'] == 499
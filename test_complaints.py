@@ -0,0 +1,88 @@
+"""
+Tests for the indexed complaint store and the complaint endpoints
+"""
+
+import json
+import time
+
+import pytest
+
+from complaints import ComplaintStore
+
+
+def complaint(store, airport_code='DEL', issue_type='Lost Baggage', status='Received', priority='High'):
+    return store.add({'complaint_id': store.new_complaint_id(), 'airport_code': airport_code,
+                      'issue_type': issue_type, 'status': status, 'priority': priority})
+
+
+def test_counts_follow_inserts_and_status_changes():
+    store = ComplaintStore()
+    first = complaint(store)
+    complaint(store, issue_type='Damaged Baggage', priority='Medium')
+    complaint(store, airport_code='BLR')
+
+    store.update_status(first['complaint_id'], 'Resolved')
+    stats = store.stats('DEL')
+
+    assert stats['total'] == 2
+    assert stats['counts']['status'] == {'Received': 1, 'Resolved': 1}
+    assert stats['counts']['issue_type'] == {'Lost Baggage': 1, 'Damaged Baggage': 1}
+    assert store.stats('BLR')['total'] == 1
+    assert first['status'] == 'Received', 'stored complaints must not change under readers'
+    assert store.get(first['complaint_id'])['status'] == 'Resolved'
+    with pytest.raises(ValueError):
+        store.update_status(first['complaint_id'], 'Closed')
+
+
+def test_filtered_pages_are_newest_first_and_complete():
+    store = ComplaintStore()
+    added = [complaint(store, issue_type=('Lost Baggage', 'Delayed Baggage')[n % 2]) for n in range(25)]
+    store.update_status(added[2]['complaint_id'], 'In Progress')
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.query('DEL', {'issue_type': 'Lost Baggage', 'status': 'Received'},
+                                   cursor=cursor, limit=4)
+        seen.extend(c['complaint_id'] for c in page)
+        if cursor is None:
+            break
+
+    expected = [c['complaint_id'] for c in reversed(added)
+                if c['issue_type'] == 'Lost Baggage' and c is not added[2]]
+    assert seen == expected
+
+
+def test_aggregates_stay_fast_on_a_large_log():
+    store = ComplaintStore()
+    for n in range(100000):
+        complaint(store, airport_code=('DEL', 'BLR')[n % 2], status=('Received', 'Resolved')[n % 3 == 0])
+
+    started = time.perf_counter()
+    for _ in range(100):
+        store.stats('DEL')
+        store.query('DEL', {'status': 'Received', 'priority': 'High'}, limit=50)
+    assert (time.perf_counter() - started) / 100 < 0.005
+
+
+def test_endpoints_scope_complaints_by_airport_and_update_status(offline_app):
+    with offline_app.test_client() as client:
+        submitted = json.loads(client.post('/api/complaints/submit', json={
+            'airport_code': 'GOX', 'passenger_name': 'A', 'flight_number': 'AI1', 'bag_id': 'B1',
+            'issue_type': 'Lost Baggage', 'description': 'missing'}).data)
+        missing_airport = client.post('/api/complaints/submit', json={'passenger_name': 'A'})
+        updated = client.post(f"/api/complaints/{submitted['complaint_id']}/status", json={'status': 'Resolved'})
+        bad_status = client.post(f"/api/complaints/{submitted['complaint_id']}/status", json={'status': 'Gone'})
+        unknown = client.post('/api/complaints/COMP1/status', json={'status': 'Resolved'})
+        gox = json.loads(client.get('/api/airport/GOX/complaints?status=Resolved&limit=1').data)
+        bad_cursor = client.get('/api/airport/GOX/complaints?cursor=nope')
+        del_ids = [c['complaint_id'] for c in json.loads(client.get('/api/airport/DEL/complaints').data)['complaints']]
+
+    assert missing_airport.status_code == 400
+    assert json.loads(updated.data)['complaint']['status'] == 'Resolved'
+    assert bad_status.status_code == 400
+    assert unknown.status_code == 404
+    assert [c['complaint_id'] for c in gox['complaints']] == [submitted['complaint_id']]
+    assert gox['next_cursor'] is None
+    assert bad_cursor.status_code == 400
+    assert gox['resolved_complaints'] == 1
+    assert submitted['complaint_id'] not in del_ids
@@ -0,0 +1,45 @@
+"""
+Tests for gzip response compression and its per-ETag cache
+"""
+
+import gzip
+import json
+
+
+def test_large_responses_are_gzipped_when_accepted(offline_app):
+    with offline_app.test_client() as client:
+        plain = client.get('/api/airport/DEL/dashboard-data')
+        compressed = client.get('/api/airport/DEL/dashboard-data', headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data) / 4
+    assert compressed.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+
+def test_small_and_refused_responses_are_left_alone(offline_app):
+    with offline_app.test_client() as client:
+        small = client.get('/api/airport/DEL/weather', headers={'Accept-Encoding': 'gzip'})
+        refused = client.get('/api/airport/DEL/dashboard-data', headers={'Accept-Encoding': 'gzip;q=0'})
+
+    assert 'Content-Encoding' not in small.headers
+    assert json.loads(small.data)['condition'] == 'Clear'
+    assert 'Content-Encoding' not in refused.headers
+
+
+def test_snapshot_is_compressed_once_and_revalidates(offline_app):
+    compressor = offline_app.extensions['response_compressor']
+    headers = {'Accept-Encoding': 'gzip'}
+    with offline_app.test_client() as client:
+        first = client.get('/api/airport/DEL/live-conveyors', headers=headers)
+        second = client.get('/api/airport/DEL/live-conveyors', headers=headers)
+        revalidated = client.get('/api/airport/DEL/live-conveyors',
+                                 headers={**headers, 'If-None-Match': first.headers['ETag']})
+
+    assert first.data == second.data
+    assert compressor.stats['compressed'] == 1
+    assert compressor.stats['cache_hits'] == 1
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
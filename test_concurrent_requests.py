@@ -0,0 +1,72 @@
+"""
+Stress tests for concurrent complaint submits, bag tracking and complaint listings across request threads
+"""
+
+import json
+import threading
+
+from data_sources import DataSourceManager
+
+THREADS = 16
+REQUESTS_PER_THREAD = 40
+
+
+def run_threads(target):
+    start = threading.Barrier(THREADS)
+    errors = []
+
+    def worker(index):
+        start.wait()
+        try:
+            target(index)
+        except Exception as e:  # Surface failures from worker threads in the test
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_concurrent_submits_tracks_and_reads_stay_consistent(offline_app):
+    tracked = {}
+    counts_seen = []
+
+    def hammer(index):
+        with offline_app.test_client() as client:
+            for n in range(REQUESTS_PER_THREAD):
+                submitted = client.post('/api/complaints/submit', json={
+                    'airport_code': 'DEL', 'passenger_name': f'P{index}-{n}', 'flight_number': 'AI101',
+                    'bag_id': f'BAG{index}', 'issue_type': 'Lost Baggage', 'description': 'stress'})
+                assert json.loads(submitted.data)['success']
+
+                # Every thread asks for the same few bags, racing on their first lookup
+                bag = json.loads(client.get(f'/api/baggage/track?bag_id=SHARED{n % 5}').data)
+                tracked.setdefault(bag['bag_id'], set()).add(json.dumps(bag, sort_keys=True))
+
+                complaints = json.loads(client.get('/api/airport/DEL/complaints').data)
+                assert complaints['total_complaints'] == sum(complaints['complaint_types'].values())
+                counts_seen.append(complaints['total_complaints'])
+
+    run_threads(hammer)
+
+    store = offline_app.extensions['snapshot_engine'].data_source_manager.complaints
+    with offline_app.test_client() as client:
+        final = json.loads(client.get('/api/airport/DEL/complaints').data)
+
+    stored, _ = store.query('DEL', limit=THREADS * REQUESTS_PER_THREAD + 2)
+    submitted_names = {c['passenger_name'] for c in stored if c['description'] == 'stress'}
+    assert len(submitted_names) == THREADS * REQUESTS_PER_THREAD
+    assert final['total_complaints'] in (THREADS * REQUESTS_PER_THREAD, THREADS * REQUESTS_PER_THREAD + 2)
+    assert all(len(versions) == 1 for versions in tracked.values()), 'a bag was created more than once'
+    assert max(counts_seen) <= final['total_complaints']
+
+
+def test_seeding_happens_once_under_contention():
+    dsm = DataSourceManager()
+    run_threads(lambda index: dsm.get_complaints_data('DEL'))
+
+    complaints, _ = dsm.complaints.query('DEL')
+    assert [c['complaint_id'] for c in complaints] == ['COMP12345-DEL', 'COMP12346-DEL']
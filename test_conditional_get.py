@@ -0,0 +1,46 @@
+"""
+Tests for ETag / Last-Modified conditional GETs on the airport endpoints
+"""
+
+import time
+
+import pytest
+
+
+@pytest.mark.parametrize('path', ['dashboard-data', 'live-conveyors', 'weather', 'facilities', 'complaints'])
+def test_matching_etag_gets_304(offline_app, path):
+    with offline_app.test_client() as client:
+        first = client.get(f'/api/airport/DEL/{path}')
+        etag = first.headers['ETag']
+        revalidated = client.get(f'/api/airport/DEL/{path}', headers={'If-None-Match': etag})
+        mismatched = client.get(f'/api/airport/DEL/{path}', headers={'If-None-Match': '"stale"'})
+
+    assert first.status_code == 200
+    assert not etag.startswith('W/'), 'ETags should be strong'
+    assert 'no-cache' in first.headers['Cache-Control']
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert mismatched.status_code == 200
+    assert mismatched.data == first.data
+
+
+def test_snapshot_sections_are_serialized_once_and_carry_last_modified(offline_app):
+    engine = offline_app.extensions['snapshot_engine']
+    with offline_app.test_client() as client:
+        weather = client.get('/api/airport/DEL/weather')
+        first = client.get('/api/airport/DEL/live-conveyors')
+        second = client.get('/api/airport/DEL/live-conveyors')
+        snapshot = engine.get_snapshot('DEL')
+        body, etag = snapshot.serialized('live_conveyors', lambda data: b'unused')
+
+        # The same tick rebuilds identical content, so move to the next one
+        engine._clock = lambda: time.time() + engine.refresh_interval
+        engine.refresh('DEL')
+        refreshed = client.get('/api/airport/DEL/live-conveyors', headers={'If-None-Match': first.headers['ETag']})
+        weather_again = client.get('/api/airport/DEL/weather', headers={'If-None-Match': weather.headers['ETag']})
+
+    assert first.headers['ETag'] == second.headers['ETag'] == f'"{etag}"'
+    assert first.data == body
+    assert 'Last-Modified' in first.headers
+    assert refreshed.status_code == 200, 'a new snapshot with new content needs a new ETag'
+    assert weather_again.status_code == 304, 'unchanged content keeps its ETag across snapshots'
@@ -0,0 +1,111 @@
+"""
+Tests for the persistent, incrementally advanced conveyor simulation
+"""
+
+import random
+
+from conveyor_state import ConveyorState
+from data_sources import AIRPORT_CONVEYOR_CONFIGS, DataSourceManager
+
+
+def built_state(arrival_rate=0.0, **kwargs):
+    random.seed(4)
+    manager = DataSourceManager(bag_arrival_rate=arrival_rate, belt_status_interval=3600)
+    state = ConveyorState(manager, 'DEL', AIRPORT_CONVEYOR_CONFIGS['DEL'], bag_arrival_rate=arrival_rate,
+                          status_interval=3600, stuck_chance=0.0, **kwargs)
+    state.advance_to(1000.0)
+    return state
+
+
+def moving_bags(state):
+    return [(belt, bag) for belt in state.belts.values() for bag in belt.bags
+            if state.drive_speed(belt) > 0 and not bag.stuck and bag.position < 90]
+
+
+def test_bags_advance_by_speed_times_dt():
+    state = built_state(belt_length_m=200.0)
+    before = {bag.bag_id: bag.position for _, bag in moving_bags(state)}
+    assert before
+
+    state.advance_to(1002.0)
+
+    for belt, bag in moving_bags(state):
+        if bag.bag_id in before:
+            expected = before[bag.bag_id] + state.drive_speed(belt) * 2.0 / 200.0 * 100
+            assert abs(bag.position - expected) <= 0.11
+            assert bag.eta_seconds == round((100 - bag.position) / 100 * 200.0 / state.drive_speed(belt), 1)
+
+
+def test_advance_is_idempotent():
+    state = built_state()
+    delta = state.advance_to(1001.0)
+    snapshot = {bag.bag_id: bag.position for belt in state.belts.values() for bag in belt.bags}
+
+    assert state.advance_to(1001.0).changed_belts == []
+    assert state.advance_to(999.0).version == delta.version == state.version
+    assert snapshot == {bag.bag_id: bag.position for belt in state.belts.values() for bag in belt.bags}
+
+
+def test_bags_leave_at_the_end_of_the_belt():
+    state = built_state()
+    processed_before = sum(belt.total_processed_today for belt in state.belts.values())
+    bags_before = sum(len(belt.bags) for belt in state.belts.values())
+
+    delta = state.advance_to(1000.0 + 120)
+
+    removed = sum(len(ids) for ids in delta.removed_bags.values())
+    assert removed > 0
+    assert sum(belt.total_processed_today for belt in state.belts.values()) == processed_before + removed
+    assert sum(len(belt.bags) for belt in state.belts.values()) == bags_before - removed
+    assert all(bag.position < 100 for belt in state.belts.values() for bag in belt.bags)
+
+
+def test_new_bags_arrive_at_the_configured_rate():
+    state = built_state(arrival_rate=60.0)
+    moving = [belt for belt in state.belts.values() if state.drive_speed(belt) > 0 and len(belt.bags) < 15]
+
+    delta = state.advance_to(1001.0)
+
+    for belt in moving:
+        assert len(delta.added_bags[belt.belt_id]) == 1
+        assert belt.bags[-1].bag_id == delta.added_bags[belt.belt_id][0]
+
+
+def test_unchanged_belts_are_not_reserialized():
+    state = built_state()
+    stopped = list(state.belts)[::2]
+    for belt_id in stopped:
+        state.belts[belt_id].status = 'Maintenance'
+    first = dict(zip(state.belts, state.serialized_belts()))
+
+    delta = state.advance_to(1001.0)
+    second = dict(zip(state.belts, state.serialized_belts()))
+
+    assert not set(stopped) & set(delta.changed_belts)
+    assert all(second[belt_id] is first[belt_id] for belt_id in stopped)
+    assert all(second[belt_id] is not first[belt_id] for belt_id in delta.changed_belts)
+
+
+def test_live_conveyor_data_keeps_bags_between_calls(clear_weather):
+    manager = DataSourceManager()
+    first = manager.get_live_conveyor_data('DEL', weather=clear_weather)
+    second = manager.get_live_conveyor_data('DEL', weather=clear_weather)
+
+    first_ids = {bag['bag_id'] for belt in first['conveyor_belts'] for bag in belt['bags_on_belt']}
+    second_ids = {bag['bag_id'] for belt in second['conveyor_belts'] for bag in belt['bags_on_belt']}
+    assert first_ids & second_ids
+    assert manager.get_conveyor_state('DEL') is manager.get_conveyor_state('DEL')
+    assert manager.get_conveyor_state('XXX') is not manager.get_conveyor_state('XXX')
+
+
+def test_flight_index_follows_bags_on_and_off_the_belts():
+    state = built_state(arrival_rate=30.0)
+    for now in range(1010, 1300, 10):
+        state.advance_to(float(now))
+
+        on_belts = {}
+        for belt in state.belts.values():
+            for bag in belt.bags:
+                on_belts.setdefault(bag.flight, set()).add(id(bag))
+        assert {flight: {id(bag) for bag in state.bags_for_flight(flight)} for flight in on_belts} == on_belts
+        assert set(state._bags_by_flight) == set(on_belts)
@@ -0,0 +1,122 @@
+"""
+Tests for live conveyor delta computation and the Server-Sent Events stream
+"""
+
+import json
+import time
+
+from conveyor_stream import ConveyorDeltaFeed, diff_live_conveyors
+from data_sources import DataSourceManager
+from web_server import create_app
+
+
+def apply_delta(payload, delta):
+    """Reference client: apply a delta to a payload the way conveyor_stream.js does"""
+    payload = dict(payload, **delta.get('summary', {}))
+    belts = []
+    for belt in payload['conveyor_belts']:
+        belt_delta = delta.get('belts', {}).get(belt['belt_id'])
+        if belt['belt_id'] in delta.get('belts_removed', []):
+            continue
+        if belt_delta:
+            belt = dict(belt, **belt_delta.get('changed', {}))
+            removed = set(belt_delta.get('bags_removed', []))
+            changed = belt_delta.get('bags_changed', {})
+            belt['bags_on_belt'] = [dict(bag, **changed.get(bag['bag_id'], {}))
+                                    for bag in belt['bags_on_belt'] if bag['bag_id'] not in removed]
+            belt['bags_on_belt'] += belt_delta.get('bags_added', [])
+        belts.append(belt)
+    payload['conveyor_belts'] = belts
+    return payload
+
+
+def advanced_payloads(weather, seconds=10):
+    manager = DataSourceManager(bag_arrival_rate=30)
+    first = manager.get_live_conveyor_data('DEL', weather=weather)
+    manager.get_conveyor_state('DEL').advance_to(time.time() + seconds)
+    second = manager.get_live_conveyor_data('DEL', weather=weather)
+    return first, second
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['id'], fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_applying_delta_reproduces_the_new_payload(clear_weather):
+    first, second = advanced_payloads(clear_weather)
+    delta = diff_live_conveyors(first, second)
+
+    assert delta['belts']
+    rebuilt = apply_delta(first, delta)
+    for rebuilt_belt, belt in zip(rebuilt['conveyor_belts'], second['conveyor_belts']):
+        key = lambda bag: bag['bag_id']
+        assert sorted(rebuilt_belt['bags_on_belt'], key=key) == sorted(belt['bags_on_belt'], key=key)
+        assert dict(rebuilt_belt, bags_on_belt=None) == dict(belt, bags_on_belt=None)
+    assert dict(rebuilt, conveyor_belts=None) == dict(second, conveyor_belts=None)
+    assert len(json.dumps(delta)) < len(json.dumps(second))
+
+
+def test_feed_buffers_deltas_for_resume(clear_weather):
+    first, second = advanced_payloads(clear_weather)
+    feed = ConveyorDeltaFeed('DEL', history=1)
+
+    assert feed.update(first) == 1
+    assert feed.update(first) == 1
+    assert feed.update(second) == 2
+    assert [seq for seq, _ in feed.events_since(1)] == [2]
+    assert feed.events_since(2) == []
+    assert feed.events_since(0) is None, 'deltas before the buffer need a fresh snapshot'
+    assert feed.parse_event_id(feed.event_id(2)) == 2
+    assert feed.parse_event_id('deadbeef-2') is None
+
+
+def test_stream_sends_snapshot_then_resumes_with_deltas(offline, monkeypatch):
+    monkeypatch.setenv('CONVEYOR_STREAMING', '1')
+    monkeypatch.setenv('CONVEYOR_STREAM_MAX_SECONDS', '0')
+    app = create_app()
+    engine = app.extensions['snapshot_engine']
+
+    with app.test_client() as client:
+        response = client.get('/api/airport/DEL/live-conveyors/stream')
+        assert response.mimetype == 'text/event-stream'
+        [(snapshot_id, event, data)] = parse_events(response.get_data(as_text=True))
+        assert event == 'snapshot'
+        assert data['conveyor_belts']
+
+        engine.data_source_manager.get_conveyor_state('DEL').advance_to(time.time() + 10)
+        engine.refresh('DEL')
+        resumed = parse_events(client.get('/api/airport/DEL/live-conveyors/stream',
+                                          headers={'Last-Event-ID': snapshot_id}).get_data(as_text=True))
+        stale = parse_events(client.get('/api/airport/DEL/live-conveyors/stream',
+                                        headers={'Last-Event-ID': 'old-1'}).get_data(as_text=True))
+        missing = client.get('/api/airport/XXX/live-conveyors/stream')
+
+    assert [event for _, event, _ in resumed] == ['delta']
+    assert resumed[0][2]['seq'] == 2
+    assert [event for _, event, _ in stale] == ['snapshot']
+    assert missing.status_code == 404
+
+
+def test_streams_are_opt_in_and_capped_per_worker(offline, monkeypatch):
+    with create_app().test_client() as client:
+        assert client.get('/api/airport/DEL/live-conveyors/stream').status_code == 404
+        assert b'conveyor_stream.js' not in client.get('/dashboard/DEL').data
+
+    monkeypatch.setenv('CONVEYOR_STREAMING', '1')
+    monkeypatch.setenv('CONVEYOR_STREAM_MAX_CLIENTS', '1')
+    monkeypatch.setenv('CONVEYOR_STREAM_MAX_SECONDS', '0')
+    client = create_app().test_client()
+    assert b'conveyor_stream.js' in client.get('/dashboard/DEL').data
+    open_stream = client.get('/api/airport/DEL/live-conveyors/stream', buffered=False)
+    turned_away = client.get('/api/airport/BLR/live-conveyors/stream')
+    open_stream.close()
+    after_close = client.get('/api/airport/BLR/live-conveyors/stream')
+
+    assert open_stream.status_code == 200
+    assert turned_away.status_code == 503
+    assert after_close.status_code == 200
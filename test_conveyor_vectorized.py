@@ -0,0 +1,72 @@
+"""
+Tests for the vectorized conveyor simulation used for capacity planning
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conveyor_vectorized import (BREAKDOWN_LEVELS, RISK_LEVELS, simulate_belts, simulate_capacity,
+                                 score_belts)
+from data_sources import DataSourceManager
+from web_server import create_app
+
+ALL_SENSORS = ['weight', 'motion', 'temperature', 'vibration', 'optical']
+
+
+def test_vectorized_scores_match_per_belt_pipeline():
+    manager = DataSourceManager()
+    batch = simulate_belts(500, ALL_SENSORS, 5.0, hour=8, weather_impact='High', rng=np.random.default_rng(7))
+    scores = score_belts(batch)
+
+    for i in range(len(batch)):
+        belt = batch.to_belt(i)
+        efficiency = manager._calculate_belt_efficiency(belt.bags, belt.sensors, belt.status)
+        delay_risk = manager._calculate_delay_risk(belt.bags, belt.sensors)
+        breakdown = manager._calculate_breakdown_probability(belt.sensors)
+
+        # Means are summed in a different order, so allow for one rounding step
+        assert abs(efficiency - scores.efficiency_score[i]) <= 0.11
+        assert delay_risk['risk_score'] == pytest.approx(scores.delay_risk_score[i])
+        assert delay_risk['risk_level'] == RISK_LEVELS[scores.risk_level[i]]
+        assert breakdown['score'] == scores.breakdown_score[i]
+        assert breakdown['probability'] == BREAKDOWN_LEVELS[scores.breakdown_level[i]]
+        assert len(manager._predict_belt_issues(belt.sensors, belt.bags)) == scores.issue_count[i]
+
+
+def test_bags_respect_belt_status_and_capacity():
+    batch = simulate_belts(2000, ['weight', 'motion'], 3.5, hour=23, rng=np.random.default_rng(1))
+    idle = ~np.isin(batch.status, (0, 3, 4))
+
+    assert batch.current_temp is None and batch.vibration_level is None
+    assert (batch.bag_count[idle] == 0).all()
+    assert (batch.utilization[idle] == 0).all()
+    assert (batch.bag_count <= 15).all()
+    assert not batch.bag_stuck[~batch.bag_mask].any()
+
+
+def test_seeded_simulation_is_reproducible():
+    first = simulate_capacity(1000, ALL_SENSORS, 5.0, hour=12, seed=3)
+    second = simulate_capacity(1000, ALL_SENSORS, 5.0, hour=12, seed=3)
+    first.pop('simulation_ms')
+    second.pop('simulation_ms')
+
+    assert first == second
+    assert sum(first['status_counts'].values()) == 1000
+
+
+def test_capacity_simulation_route(offline):
+    app = create_app()
+
+    with app.test_client() as client:
+        response = client.get('/api/airport/BLR/capacity-simulation?belts=5000&hour=8&seed=1')
+        too_many = client.get('/api/airport/BLR/capacity-simulation?belts=1000000')
+        negative_seed = client.get('/api/airport/BLR/capacity-simulation?seed=-1')
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['simulated_belts'] == 5000
+    assert data['configured_belts'] == 11
+    assert data['hour'] == 8
+    assert too_many.status_code == 400
+    assert negative_seed.status_code == 400
@@ -0,0 +1,55 @@
+"""
+Tests for looking up every bag on a flight
+"""
+
+import json
+import time
+
+from data_sources import DataSourceManager
+from web_server import create_app
+
+
+def test_flight_bags_include_conveyor_positions_and_tracked_bags(offline):
+    app = create_app()
+    dsm = app.extensions['snapshot_engine'].data_source_manager
+    with app.test_client() as client:
+        client.get('/api/airport/DEL/live-conveyors')
+        belt_bag = next(bag for belt in dsm.get_conveyor_state('DEL').belts.values() for bag in belt.bags)
+        client.get(f'/api/baggage/track?bag_id=TRK1&flight_number={belt_bag.flight}')
+        data = json.loads(client.get(f'/api/flights/{belt_bag.flight}/bags').data)
+        via_track = json.loads(client.get(f'/api/baggage/track?flight_number={belt_bag.flight}').data)
+
+    on_belt = [bag for bag in data['conveyor_bags'] if bag['bag_id'] == belt_bag.bag_id]
+    assert on_belt and on_belt[0]['belt_id'] == belt_bag.belt_id
+    assert on_belt[0]['position'] == belt_bag.position
+    assert on_belt[0]['airport_code'] == 'DEL'
+    assert [bag['bag_id'] for bag in data['tracked_bags']] == ['TRK1']
+    assert all(bag['flight'] == belt_bag.flight for bag in data['conveyor_bags'])
+    assert via_track == data
+
+
+def test_evicted_bags_leave_the_index_and_lookups_stay_fast():
+    dsm = DataSourceManager(tracked_bag_capacity=20000)
+    for n in range(30000):
+        dsm.track_passenger_baggage(f'BAG{n}', flight_number=f'AI{n % 300}')
+
+    started = time.perf_counter()
+    for n in range(100):
+        data = dsm.get_flight_bags(f'AI{n}')
+    elapsed = (time.perf_counter() - started) / 100
+
+    indexed = sum(len(bag_ids) for bag_ids in dsm._tracked_bags_by_flight.values())
+    assert indexed == 20000
+    assert len(data['tracked_bags']) == len([n for n in range(10000, 30000) if n % 300 == 99])
+    assert elapsed < 0.005
+
+
+def test_invalidated_bags_leave_the_index():
+    dsm = DataSourceManager()
+    for n in range(4):
+        dsm.track_passenger_baggage(f'BAG{n}', flight_number='AI7')
+
+    dsm.sample_baggage.invalidate('BAG0')
+    assert dsm._tracked_bags_by_flight['AI7'] == {'BAG1', 'BAG2', 'BAG3'}
+    dsm.sample_baggage.invalidate()
+    assert not dsm._tracked_bags_by_flight.get('AI7')
@@ -0,0 +1,70 @@
+"""
+Tests for the opt-in per-stage timing instrumentation
+"""
+
+import json
+import threading
+
+from instrumentation import Histogram, Instrumentation, RequestTimings, _current_timings
+from upstream import Deadline, fan_out
+from web_server import create_app
+
+
+def profiled_app(monkeypatch):
+    monkeypatch.setenv('PROFILING', '1')
+    return create_app()
+
+
+def test_histogram_buckets_are_upper_bounds():
+    histogram = Histogram((1, 10))
+    for ms in (0.5, 1, 3, 50):
+        histogram.observe(ms)
+    assert histogram.to_dict() == {'count': 4, 'sum_ms': 54.5, 'buckets': {'1': 2, '10': 1, '+Inf': 1}}
+
+
+def test_responses_carry_server_timing_for_data_source_stages(offline, monkeypatch):
+    app = profiled_app(monkeypatch)
+    with app.test_client() as client:
+        response = client.get('/api/airport/DEL/live-conveyors')
+        stages = json.loads(client.get('/api/debug/timings').data)['stages']
+
+    header = response.headers['Server-Timing']
+    assert 'DataSourceManager.get_live_conveyor_data;dur=' in header
+    assert header.split(', ')[-1].startswith('total;dur=')
+    assert stages['request.get_live_conveyors']['count'] == 1
+    assert stages['DataSourceManager.get_live_conveyor_data']['count'] >= 1
+    assert stages['DataSourceManager._fetch_weather_data']['count'] >= 1
+
+
+def test_fan_out_tasks_report_into_the_callers_request():
+    instrumentation = Instrumentation()
+    token = _current_timings.set(RequestTimings())
+    try:
+        worker = instrumentation.timed('worker', lambda: threading.current_thread().name)
+        results = fan_out({'a': worker, 'b': worker}, Deadline(5))
+        timings = _current_timings.get()
+    finally:
+        _current_timings.reset(token)
+
+    assert all(name != threading.current_thread().name for name in results.values())
+    assert timings.stages['worker'][0] == 2
+
+
+def test_profile_endpoint_returns_cprofile_stats(offline, monkeypatch):
+    app = profiled_app(monkeypatch)
+    with app.test_client() as client:
+        response = client.get('/api/debug/profile?path=/api/airport/BLR/weather&sort=tottime&limit=5')
+        rejected = client.get('/api/debug/profile?path=/api/debug/timings')
+
+    text = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert text.startswith('GET /api/airport/BLR/weather -> 200')
+    assert 'function calls' in text
+    assert rejected.status_code == 400
+
+
+def test_debug_endpoints_are_off_by_default(monkeypatch):
+    monkeypatch.delenv('PROFILING', raising=False)
+    app = create_app()
+    assert 'instrumentation' not in app.extensions
+    assert 'get_stage_timings' not in app.view_functions
@@ -0,0 +1,57 @@
+"""
+Tests for the orjson JSON provider, static chart fragments and composite snapshot bodies
+"""
+
+import datetime
+import json
+
+import pytest
+
+from chart_layouts import PASSENGER_FLOW_LAYOUT, StaticJSON
+from json_provider import JSONProvider, OrjsonProvider, orjson
+from web_server import create_app
+
+
+def test_static_blocks_are_read_only():
+    with pytest.raises(TypeError):
+        PASSENGER_FLOW_LAYOUT['title'] = 'changed'
+    with pytest.raises(TypeError):
+        PASSENGER_FLOW_LAYOUT['xaxis'].update(title='changed')
+
+    block = StaticJSON({'colors': ['#fff']})
+    encoded = block.encoded(lambda data: json.dumps(data).encode())
+    assert block.encoded(lambda data: b'not called again') is encoded
+
+
+@pytest.mark.skipif(orjson is None, reason='orjson not installed')
+def test_orjson_provider_matches_default_provider(offline):
+    app = create_app()
+    assert isinstance(app.json, OrjsonProvider)
+    stdlib = JSONProvider(app)
+    payload = app.extensions['snapshot_engine'].get_section('DEL', 'dashboard_data')
+    extras = {'when': datetime.datetime(2025, 1, 2, 3, 4, 5), 'nested': {1: 'non-string key'}}
+
+    assert json.loads(app.json.dumps(payload)) == json.loads(stdlib.dumps(payload))
+    assert json.loads(app.json.dumps(extras)) == json.loads(stdlib.dumps(extras))
+    assert app.json.loads(app.json.dumps_bytes(payload)) == json.loads(stdlib.dumps(payload))
+
+
+def test_stdlib_provider_can_be_selected(offline, monkeypatch):
+    monkeypatch.setenv('JSON_PROVIDER', 'stdlib')
+    app = create_app()
+
+    assert type(app.json) is JSONProvider
+    with app.test_client() as client:
+        assert client.get('/api/airport/DEL/passenger-flow').get_json()['layout']['title'] == '24-Hour Passenger Flow'
+
+
+def test_dashboard_body_is_assembled_from_section_bytes(offline):
+    app = create_app()
+    snapshot = app.extensions['snapshot_engine'].get_snapshot('DEL')
+
+    with app.test_client() as client:
+        dashboard = client.get('/api/airport/DEL/dashboard-data').get_json()
+    body, _ = snapshot.serialized('passenger_flow', app.json.dumps_bytes)
+
+    assert body in snapshot.serialized('dashboard_data', app.json.dumps_bytes)[0]
+    assert dashboard == json.loads(JSONProvider(app).dumps(snapshot.get('dashboard_data')))
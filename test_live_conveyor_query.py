@@ -0,0 +1,71 @@
+"""
+Tests for field projection, filtering and paging on /live-conveyors
+"""
+
+import json
+
+from data_sources import DataSourceManager
+
+
+def test_fields_skip_unrequested_work(offline_app, monkeypatch):
+    def not_expected(*args, **kwargs):
+        raise AssertionError('computed a section that was not requested')
+
+    with offline_app.test_client() as client:
+        client.get('/api/airport/DEL/weather')
+        monkeypatch.setattr(DataSourceManager, '_generate_system_insights', not_expected)
+        monkeypatch.setattr(DataSourceManager, '_generate_ai_alerts', not_expected)
+        monkeypatch.setattr('models.Bag.to_dict', not_expected)
+        response = client.get('/api/airport/DEL/live-conveyors?fields=status,utilization,total_belts')
+
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert set(data) == {'conveyor_belts', 'total_belts', 'airport_code', 'state_version', 'last_update'}
+    assert data['total_belts'] == 24
+    assert all(set(belt) == {'belt_id', 'status', 'utilization'} for belt in data['conveyor_belts'])
+
+
+def test_filters_and_cursor_paging_cover_every_matching_belt_once(offline_app):
+    seen = []
+    cursor = None
+    with offline_app.test_client() as client:
+        while True:
+            url = '/api/airport/DEL/live-conveyors?terminal=T3&fields=terminal&limit=4'
+            data = json.loads(client.get(url + (f'&cursor={cursor}' if cursor else '')).data)
+            assert len(data['conveyor_belts']) <= 4
+            seen.extend(belt['belt_id'] for belt in data['conveyor_belts'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+
+    assert seen == [f'T3-Belt-{n:02d}' for n in range(1, 11)]
+
+
+def test_unknown_fields_and_bad_limits_are_rejected(offline_app):
+    with offline_app.test_client() as client:
+        unknown = client.get('/api/airport/DEL/live-conveyors?fields=status,colour')
+        too_big = client.get('/api/airport/DEL/live-conveyors?limit=100000')
+
+    assert unknown.status_code == 400
+    assert 'colour' in json.loads(unknown.data)['error']
+    assert too_big.status_code == 400
+
+
+def test_full_projection_matches_unprojected_belts(clear_weather):
+    dsm = DataSourceManager()
+    projected = dsm.get_live_conveyor_data('GOX', weather=clear_weather, fields={'conveyor_belts'})
+    state = dsm.get_conveyor_state('GOX')
+
+    assert projected['conveyor_belts'] == state.serialized_belts()
+    assert 'ai_alerts' not in projected
+
+
+def test_a_filter_matching_no_belts_gets_neutral_insights(offline_app):
+    with offline_app.test_client() as client:
+        response = client.get('/api/airport/DEL/live-conveyors?status=Nonexistent')
+
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert data['conveyor_belts'] == [] and data['total_belts'] == 0
+    assert 'error' not in data['system_insights']
+    assert data['system_insights']['active_belts_ratio'] == 0.0
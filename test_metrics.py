@@ -0,0 +1,68 @@
+"""
+Tests for the Prometheus metrics registry and the /metrics endpoint
+"""
+
+import re
+
+from data_sources import DataSourceManager
+from metrics import (MetricsRegistry, SIMULATION_FALLBACKS, UPSTREAM_CALLS, UPSTREAM_DURATION,
+                     render_families)
+from test_upstream import StubUpstreamServer
+from web_server import create_app
+
+
+def sample(text, name, **labels):
+    """Value of one exposition sample, or None"""
+    label_text = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = '^' + re.escape(f'{name}{{{label_text}}}' if labels else name) + r' (\S+)$'
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram('test_seconds', 'Test latency', ('route',), buckets=(0.1, 1))
+    for seconds in (0.05, 0.5, 0.7, 3):
+        latency.observe(seconds, route='/a')
+    text = render_families(registry.collect())
+
+    assert '# TYPE test_seconds histogram' in text
+    assert sample(text, 'test_seconds_bucket', route='/a', le='0.1') == 1
+    assert sample(text, 'test_seconds_bucket', route='/a', le='1.0') == 3
+    assert sample(text, 'test_seconds_bucket', route='/a', le='+Inf') == 4
+    assert sample(text, 'test_seconds_count', route='/a') == 4
+    assert registry.histogram('test_seconds', 'Test latency', ('route',)) is latency
+
+
+def test_upstream_calls_and_fallbacks_are_counted():
+    with StubUpstreamServer(status=503) as stub:
+        dsm = DataSourceManager(opensky_url=f'{stub.url}/api/states/all', weather_url=f'{stub.url}/v1/forecast')
+        calls = UPSTREAM_CALLS.value(upstream='open_meteo', outcome='http_5xx')
+        observed = UPSTREAM_DURATION.value(upstream='open_meteo')['count']
+        fallbacks = SIMULATION_FALLBACKS.value(source='weather', reason='http_status')
+        dsm.get_weather_data('DEL')
+
+    assert UPSTREAM_CALLS.value(upstream='open_meteo', outcome='http_5xx') == calls + 1
+    assert UPSTREAM_DURATION.value(upstream='open_meteo')['count'] == observed + 1
+    assert SIMULATION_FALLBACKS.value(source='weather', reason='http_status') == fallbacks + 1
+
+
+def test_metrics_endpoint_reports_routes_caches_and_circuits(offline):
+    app = create_app()
+    with app.test_client() as client:
+        route = '/api/airport/<airport_code>/live-conveyors'
+        before = sample(client.get('/metrics').get_data(as_text=True), 'airport_http_request_duration_seconds_count',
+                        method='GET', route=route, status='200') or 0
+        client.get('/api/airport/DEL/live-conveyors')
+        client.get('/api/airport/BLR/live-conveyors', headers={'Accept-Encoding': 'gzip'})
+        response = client.get('/metrics')
+
+    text = response.get_data(as_text=True)
+    assert response.mimetype == 'text/plain'
+    assert sample(text, 'airport_http_request_duration_seconds_count',
+                  method='GET', route=route, status='200') == before + 2
+    assert sample(text, 'airport_http_response_size_bytes_count', method='GET', route=route) >= 2
+    assert sample(text, 'airport_http_requests_in_flight') == 1
+    assert sample(text, 'airport_cache_entries', cache='weather') == 2
+    assert sample(text, 'airport_upstream_circuit_state', upstream='opensky', state='closed') == 1
+    assert sample(text, 'airport_snapshot_age_seconds', airport='DEL') is not None
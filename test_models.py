@@ -0,0 +1,45 @@
+"""
+Tests for the slotted conveyor record models and their JSON serialization
+"""
+
+from data_sources import DataSourceManager
+from models import Bag, Issue, SensorReading
+
+BELT_KEYS = ['belt_id', 'terminal', 'status', 'speed', 'max_speed', 'bags_on_belt', 'total_processed_today',
+             'last_maintenance', 'utilization', 'sensor_data', 'ai_insights', 'efficiency_score',
+             'predicted_issues', 'health_status', 'delay_risk', 'breakdown_probability', 'last_updated',
+             'belt_counter']
+BAG_KEYS = ['bag_id', 'position', 'flight', 'destination', 'status', 'priority', 'weight', 'eta_seconds',
+            'stuck_status', 'last_movement', 'tracking_history']
+
+
+def test_records_are_slotted():
+    bag = Bag('BAG10000', 'T1-Belt-01', 50.0, 'AI101', 'Mumbai', 'Normal', 20, 10.0, False, '12:00:00')
+    assert not hasattr(bag, '__dict__')
+    assert not hasattr(SensorReading(('weight',), 1.0), '__dict__')
+    assert not hasattr(Issue('Overload Warning', 'Medium', 'x', 90, 'y'), '__dict__')
+
+
+def test_bag_serializes_to_existing_shape():
+    bag = Bag('BAG10000', 'T1-Belt-01', 50.0, 'AI101', 'Mumbai', 'Normal', 20, 10.0, False, '12:00:00')
+    data = bag.to_dict()
+
+    assert list(data) == BAG_KEYS
+    assert data['weight'] == '20 kg'
+    assert data['tracking_history'][-1] == {'time': '15:00', 'status': 'On Conveyor', 'location': 'T1-Belt-01'}
+
+
+def test_live_conveyor_payload_keeps_its_json_shape():
+    manager = DataSourceManager()
+    manager._fetch_weather_data = lambda airport_code, timeout=5: {'impact': 'Low', 'condition': 'Clear'}
+    data = manager.get_live_conveyor_data('DEL')
+
+    for belt in data['conveyor_belts']:
+        assert list(belt) == BELT_KEYS
+        assert list(belt['sensor_data']) == ['weight_sensor', 'motion_sensor', 'temperature_sensor',
+                                             'vibration_sensor', 'optical_sensor', 'current_speed']
+        for bag in belt['bags_on_belt']:
+            assert list(bag) == BAG_KEYS
+        for issue in belt['predicted_issues']:
+            assert set(issue) == {'type', 'severity', 'description', 'probability', 'recommended_action'}
+    assert data['total_bags_active'] == sum(len(b['bags_on_belt']) for b in data['conveyor_belts'])
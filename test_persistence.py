@@ -0,0 +1,163 @@
+"""
+Tests for the SQLite store shared by worker processes
+"""
+
+import sqlite3
+import time
+
+from data_sources import DataSourceManager
+from persistence import SQLiteStore
+
+
+def submit(dsm, n, airport_code='DEL'):
+    return dsm.submit_baggage_complaint(f'P{n}', 'AI101', f'BAG{n}', 'Lost Baggage', 'missing', airport_code)
+
+
+def test_workers_sharing_a_database_see_each_others_complaints(tmp_path):
+    path = str(tmp_path / 'airport.db')
+    worker_a = DataSourceManager(db_path=path)
+    worker_b = DataSourceManager(db_path=path)
+
+    submitted = submit(worker_a, 1)
+    worker_a.db.flush()
+    seen_by_b = worker_b.get_complaints_data('DEL')
+    worker_b.update_complaint_status(submitted['complaint_id'], 'Resolved')
+    worker_b.db.flush()
+    seen_by_a = worker_a.get_complaints_data('DEL', status='Resolved')
+
+    assert submitted['complaint_id'] in [c['complaint_id'] for c in seen_by_b['complaints']]
+    assert seen_by_b['total_complaints'] == 1
+    assert [c['complaint_id'] for c in seen_by_a['complaints']] == [submitted['complaint_id']]
+    assert worker_a.complaints.get(submitted['complaint_id'])['status'] == 'Resolved'
+
+    worker_b.get_complaints_data('BLR')
+    worker_b.db.flush()
+    assert worker_a.get_complaints_data('BLR')['total_complaints'] == 2, 'samples must be seeded once'
+
+
+def test_complaint_cursors_page_the_same_in_every_worker(tmp_path):
+    path = str(tmp_path / 'airport.db')
+    workers = [DataSourceManager(db_path=path), DataSourceManager(db_path=path)]
+    # Each worker stores its own complaints first and the other's when it syncs, in a different order
+    submitted = [submit(workers[n % 2], n)['complaint_id'] for n in range(12)]
+    for worker in workers:
+        worker.db.flush()
+
+    seen, cursor, requests = [], None, 0
+    while True:
+        params = {'cursor': cursor} if cursor else {}
+        page = workers[requests % 2].get_complaints_data('DEL', issue_type='Lost Baggage', limit=5, **params)
+        seen.extend(c['complaint_id'] for c in page['complaints'])
+        cursor, requests = page['next_cursor'], requests + 1
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(submitted)
+    assert len(seen) == len(set(seen))
+    assert requests == 3
+
+
+def test_sync_keeps_a_newer_local_status_that_is_still_queued(tmp_path):
+    path = str(tmp_path / 'airport.db')
+    dsm = DataSourceManager(db_path=path)
+    submitted = submit(dsm, 1)
+    dsm.db.flush()
+
+    # Another connection holds the write lock, so the status change stays queued through the sync
+    other_worker = sqlite3.connect(path, isolation_level=None)
+    other_worker.execute('BEGIN IMMEDIATE')
+    dsm.update_complaint_status(submitted['complaint_id'], 'Resolved')
+    synced = dsm.get_complaints_data('DEL')
+    other_worker.execute('COMMIT')
+    dsm.db.flush()
+
+    assert synced['resolved_complaints'] == 1
+    assert dsm.complaints.get(submitted['complaint_id'])['status'] == 'Resolved'
+    assert dsm.complaints.get(submitted['complaint_id'])['revision'] == 1
+    dsm.get_complaints_data('DEL')
+    assert dsm.complaints.get(submitted['complaint_id'])['status'] == 'Resolved'
+
+
+def test_complaints_and_tracked_bags_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'airport.db')
+    before = DataSourceManager(db_path=path)
+    submitted = submit(before, 1, airport_code='GOX')
+    bag = before.track_passenger_baggage('BAG42')
+    before.db.flush()
+
+    after = DataSourceManager(db_path=path)
+    complaints = after.get_complaints_data('GOX')
+
+    assert [c['complaint_id'] for c in complaints['complaints']] == [submitted['complaint_id']]
+    assert after.track_passenger_baggage('BAG42') == bag
+    assert after.submit_baggage_complaint('P2', 'AI1', 'B2', 'Lost Baggage', '', 'GOX')['complaint_id'] \
+        != submitted['complaint_id']
+
+
+def test_ids_are_unique_across_workers(tmp_path):
+    path = str(tmp_path / 'airport.db')
+    allocators = [SQLiteStore(path).id_allocator('complaint', 100000, block_size=10) for _ in range(3)]
+    ids = [allocate() for _ in range(25) for allocate in allocators]
+
+    assert len(set(ids)) == len(ids)
+
+
+def test_writes_survive_a_database_locked_past_the_busy_timeout(tmp_path, wait_until):
+    path = str(tmp_path / 'airport.db')
+    store = SQLiteStore(path, busy_timeout=0.05, retry_delay=0.01)
+    other_worker = sqlite3.connect(path, isolation_level=None)
+    other_worker.execute('BEGIN IMMEDIATE')
+
+    store.save_complaint({'complaint_id': 'COMP1', 'airport_code': 'DEL', 'status': 'Received'})
+    assert wait_until(lambda: store.stats['retries'] >= 2)
+    assert store.complaint_changes(0) == []
+    other_worker.execute('COMMIT')
+
+    assert store.flush(timeout=5)
+    assert [complaint['complaint_id'] for _, complaint in store.complaint_changes(0)] == ['COMP1']
+    assert store.stats['errors'] == 0
+
+
+def test_a_permanent_error_drops_only_the_failing_writes(tmp_path):
+    path = str(tmp_path / 'airport.db')
+    store = SQLiteStore(path, retry_delay=0.01)
+    sqlite3.connect(path, isolation_level=None).execute('DROP TABLE tracked_bags')
+
+    store.save_tracked_bag({'bag_id': 'BAG1', 'flight_number': 'AI101'})
+    store.save_complaint({'complaint_id': 'COMP1', 'airport_code': 'DEL', 'status': 'Received'})
+
+    assert store.flush(timeout=5)
+    assert [complaint['complaint_id'] for _, complaint in store.complaint_changes(0)] == ['COMP1']
+    assert store.stats['retries'] == 0
+    assert store.stats['errors'] >= 1
+
+
+def test_a_database_that_stays_locked_is_retried_a_bounded_number_of_times(tmp_path):
+    path = str(tmp_path / 'airport.db')
+    store = SQLiteStore(path, busy_timeout=0.01, retry_delay=0.001, max_retries=3)
+    other_worker = sqlite3.connect(path, isolation_level=None)
+    other_worker.execute('BEGIN IMMEDIATE')
+
+    store.save_complaint({'complaint_id': 'COMP1', 'airport_code': 'DEL', 'status': 'Received'})
+
+    assert store.flush(timeout=5)
+    assert store.stats['retries'] == 3
+    assert store.stats['errors'] == 1
+    other_worker.execute('ROLLBACK')
+
+
+def test_bursts_of_submits_are_batched_and_stay_fast(tmp_path):
+    dsm = DataSourceManager(db_path=str(tmp_path / 'airport.db'))
+    submit(dsm, 0)
+    dsm.db.flush()
+
+    started = time.perf_counter()
+    for n in range(1, 2001):
+        submit(dsm, n)
+    per_submit = (time.perf_counter() - started) / 2000
+    dsm.db.flush()
+
+    assert per_submit < 0.001
+    assert dsm.db.stats['writes'] == 2001
+    assert dsm.db.stats['commits'] < 200
+    assert len(dsm.db.complaint_changes(0, limit=5000)) == 2001
@@ -0,0 +1,66 @@
+"""
+Tests for the background snapshot scheduler
+"""
+
+import time
+
+import pytest
+
+from scheduler import SnapshotScheduler, parse_source_intervals
+from snapshot import SnapshotEngine
+
+
+def test_refresh_publishes_complete_read_only_snapshot(offline_manager):
+    engine = SnapshotEngine(offline_manager(), airport_codes=['DEL'])
+    snapshot = engine.refresh('DEL')
+
+    assert set(snapshot.sections) == set(engine.builders)
+    with pytest.raises(TypeError):
+        snapshot.sections['weather'] = {}
+
+
+def test_background_mode_reads_published_snapshot_only(offline_manager):
+    manager = offline_manager()
+    engine = SnapshotEngine(manager, airport_codes=['DEL'])
+    published = engine.refresh('DEL')
+    engine.background = True
+
+    def fail(*args, **kwargs):
+        raise AssertionError('request path must not rebuild snapshots')
+
+    manager.get_live_conveyor_data = fail
+    assert engine.get_snapshot('DEL') is published
+    assert engine.get_section('DEL', 'live_conveyors') is published.sections['live_conveyors']
+
+
+def test_slow_sources_are_carried_over_between_refreshes(offline_manager):
+    opensky_calls = []
+    engine = SnapshotEngine(offline_manager(opensky_calls), airport_codes=['DEL'],
+                            source_intervals={'external_feeds': 60})
+    first = engine.refresh('DEL')
+    second = engine.refresh('DEL')
+
+    assert opensky_calls == ['DEL']
+    assert second.version > first.version
+    assert second.sections['external_feeds'] is first.sections['external_feeds']
+    assert second.sections['live_conveyors'] is not first.sections['live_conveyors']
+
+
+def test_scheduler_refreshes_every_airport_in_background(offline_manager):
+    engine = SnapshotEngine(offline_manager(), refresh_interval=0.05, airport_codes=['DEL', 'GOX'])
+    scheduler = SnapshotScheduler(engine, ['DEL', 'GOX'], jitter=0.2)
+    scheduler.start()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and scheduler.stats['refreshes'] < 6:
+            time.sleep(0.02)
+        assert engine.background
+        assert engine.peek('DEL') is not None and engine.peek('GOX') is not None
+        assert scheduler.stats['refreshes'] >= 6
+    finally:
+        scheduler.stop()
+    assert not engine.background
+
+
+def test_parse_source_intervals():
+    assert parse_source_intervals('weather=300, flight_status=30,') == {'weather': 300.0, 'flight_status': 30.0}
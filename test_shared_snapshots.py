@@ -0,0 +1,114 @@
+"""
+Tests for snapshots shared across worker processes through memory-mapped files
+"""
+
+import os
+import time
+
+import pytest
+from flask import Flask
+
+from data_sources import DataSourceManager
+from json_provider import create_json_provider
+from shared_snapshots import SharedSnapshot, SharedSnapshotStore
+from snapshot import SnapshotEngine
+from web_server import create_app
+
+
+@pytest.fixture
+def upstream_calls(monkeypatch, clear_weather):
+    calls = []
+
+    def fetch_weather(self, code, timeout=5):
+        calls.append((id(self), code))
+        return dict(clear_weather)
+
+    monkeypatch.setattr(DataSourceManager, '_fetch_weather_data', fetch_weather)
+    monkeypatch.setattr(DataSourceManager, 'get_opensky_flights', lambda self, code, timeout=10: [])
+    return calls
+
+
+@pytest.fixture
+def worker(tmp_path):
+    """Factory for one simulated worker process: its own manager, engine and store on a shared directory"""
+    serializer = create_json_provider(Flask(__name__)).dumps_bytes
+    stores = []
+
+    def make():
+        engine = SnapshotEngine(DataSourceManager(), refresh_interval=3600, airport_codes=['DEL'])
+        store = SharedSnapshotStore(str(tmp_path), engine, serializer, ['DEL'], publish_in_background=False)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def test_followers_serve_the_refreshers_bytes_without_building(worker, upstream_calls):
+    refresher, follower = worker(), worker()
+
+    published = refresher.get('DEL')
+    shared = follower.get('DEL')
+
+    assert refresher.is_refresher and not follower.is_refresher
+    assert isinstance(shared, SharedSnapshot)
+    assert follower.engine.peek('DEL') is None
+    assert {manager for manager, _ in upstream_calls} == {id(refresher.engine.data_source_manager)}
+    own = refresher.engine.peek('DEL')
+    for section in refresher.engine.builders:
+        assert shared.serialized(section) == own.serialized(section, follower.serializer)
+    assert shared.get('weather') == own.get('weather')
+    assert published.version == shared.version == 1
+
+
+def test_next_worker_takes_over_and_reuses_slow_sources(worker, upstream_calls):
+    refresher, follower = worker(), worker()
+    refresher.get('DEL')
+    refresher.close()
+    follower.engine._clock = lambda: time.time() + follower.engine.refresh_interval
+
+    snapshot = follower.get('DEL')
+
+    assert follower.is_refresher
+    assert snapshot.tick == refresher.engine.current_tick() + 1
+    assert snapshot.version == 2
+    # external_feeds was carried over from the file, so the new refresher did not call upstream
+    assert len(upstream_calls) == 1
+    assert snapshot.serialized('external_feeds') == refresher.engine.peek('DEL').serialized(
+        'external_feeds', follower.serializer)
+
+
+def test_replaced_file_is_remapped(worker, upstream_calls):
+    refresher, follower = worker(), worker()
+    refresher.get('DEL')
+    first = follower.get('DEL')
+    assert follower.get('DEL') is first
+
+    refresher.engine._clock = follower.engine._clock = lambda: time.time() + refresher.engine.refresh_interval
+    refresher.get('DEL')
+    second = follower.get('DEL')
+
+    assert second is not first
+    assert second.version == 2
+    assert follower.stats['remapped'] == 2
+    # The old mapping stays readable for responses still using it
+    assert first.serialized('weather')[0]
+
+
+def test_workers_share_etags(monkeypatch, tmp_path, upstream_calls):
+    monkeypatch.setenv('SNAPSHOT_REFRESH_INTERVAL', '3600')
+    monkeypatch.setenv('SNAPSHOT_SHARE_DIR', str(tmp_path))
+    apps = [create_app(), create_app()]
+    try:
+        responses = [app.test_client().get('/api/airport/DEL/dashboard-data') for app in apps]
+        status = apps[1].test_client().get('/api/snapshots/status').get_json()
+    finally:
+        for app in apps:
+            app.extensions['shared_snapshots'].close()
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert responses[0].headers['ETag'] == responses[1].headers['ETag']
+    assert responses[0].data == responses[1].data
+    assert status['snapshots']['DEL']['version'] == 1
+    assert os.path.exists(tmp_path / 'DEL.snapshot')
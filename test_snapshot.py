@@ -0,0 +1,66 @@
+"""
+Tests for the per-tick airport snapshot engine
+"""
+
+import pytest
+
+from snapshot import SnapshotEngine
+from web_server import create_app
+
+
+def test_sections_are_computed_once_per_tick(offline_manager, fake_clock):
+    manager = offline_manager()
+    calls = []
+    original = manager.get_live_conveyor_data
+
+    def counting_conveyors(airport_code, weather=None):
+        calls.append(airport_code)
+        return original(airport_code, weather=weather)
+
+    manager.get_live_conveyor_data = counting_conveyors
+    engine = SnapshotEngine(manager, refresh_interval=5, airport_codes=['DEL'], clock=fake_clock)
+
+    dashboard = engine.get_section('DEL', 'dashboard_data')
+    conveyors = engine.get_section('DEL', 'live_conveyors')
+    baggage = engine.get_section('DEL', 'baggage_tracking')
+    engine.get_section('DEL', 'ai_insights')
+
+    assert calls == ['DEL']
+    assert dashboard['baggage_tracking'] is baggage
+    assert baggage['conveyor_belts'] is conveyors['conveyor_belts']
+    assert baggage['live_bags_count'] == conveyors['total_bags_active']
+
+
+def test_new_tick_builds_a_new_snapshot(offline_manager, fake_clock):
+    engine = SnapshotEngine(offline_manager(), refresh_interval=5, airport_codes=['DEL'], clock=fake_clock)
+
+    first = engine.get_snapshot('DEL')
+    fake_clock.now += 1
+    assert engine.get_snapshot('DEL') is first
+    fake_clock.now += 5
+    assert engine.get_snapshot('DEL') is not first
+
+
+def test_refresh_interval_must_be_positive(offline_manager):
+    with pytest.raises(ValueError):
+        SnapshotEngine(offline_manager(), refresh_interval=0)
+
+    engine = SnapshotEngine(offline_manager(), refresh_interval=0.001)
+    assert engine.get_section('DEL', 'weather')['condition'] == 'Clear'
+
+
+def test_unknown_airports_are_not_cached(offline_manager):
+    engine = SnapshotEngine(offline_manager(), airport_codes=['DEL'])
+
+    assert engine.get_snapshot('XXX') is not engine.get_snapshot('XXX')
+
+
+def test_dashboard_and_conveyor_routes_agree(offline):
+    app = create_app()
+
+    with app.test_client() as client:
+        dashboard = client.get('/api/airport/DEL/dashboard-data').get_json()
+        conveyors = client.get('/api/airport/DEL/live-conveyors').get_json()
+
+    assert dashboard['baggage_tracking']['conveyor_belts'] == conveyors['conveyor_belts']
+    assert dashboard['baggage_tracking']['live_bags_count'] == conveyors['total_bags_active']
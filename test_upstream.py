@@ -0,0 +1,193 @@
+"""
+Tests for concurrent upstream fetching against a local stub server
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from data_sources import DataSourceManager
+from upstream import CircuitBreaker, CircuitOpenError, Deadline, UpstreamClient, fan_out
+
+
+class StubUpstreamServer:
+    """Local stand-in for OpenSky and Open-Meteo with a configurable response delay"""
+
+    def __init__(self, delay=0.0, status=200):
+        self.delay = delay
+        self.status = status
+        self.requests = []
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                stub.connections += 1
+                super().setup()
+
+            def do_GET(self):
+                stub.requests.append(self.path)
+                time.sleep(stub.delay)
+                if self.path.startswith('/api/states/all'):
+                    body = {'states': [['abc123', 'IGO123 ', 'India', 0, 0, 77.1, 28.5, 12000.0,
+                                        False, 230.0, 90.0, 0.0]]}
+                else:
+                    body = {'current_weather': {'temperature': 31.0, 'weathercode': 0, 'windspeed': 7.0}}
+                payload = json.dumps(body).encode()
+                self.send_response(stub.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def stub_manager(stub, budget=6.0):
+    return DataSourceManager(opensky_url=f'{stub.url}/api/states/all',
+                             weather_url=f'{stub.url}/v1/forecast',
+                             upstream_budget=budget)
+
+
+def test_fetches_run_concurrently():
+    with StubUpstreamServer(delay=0.4) as stub:
+        manager = stub_manager(stub)
+        started = time.monotonic()
+        external = manager.fetch_external_data('DEL')
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 0.75, f'fetches look sequential ({elapsed:.2f}s)'
+    assert external['weather']['condition'] == 'Clear'
+    assert external['opensky_flights'][0]['callsign'] == 'IGO123 '
+
+
+def test_budget_bounds_latency_and_falls_back():
+    with StubUpstreamServer(delay=2.0) as stub:
+        manager = stub_manager(stub, budget=0.3)
+        started = time.monotonic()
+        data = manager.get_flight_status_data('DEL')
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0, f'deadline budget not enforced ({elapsed:.2f}s)'
+    assert data['total_flights'] == 12
+    assert data['weather']['condition'] in ['Clear', 'Partly Cloudy', 'Overcast', 'Rain', 'Fog']
+
+
+def test_fan_out_cancels_pending_and_uses_fallbacks():
+    release = threading.Event()
+    results = fan_out(
+        {
+            'fast': lambda: 'ok',
+            'slow': lambda: release.wait(2) and 'late',
+            'broken': lambda: 1 / 0
+        },
+        Deadline(0.1),
+        fallbacks={'slow': lambda: 'fallback', 'broken': lambda: 'fallback'}
+    )
+    release.set()
+
+    assert results == {'fast': 'ok', 'slow': 'fallback', 'broken': 'fallback'}
+
+
+def test_deadline_caps_per_call_timeouts():
+    clock = [0.0]
+    deadline = Deadline(3.0, clock=lambda: clock[0])
+
+    assert deadline.timeout(10) == 3.0
+    clock[0] = 2.5
+    assert deadline.timeout(10) == 0.5
+    assert deadline.timeout(0.2) == 0.2
+    clock[0] = 4.0
+    assert deadline.expired()
+
+
+def test_breaker_opens_after_repeated_failures_and_probes_half_open():
+    clock = [0.0]
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=10, clock=lambda: clock[0])
+
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock[0] = 10
+    assert breaker.allow_request()
+    assert not breaker.allow_request(), 'only one probe at a time while half-open'
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock[0] = 20
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()['times_opened'] == 2
+
+
+def test_open_circuit_fails_fast_to_simulated_data():
+    with StubUpstreamServer(status=503) as stub:
+        manager = stub_manager(stub)
+        for _ in range(5):
+            assert manager.get_opensky_flights('DEL') == []
+        requests_before = len(stub.requests)
+
+        started = time.monotonic()
+        assert manager.get_opensky_flights('DEL') == []
+        weather = manager.get_weather_data('DEL')
+        elapsed = time.monotonic() - started
+
+    stats = manager.get_upstream_stats()
+    assert stats['opensky']['circuit']['state'] == 'open'
+    assert stats['opensky']['circuit']['short_circuited'] == 1
+    assert len(stub.requests) == requests_before + 1  # only the weather call went out
+    assert weather['condition'] in ['Clear', 'Partly Cloudy', 'Overcast', 'Rain', 'Fog']
+    assert elapsed < 0.5
+
+
+def test_client_reuses_pooled_connections():
+    with StubUpstreamServer() as stub:
+        client = UpstreamClient('stub')
+        for _ in range(3):
+            assert client.get(f'{stub.url}/v1/forecast', timeout=2).status_code == 200
+
+    assert stub.connections == 1, 'keep-alive connection should be reused'
+    assert client.stats()['calls'] == 3
+    assert client.stats()['circuit']['successes'] == 3
+    try:
+        client.breaker.state = CircuitBreaker.OPEN
+        client.breaker.opened_at = time.monotonic()
+        client.get(f'{stub.url}/v1/forecast', timeout=2)
+        assert False, 'open circuit should short-circuit'
+    except CircuitOpenError:
+        pass
+
+
+def test_app_uses_configured_upstream_urls_and_injected_failures(monkeypatch):
+    from benchmarks.stubs import StubUpstreams
+    from web_server import create_app
+
+    with StubUpstreams(failure_rate=1.0) as stubs:
+        for name, value in stubs.environ().items():
+            monkeypatch.setenv(name, value)
+        manager = create_app().extensions['snapshot_engine'].data_source_manager
+        external = manager.fetch_external_data('DEL')
+
+    assert stubs.stats == {'requests': 2, 'failures': 2}
+    assert external['opensky_flights'] == []
+    assert manager.get_upstream_stats()['open_meteo']['circuit']['failures'] == 1
@@ -0,0 +1,233 @@
+import contextvars
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import SIMULATION_FALLBACKS, UPSTREAM_CALLS, observe_upstream_call
+
+logger = logging.getLogger(__name__)
+
+# Shared pool for upstream I/O; threads mostly sit in socket waits
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+MAX_UPSTREAM_WORKERS = 16
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool used for upstream fetches"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_UPSTREAM_WORKERS,
+                                               thread_name_prefix='upstream')
+    return _executor
+
+
+class Deadline:
+    """Time budget shared by every upstream call made for one request"""
+
+    def __init__(self, budget: float, clock: Callable[[], float] = time.monotonic):
+        self.budget = budget
+        self._clock = clock
+        self.expires_at = clock() + budget
+
+    def remaining(self) -> float:
+        """Seconds left before the budget runs out (never negative)"""
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, limit: float) -> float:
+        """Per-call timeout: the call's own limit, capped by what is left of the budget"""
+        return max(0.001, min(limit, self.remaining()))
+
+
+def fan_out(tasks: Dict[str, Callable[[], Any]], deadline: Deadline,
+            fallbacks: Optional[Dict[str, Callable[[], Any]]] = None) -> Dict[str, Any]:
+    """Run independent upstream fetches concurrently within one deadline.
+
+    Returns a dict with one result per task. Tasks that fail, or that are still
+    pending when the deadline passes, get their fallback value instead (or None).
+    Pending tasks that have not started are cancelled. Running ones are left to
+    hit their own timeout, and their results are discarded.
+    """
+    fallbacks = fallbacks or {}
+    executor = get_executor()
+    # Each task runs in a copy of the caller's context, so request-scoped context variables carry over
+    futures = {name: executor.submit(contextvars.copy_context().run, task) for name, task in tasks.items()}
+    wait(futures.values(), timeout=deadline.remaining())
+
+    results = {}
+    for name, future in futures.items():
+        if future.done() and not future.cancelled():
+            try:
+                results[name] = future.result()
+                continue
+            except Exception as e:
+                logger.warning(f"Upstream fetch '{name}' failed: {e}")
+                reason = 'error'
+        else:
+            future.cancel()
+            logger.warning(f"Upstream fetch '{name}' exceeded the {deadline.budget}s budget")
+            reason = 'deadline'
+
+        SIMULATION_FALLBACKS.inc(source=name, reason=reason)
+
+        fallback = fallbacks.get(name)
+        results[name] = fallback() if fallback is not None else None
+
+    return results
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+
+class UpstreamStatusError(Exception):
+    """Raised by callers when an upstream answers with a status they cannot use"""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker with half-open probing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and every
+    call fails fast. Once ``reset_timeout`` has passed, up to
+    ``half_open_max_calls`` probe calls are let through. A successful probe
+    closes the circuit and a failed one re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+        self._counters = {
+            'successes': 0,
+            'failures': 0,
+            'short_circuited': 0,
+            'times_opened': 0,
+            'probes': 0
+        }
+
+    def allow_request(self) -> bool:
+        """Whether a call may go upstream right now"""
+        with self._lock:
+            if self.state == self.OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probes_in_flight = 0
+                logger.info(f"Circuit '{self.name}' half-open, probing upstream")
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                self._counters['probes'] += 1
+                return True
+
+            self._counters['short_circuited'] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._counters['successes'] += 1
+            self.consecutive_failures = 0
+            if self.state == self.HALF_OPEN:
+                logger.info(f"Circuit '{self.name}' closed after successful probe")
+            self.state = self.CLOSED
+            self._probes_in_flight = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._counters['failures'] += 1
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self._counters['times_opened'] += 1
+                    logger.warning(f"Circuit '{self.name}' opened after "
+                                   f"{self.consecutive_failures} consecutive failures")
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+                self._probes_in_flight = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout_seconds': self.reset_timeout,
+                **self._counters
+            }
+
+
+class UpstreamClient:
+    """Pooled keep-alive HTTP session for one upstream host, guarded by a circuit breaker"""
+
+    def __init__(self, name: str, pool_size: int = 10, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.breaker = CircuitBreaker(name, failure_threshold=failure_threshold,
+                                      reset_timeout=reset_timeout, clock=clock)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._total_seconds = 0.0
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the pooled session; 5xx and 429 responses count as failures"""
+        if not self.breaker.allow_request():
+            UPSTREAM_CALLS.inc(upstream=self.name, outcome='short_circuited')
+            raise CircuitOpenError(f"Circuit for upstream '{self.name}' is open")
+
+        started = time.monotonic()
+        outcome = 'error'
+        try:
+            response = self.session.get(url, **kwargs)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        else:
+            outcome = 'success' if response.status_code < 400 else f'http_{response.status_code // 100}xx'
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._calls += 1
+                self._total_seconds += elapsed
+            observe_upstream_call(self.name, outcome, elapsed)
+
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self._calls
+            total_seconds = self._total_seconds
+        return {
+            'calls': calls,
+            'avg_latency_ms': round(total_seconds / calls * 1000, 1) if calls else 0.0,
+            'circuit': self.breaker.stats()
+        }
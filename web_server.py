@@ -1,16 +1,45 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dashboard_manager import DashboardManager
-from data_sources import DataSourceManager
+from data_sources import DataSourceManager, LIVE_CONVEYOR_FIELDS, OPEN_METEO_URL, OPENSKY_URL
+from snapshot import SnapshotEngine, DEFAULT_SOURCE_INTERVALS
+from scheduler import SnapshotScheduler, parse_source_intervals
+from shared_snapshots import SharedSnapshotStore
+from conveyor_stream import ConveyorDeltaFeed, format_sse
+from json_provider import create_json_provider
+from compression import ResponseCompressor
+from instrumentation import Instrumentation
+from metrics import RequestMetrics, cache_families, circuit_families
+from complaints import COMPLAINT_STATUSES, decode_cursor
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on belts per capacity simulation request
+MAX_SIMULATED_BELTS = 100000
+# Upper bound on belts per /live-conveyors page
+MAX_CONVEYOR_PAGE_SIZE = 200
+# Upper bound on complaints per /complaints page
+MAX_COMPLAINT_PAGE_SIZE = 500
+
 def create_app():
     app = Flask(__name__)
+    app.json = create_json_provider(app)
     
     # Initialize managers
     dashboard_manager = DashboardManager()
-    data_source_manager = DataSourceManager()
+    data_source_manager = DataSourceManager(
+        opensky_url=os.environ.get('OPENSKY_URL', OPENSKY_URL),
+        weather_url=os.environ.get('OPEN_METEO_URL', OPEN_METEO_URL),
+        belt_length_m=float(os.environ.get('CONVEYOR_BELT_LENGTH_M', 100)),
+        bag_arrival_rate=float(os.environ.get('CONVEYOR_BAG_ARRIVAL_RATE', 6)),
+        db_path=os.environ.get('AIRPORT_DB_PATH') or None,
+        tracked_bag_capacity=int(os.environ.get('TRACKED_BAG_CACHE_SIZE', 10000)),
+        tracked_bag_ttl=float(os.environ.get('TRACKED_BAG_CACHE_TTL', 3600))
+    )
     
     # Airport configurations
     airports = {
@@ -22,6 +51,133 @@ def create_app():
         'SXR': {'name': 'Sheikh ul-Alam International Airport', 'city': 'Srinagar', 'code': 'SXR'}
     }
     
+    # Every airport view is served from one snapshot per refresh tick
+    source_intervals = dict(DEFAULT_SOURCE_INTERVALS)
+    source_intervals.update(parse_source_intervals(os.environ.get('SNAPSHOT_SOURCE_INTERVALS', '')))
+    snapshot_engine = SnapshotEngine(
+        data_source_manager,
+        refresh_interval=float(os.environ.get('SNAPSHOT_REFRESH_INTERVAL', 5)),
+        airport_codes=airports.keys(),
+        seed=int(os.environ.get('SIMULATION_SEED', 0)),
+        source_intervals=source_intervals
+    )
+    
+    # Optional background refresh so request handlers only read published snapshots
+    snapshot_scheduler = SnapshotScheduler(
+        snapshot_engine,
+        airports.keys(),
+        jitter=float(os.environ.get('SNAPSHOT_REFRESH_JITTER', 0.1))
+    )
+    # Worker pool for computing many airports in parallel (batch endpoint)
+    batch_executor = ThreadPoolExecutor(
+        max_workers=int(os.environ.get('BATCH_WORKERS', len(airports))),
+        thread_name_prefix='airport-batch'
+    )
+    # Public per-airport sections the batch endpoint serves; internal snapshot sections stay private
+    batch_sections = {
+        'passenger_flow', 'queue_status', 'baggage_tracking', 'flight_status', 'security_status',
+        'resource_utilization', 'staff_availability', 'weather', 'live_conveyors', 'ai_insights', 'complaints'
+    }
+    
+    # Optional snapshots shared by every worker on the host: one refreshes, the rest map its files
+    shared_snapshots = None
+    if os.environ.get('SNAPSHOT_SHARE_DIR'):
+        try:
+            shared_snapshots = SharedSnapshotStore(
+                os.environ['SNAPSHOT_SHARE_DIR'],
+                snapshot_engine,
+                app.json.dumps_bytes,
+                airports.keys(),
+                max_lag_ticks=int(os.environ.get('SNAPSHOT_SHARE_MAX_LAG_TICKS', 2))
+            )
+        except (OSError, RuntimeError) as e:
+            logger.error(f"Shared snapshots disabled: {e}")
+    
+    def current_snapshot(airport_code):
+        """The airport's snapshot for this tick, from the shared files when they are enabled"""
+        if shared_snapshots is not None:
+            return shared_snapshots.get(airport_code)
+        return snapshot_engine.get_snapshot(airport_code)
+    
+    def latest_snapshot(airport_code):
+        """The airport's most recently published snapshot, without building one"""
+        if shared_snapshots is not None:
+            return shared_snapshots.peek(airport_code)
+        return snapshot_engine.peek(airport_code)
+    
+    # Opt-in live conveyor deltas over Server-Sent Events, one shared feed per airport. Each open
+    # stream holds a worker thread, so streams are capped per worker and pages poll by default
+    conveyor_streaming = os.environ.get('CONVEYOR_STREAMING', '').lower() in ('1', 'true', 'yes')
+    conveyor_feeds = {code: ConveyorDeltaFeed(code) for code in airports}
+    stream_interval = float(os.environ.get('CONVEYOR_STREAM_INTERVAL', snapshot_engine.refresh_interval))
+    stream_max_seconds = float(os.environ.get('CONVEYOR_STREAM_MAX_SECONDS', 60))
+    stream_slots = threading.BoundedSemaphore(int(os.environ.get('CONVEYOR_STREAM_MAX_CLIENTS', 8)))
+    
+    app.extensions['snapshot_engine'] = snapshot_engine
+    app.extensions['snapshot_scheduler'] = snapshot_scheduler
+    app.extensions['conveyor_feeds'] = conveyor_feeds
+    app.extensions['shared_snapshots'] = shared_snapshots
+    
+    # Prometheus metrics at /metrics; registered first so response sizes are measured after compression
+    request_metrics = RequestMetrics()
+    request_metrics.init_app(app)
+    request_metrics.add_collector(lambda: cache_families({
+        'weather': data_source_manager.get_weather_cache_stats,
+        'tracked_bags': data_source_manager.get_tracked_bag_cache_stats
+    }))
+    request_metrics.add_collector(lambda: circuit_families(data_source_manager.get_upstream_stats()))
+    
+    def snapshot_families():
+        now = time.time()
+        samples = []
+        for code in airports:
+            snapshot = latest_snapshot(code)
+            if snapshot is not None:
+                samples.append(('airport_snapshot_age_seconds', {'airport': code}, now - snapshot.created_at))
+        return [('airport_snapshot_age_seconds', 'gauge', 'Age of the published snapshot per airport', samples)]
+    request_metrics.add_collector(snapshot_families)
+    
+    # Gzip/Brotli for larger JSON and page responses, cached per snapshot ETag
+    ResponseCompressor(
+        min_size=int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),
+        level=int(os.environ.get('COMPRESSION_LEVEL', 6)),
+        brotli_quality=int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+    ).init_app(app)
+    
+    # Opt-in per-stage timings (Server-Timing header, histograms) and the profiling endpoint
+    if os.environ.get('PROFILING', '').lower() in ('1', 'true', 'yes'):
+        instrumentation = Instrumentation()
+        instrumentation.instrument(data_source_manager)
+        instrumentation.init_app(app)
+        request_metrics.add_collector(instrumentation.metric_families)
+    
+    def conditional_json(data):
+        """JSON response with a strong content-hash ETag; matching If-None-Match gets a 304"""
+        response = jsonify(data)
+        response.add_etag()
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    
+    def snapshot_response(airport_code, section):
+        """Serve a snapshot section, serialized and hashed once per snapshot, with conditional GET support"""
+        snapshot = current_snapshot(airport_code)
+        body, etag = snapshot.serialized(section, app.json.dumps_bytes)
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.last_modified = snapshot.built_at(section)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    
+    if shared_snapshots is not None:
+        # The shared refresher replaces the per-worker scheduler
+        @app.before_request
+        def start_shared_snapshots():
+            shared_snapshots.ensure_started()
+    elif os.environ.get('SNAPSHOT_SCHEDULER', '').lower() in ('1', 'true', 'yes'):
+        @app.before_request
+        def start_snapshot_scheduler():
+            snapshot_scheduler.ensure_started()
+    
     @app.route('/')
     def index():
         """Main page showing airport selection grid"""
@@ -36,7 +192,8 @@ def create_app():
         airport_info = airports[airport_code]
         return render_template('dashboard.html', 
                              airport=airport_info, 
-                             airport_code=airport_code)
+                             airport_code=airport_code,
+                             conveyor_streaming=conveyor_streaming)
     
     @app.route('/settings')
     def settings():
@@ -48,8 +205,7 @@ def create_app():
     def get_passenger_flow(airport_code):
         """Get passenger flow data for charts"""
         try:
-            data = data_source_manager.get_passenger_flow_data(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'passenger_flow')
         except Exception as e:
             logger.error(f"Error getting passenger flow data: {e}")
             return jsonify({'error': 'Failed to fetch passenger flow data'}), 500
@@ -58,8 +214,7 @@ def create_app():
     def get_queue_status(airport_code):
         """Get queue monitoring data"""
         try:
-            data = data_source_manager.get_queue_status_data(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'queue_status')
         except Exception as e:
             logger.error(f"Error getting queue status data: {e}")
             return jsonify({'error': 'Failed to fetch queue status data'}), 500
@@ -68,8 +223,7 @@ def create_app():
     def get_baggage_tracking(airport_code):
         """Get baggage tracking data"""
         try:
-            data = data_source_manager.get_baggage_tracking_data(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'baggage_tracking')
         except Exception as e:
             logger.error(f"Error getting baggage tracking data: {e}")
             return jsonify({'error': 'Failed to fetch baggage tracking data'}), 500
@@ -78,8 +232,7 @@ def create_app():
     def get_flight_status(airport_code):
         """Get flight status data"""
         try:
-            data = data_source_manager.get_flight_status_data(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'flight_status')
         except Exception as e:
             logger.error(f"Error getting flight status data: {e}")
             return jsonify({'error': 'Failed to fetch flight status data'}), 500
@@ -88,8 +241,7 @@ def create_app():
     def get_security_status(airport_code):
         """Get security checkpoint status"""
         try:
-            data = data_source_manager.get_security_status_data(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'security_status')
         except Exception as e:
             logger.error(f"Error getting security status data: {e}")
             return jsonify({'error': 'Failed to fetch security status data'}), 500
@@ -98,8 +250,7 @@ def create_app():
     def get_resource_utilization(airport_code):
         """Get resource utilization data"""
         try:
-            data = data_source_manager.get_resource_utilization_data(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'resource_utilization')
         except Exception as e:
             logger.error(f"Error getting resource utilization data: {e}")
             return jsonify({'error': 'Failed to fetch resource utilization data'}), 500
@@ -108,8 +259,7 @@ def create_app():
     def get_staff_availability(airport_code):
         """Get staff availability data"""
         try:
-            data = data_source_manager.get_staff_availability_data(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'staff_availability')
         except Exception as e:
             logger.error(f"Error getting staff availability data: {e}")
             return jsonify({'error': 'Failed to fetch staff availability data'}), 500
@@ -118,16 +268,7 @@ def create_app():
     def get_dashboard_data(airport_code):
         """Get all dashboard data at once"""
         try:
-            data = {
-                'passenger_flow': data_source_manager.get_passenger_flow_data(airport_code),
-                'queue_status': data_source_manager.get_queue_status_data(airport_code),
-                'baggage_tracking': data_source_manager.get_baggage_tracking_data(airport_code),
-                'flight_status': data_source_manager.get_flight_status_data(airport_code),
-                'security_status': data_source_manager.get_security_status_data(airport_code),
-                'resource_utilization': data_source_manager.get_resource_utilization_data(airport_code),
-                'staff_availability': data_source_manager.get_staff_availability_data(airport_code)
-            }
-            return jsonify(data)
+            return snapshot_response(airport_code, 'dashboard_data')
         except Exception as e:
             logger.error(f"Error getting dashboard data: {e}")
             return jsonify({'error': 'Failed to fetch dashboard data'}), 500
@@ -137,28 +278,172 @@ def create_app():
     def get_weather(airport_code):
         """Get weather data"""
         try:
-            data = data_source_manager.get_weather_data(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'weather')
         except Exception as e:
             logger.error(f"Error getting weather data: {e}")
             return jsonify({'error': 'Failed to fetch weather data'}), 500
     
+    @app.route('/api/cache/weather')
+    def get_weather_cache_stats():
+        """Get weather cache hit/miss/age counters"""
+        try:
+            return jsonify(data_source_manager.get_weather_cache_stats())
+        except Exception as e:
+            logger.error(f"Error getting weather cache stats: {e}")
+            return jsonify({'error': 'Failed to fetch weather cache stats'}), 500
+    
+    @app.route('/api/cache/tracked-bags')
+    def get_tracked_bag_cache_stats():
+        """Get tracked-bag cache size, hit/miss and eviction counters"""
+        try:
+            return jsonify(data_source_manager.get_tracked_bag_cache_stats())
+        except Exception as e:
+            logger.error(f"Error getting tracked bag cache stats: {e}")
+            return jsonify({'error': 'Failed to fetch tracked bag cache stats'}), 500
+    
+    @app.route('/api/upstreams/status')
+    def get_upstream_status():
+        """Get call counts and circuit breaker state for each upstream API"""
+        try:
+            return jsonify(data_source_manager.get_upstream_stats())
+        except Exception as e:
+            logger.error(f"Error getting upstream status: {e}")
+            return jsonify({'error': 'Failed to fetch upstream status'}), 500
+    
+    @app.route('/api/snapshots/status')
+    def get_snapshot_status():
+        """Get the version and age of each airport's published snapshot"""
+        try:
+            now = time.time()
+            snapshots = {}
+            for code in airports:
+                snapshot = latest_snapshot(code)
+                if snapshot is not None:
+                    snapshots[code] = {
+                        'version': snapshot.version,
+                        'age_seconds': round(now - snapshot.created_at, 3),
+                        'sections': sorted(snapshot.sections.keys())
+                    }
+            return jsonify({
+                'background_refresh': snapshot_scheduler.running,
+                'refresh_interval': snapshot_engine.refresh_interval,
+                'source_intervals': snapshot_engine.source_intervals,
+                'scheduler': snapshot_scheduler.stats,
+                'shared': shared_snapshots.stats if shared_snapshots is not None else None,
+                'snapshots': snapshots
+            })
+        except Exception as e:
+            logger.error(f"Error getting snapshot status: {e}")
+            return jsonify({'error': 'Failed to fetch snapshot status'}), 500
+    
     @app.route('/api/airport/<airport_code>/live-conveyors')
     def get_live_conveyors(airport_code):
-        """Get live conveyor belt data"""
+        """Get live conveyor belt data, optionally projected with fields=, filtered and paged"""
         try:
-            data = data_source_manager.get_live_conveyor_data(airport_code)
-            return jsonify(data)
+            query = ('fields', 'terminal', 'status', 'cursor', 'limit')
+            if not any(name in request.args for name in query):
+                return snapshot_response(airport_code, 'live_conveyors')
+            
+            fields = None
+            if 'fields' in request.args:
+                fields = {f for f in request.args['fields'].split(',') if f}
+                unknown_fields = fields - LIVE_CONVEYOR_FIELDS
+                if unknown_fields:
+                    return jsonify({'error': f"Unknown fields: {', '.join(sorted(unknown_fields))}",
+                                    'available_fields': sorted(LIVE_CONVEYOR_FIELDS)}), 400
+            limit = request.args.get('limit', type=int)
+            cursor = request.args.get('cursor', type=int)
+            if limit is not None and not 1 <= limit <= MAX_CONVEYOR_PAGE_SIZE:
+                return jsonify({'error': f'limit must be between 1 and {MAX_CONVEYOR_PAGE_SIZE}'}), 400
+            
+            # Projected requests compute only what was asked for, against the snapshot's weather and tick
+            weather = current_snapshot(airport_code).get('weather')
+            with snapshot_engine.seeded(airport_code, 'live_conveyors'):
+                data = data_source_manager.get_live_conveyor_data(
+                    airport_code,
+                    weather=weather,
+                    fields=fields,
+                    terminal=request.args.get('terminal'),
+                    status=request.args.get('status'),
+                    cursor=cursor,
+                    limit=limit
+                )
+            return conditional_json(data)
         except Exception as e:
             logger.error(f"Error getting live conveyor data: {e}")
             return jsonify({'error': 'Failed to fetch live conveyor data'}), 500
     
+    @app.route('/api/airport/<airport_code>/live-conveyors/stream')
+    def stream_live_conveyors(airport_code):
+        """Stream a live conveyor snapshot followed by per-belt and per-bag deltas"""
+        if not conveyor_streaming or airport_code not in airports:
+            return jsonify({'error': 'Airport not found' if conveyor_streaming else 'Streaming is disabled'}), 404
+        # Clients turned away here fall back to polling
+        if not stream_slots.acquire(blocking=False):
+            response = jsonify({'error': 'Too many open streams'})
+            response.headers['Retry-After'] = str(int(stream_max_seconds))
+            return response, 503
+        
+        feed = conveyor_feeds[airport_code]
+        last_seq = feed.parse_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+        
+        def generate():
+            # Streams end after a while; EventSource reconnects and resumes from its Last-Event-ID
+            deadline = time.monotonic() + stream_max_seconds
+            seq = last_seq
+            yield f'retry: {int(stream_interval * 1000)}\n\n'
+            while True:
+                try:
+                    feed.update(current_snapshot(airport_code).get('live_conveyors'))
+                except Exception as e:
+                    logger.error(f"Error updating conveyor stream for {airport_code}: {e}")
+                
+                events = feed.events_since(seq) if seq is not None else None
+                if events is None:
+                    seq, data = feed.snapshot()
+                    if data is not None:
+                        yield format_sse(feed.event_id(seq), 'snapshot', app.json.dumps(data))
+                elif events:
+                    for seq, delta in events:
+                        yield format_sse(feed.event_id(seq), 'delta', app.json.dumps(delta))
+                else:
+                    yield ': keepalive\n\n'
+                
+                if time.monotonic() + stream_interval > deadline:
+                    return
+                time.sleep(stream_interval)
+        
+        response = Response(stream_with_context(generate()), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        response.call_on_close(stream_slots.release)
+        return response
+    
+    @app.route('/api/airport/<airport_code>/capacity-simulation')
+    def get_capacity_simulation(airport_code):
+        """Simulate many conveyor belts at once for capacity planning"""
+        try:
+            num_belts = request.args.get('belts', 1000, type=int)
+            hour = request.args.get('hour', type=int)
+            seed = request.args.get('seed', type=int)
+            if not 1 <= num_belts <= MAX_SIMULATED_BELTS:
+                return jsonify({'error': f'belts must be between 1 and {MAX_SIMULATED_BELTS}'}), 400
+            if hour is not None and not 0 <= hour <= 23:
+                return jsonify({'error': 'hour must be between 0 and 23'}), 400
+            if seed is not None and seed < 0:
+                return jsonify({'error': 'seed must be a non-negative integer'}), 400
+            
+            data = data_source_manager.simulate_conveyor_capacity(airport_code, num_belts, hour=hour, seed=seed)
+            return conditional_json(data)
+        except Exception as e:
+            logger.error(f"Error simulating conveyor capacity: {e}")
+            return jsonify({'error': 'Failed to simulate conveyor capacity'}), 500
+    
     @app.route('/api/airport/<airport_code>/facilities')
     def get_facilities(airport_code):
         """Get airport facilities information"""
         try:
             data = data_source_manager.get_airport_facilities(airport_code)
-            return jsonify(data)
+            return conditional_json(data)
         except Exception as e:
             logger.error(f"Error getting facilities data: {e}")
             return jsonify({'error': 'Failed to fetch facilities data'}), 500
@@ -175,29 +460,76 @@ def create_app():
             logger.error(f"Error tracking baggage: {e}")
             return jsonify({'error': 'Failed to track baggage'}), 500
     
+    @app.route('/api/flights/<flight_number>/bags')
+    def get_flight_bags(flight_number):
+        """Get every bag on a flight, with belt positions for bags on conveyors"""
+        try:
+            return conditional_json(data_source_manager.get_flight_bags(flight_number))
+        except Exception as e:
+            logger.error(f"Error getting flight bags: {e}")
+            return jsonify({'error': 'Failed to fetch flight bags'}), 500
+    
     @app.route('/api/complaints/submit', methods=['POST'])
     def submit_complaint():
         """Submit baggage complaint"""
         try:
             request_data = request.get_json()
+            airport_code = request_data.get('airport_code', '')
+            if airport_code not in airports:
+                return jsonify({'error': f"airport_code must be one of: {', '.join(airports)}"}), 400
+            
             data = data_source_manager.submit_baggage_complaint(
                 request_data.get('passenger_name', ''),
                 request_data.get('flight_number', ''),
                 request_data.get('bag_id', ''),
                 request_data.get('issue_type', ''),
-                request_data.get('description', '')
+                request_data.get('description', ''),
+                airport_code
             )
             return jsonify(data)
         except Exception as e:
             logger.error(f"Error submitting complaint: {e}")
             return jsonify({'error': 'Failed to submit complaint'}), 500
     
+    @app.route('/api/complaints/<complaint_id>/status', methods=['POST'])
+    def update_complaint_status(complaint_id):
+        """Move a complaint to a new status"""
+        try:
+            status = (request.get_json(silent=True) or {}).get('status')
+            if status not in COMPLAINT_STATUSES:
+                return jsonify({'error': f"status must be one of: {', '.join(COMPLAINT_STATUSES)}"}), 400
+            
+            complaint = data_source_manager.update_complaint_status(complaint_id, status)
+            if complaint is None:
+                return jsonify({'error': 'Complaint not found'}), 404
+            return jsonify({'success': True, 'complaint': complaint})
+        except Exception as e:
+            logger.error(f"Error updating complaint status: {e}")
+            return jsonify({'error': 'Failed to update complaint status'}), 500
+    
     @app.route('/api/airport/<airport_code>/complaints')
     def get_complaints(airport_code):
-        """Get complaints data for staff"""
+        """Get complaints data for staff, optionally filtered by status, priority or issue_type and paged"""
         try:
-            data = data_source_manager.get_complaints_data(airport_code)
-            return jsonify(data)
+            limit = request.args.get('limit', 50, type=int)
+            if not 1 <= limit <= MAX_COMPLAINT_PAGE_SIZE:
+                return jsonify({'error': f'limit must be between 1 and {MAX_COMPLAINT_PAGE_SIZE}'}), 400
+            cursor = request.args.get('cursor')
+            if cursor is not None:
+                try:
+                    decode_cursor(cursor)
+                except ValueError:
+                    return jsonify({'error': 'Invalid cursor; pass back next_cursor from a previous page'}), 400
+            
+            data = data_source_manager.get_complaints_data(
+                airport_code,
+                status=request.args.get('status'),
+                priority=request.args.get('priority'),
+                issue_type=request.args.get('issue_type'),
+                cursor=cursor,
+                limit=limit
+            )
+            return conditional_json(data)
         except Exception as e:
             logger.error(f"Error getting complaints data: {e}")
             return jsonify({'error': 'Failed to fetch complaints data'}), 500
@@ -206,12 +538,53 @@ def create_app():
     def get_ai_insights(airport_code):
         """Get AI-powered baggage system insights"""
         try:
-            data = data_source_manager.get_ai_baggage_insights(airport_code)
-            return jsonify(data)
+            return snapshot_response(airport_code, 'ai_insights')
         except Exception as e:
             logger.error(f"Error getting AI insights: {e}")
             return jsonify({'error': 'Failed to fetch AI insights'}), 500
     
+    @app.route('/api/airports/batch')
+    def get_airports_batch():
+        """Get several sections for several airports in one streamed response"""
+        codes = list(dict.fromkeys(c for c in request.args.get('codes', ','.join(airports)).split(',') if c))
+        sections = [s for s in request.args.get(
+            'sections', 'live_conveyors,staff_availability,complaints,ai_insights').split(',') if s]
+        
+        unknown_sections = [s for s in sections if s not in batch_sections]
+        if unknown_sections:
+            return jsonify({'error': f"Unknown sections: {', '.join(unknown_sections)}",
+                            'available_sections': sorted(batch_sections)}), 400
+        unknown_codes = [c for c in codes if c not in airports]
+        if unknown_codes:
+            return jsonify({'error': f"Unknown airports: {', '.join(unknown_codes[:10])}",
+                            'available_airports': sorted(airports)}), 400
+        
+        def load_airport(airport_code):
+            result = {}
+            for section in sections:
+                if section == 'complaints':
+                    result[section] = data_source_manager.get_complaints_data(airport_code)
+                else:
+                    result[section] = current_snapshot(airport_code).get(section)
+            return result
+        
+        futures = {batch_executor.submit(load_airport, code): code for code in codes}
+        
+        def generate():
+            # Stream each airport as soon as it is ready, in completion order
+            yield '{"airports":{'
+            for index, future in enumerate(as_completed(futures)):
+                code = futures[future]
+                try:
+                    payload = future.result()
+                except Exception as e:
+                    logger.error(f"Error getting batch data for {code}: {e}")
+                    payload = {'error': 'Failed to fetch airport data'}
+                yield (',' if index else '') + f'{app.json.dumps(code)}:{app.json.dumps(payload)}'
+            yield f'}},"sections":{app.json.dumps(sections)}}}'
+        
+        return Response(generate(), mimetype='application/json')
+    
     # Passenger Services Pages
     @app.route('/passenger')
     def passenger_services():
@@ -221,7 +594,7 @@ def create_app():
     @app.route('/staff')
     def staff_portal():
         """Staff portal page"""
-        return render_template('staff_portal.html', airports=airports)
+        return render_template('staff_portal.html', airports=airports, conveyor_streaming=conveyor_streaming)
     
     @app.errorhandler(404)
     def not_found(error):